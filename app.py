@@ -2,8 +2,8 @@ import streamlit as st
 import datetime as dt
 from urllib.parse import unquote
 from ui.components.demo import render_demo_sidebar
-from services import persistence
-from domain.constants import get_demo_user
+from services import data_context, repository
+from services import users as user_svc
 
 # Import the page rendering functions from the new modules
 from views import user_signup, my_club, activity_report, demo_script, admin_dashboard, profile
@@ -50,7 +50,21 @@ def main():
 
     This function controls the sidebar navigation and renders the selected page.
     It filters the available pages based on whether the Admin Dashboard mode is active.
+    Everything rendered in one rerun shares a single data context (services.data_context).
     """
+    with data_context.rerun() as ctx:
+        _render()
+        # --- Footer ---
+        redundant = ctx.redundant_loads()
+        st.session_state['redundant_loads'] = redundant
+        st.sidebar.markdown("---")
+        st.sidebar.caption(
+            f"Data dir: data | {dt.datetime.now(dt.timezone.utc).strftime('%H:%M:%S')}Z"
+            + (f" | 중복 로드: {', '.join(f'{k}×{n}' for k, n in redundant.items())}" if redundant else "")
+        )
+
+
+def _render():
     st.set_page_config(page_title="AI Club Matching Demo", layout="wide")
     # Top anchor for post-navigation focus
     st.markdown("<div id='app-top'></div>", unsafe_allow_html=True)
@@ -68,17 +82,10 @@ def main():
     </style>
     """, unsafe_allow_html=True)
 
-    # Helper to seed demo user only when missing (idempotent)
-    def ensure_demo_user():
-        users_local = persistence.load_list('users')
-        if not any(u.get('id') == 'demo_user' for u in users_local):
-            users_local.append(get_demo_user())
-            persistence.replace_all('users', users_local)
-        return users_local
-
-    users = ensure_demo_user()
+    # Demo user invariant: memoized per process, re-checked only when users change
+    user_svc.ensure_demo_present()
     # Guard: only set current_user_id if absent or invalid
-    if 'current_user_id' not in st.session_state or not any(u['id'] == st.session_state['current_user_id'] for u in users):
+    if 'current_user_id' not in st.session_state or st.session_state['current_user_id'] not in repository.users:
         st.session_state.current_user_id = 'demo_user'
 
     # User selector removed; current_user_id persists until explicitly changed elsewhere.
@@ -182,12 +189,6 @@ def main():
                 f"<script>setTimeout(()=>{{const el=document.getElementById('{anchor}'); if(el){{el.scrollIntoView({{behavior:'instant',block:'start'}}); el.tabIndex=-1; el.focus();}}}},180);</script>", unsafe_allow_html=True)
             del st.session_state['focus_anchor']
 
-    # --- Footer ---
-    st.sidebar.markdown("---")
-    st.sidebar.caption(
-        f"Data dir: data | {dt.datetime.now(dt.timezone.utc).strftime('%H:%M:%S')}Z"
-    )
-
 
 if __name__ == "__main__":
     main()
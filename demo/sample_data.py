@@ -5,7 +5,7 @@ import random
 from domain.constants import INTERESTS, REGIONS, RANKS
 from services import persistence
 from utils.korean_names import generate_canonical_names
-from typing import Optional
+from typing import List, Optional
 
 
 def make_users(n: int = 15, start_index: Optional[int] = None):
@@ -37,3 +37,67 @@ def make_users(n: int = 15, start_index: Optional[int] = None):
             survey_answers=answers
         ))
     return users
+
+
+# Population shapes for synthetic (benchmark) data: weights per value, None = uniform.
+POPULATION_SKEWS = {
+    # Every region/rank/interest equally likely
+    'uniform': {},
+    # Capital-area heavy regions and a bottom-heavy rank pyramid (typical headcount)
+    'company': {
+        'regions': {'서울': 40, '경기': 25, '인천': 8, '부산': 6, '대전': 5},
+        'ranks': {'사원': 40, '대리': 28, '과장': 18, '차장': 9, '부장': 5},
+    },
+    # Few buckets and a couple of dominant interests (worst case for bucket size)
+    'concentrated': {
+        'regions': {'서울': 80, '부산': 20},
+        'interests': {'축구': 30, '러닝': 25, '헬스': 20},
+        'interest_count': (1, 2),
+    },
+}
+
+
+def _weighted(values, weights):
+    if not weights:
+        return list(values), None
+    return list(values), [weights.get(v, 1) for v in values]
+
+
+def make_synthetic_users(n: int, seed: int = 0, skew: str = 'uniform') -> List[User]:
+    """Generate n in-memory users for benchmarks (nothing is read from or written to persistence).
+
+    Distributions follow make_users (REGIONS / RANKS / INTERESTS) reshaped by
+    POPULATION_SKEWS[skew]; personality comes from simulated 7-question survey
+    answers so all three traits occur. Same (n, seed, skew) -> same users.
+    """
+    from services.survey import QUESTIONS
+    shape = POPULATION_SKEWS[skew]
+    rng = random.Random(seed)
+    regions, region_w = _weighted(REGIONS, shape.get('regions'))
+    ranks, rank_w = _weighted(RANKS, shape.get('ranks'))
+    interests, interest_w = _weighted(INTERESTS, shape.get('interests'))
+    lo, hi = shape.get('interest_count', (2, 4))
+
+    users = []
+    for i in range(n):
+        k = rng.randint(lo, hi)
+        if interest_w is None:
+            picked = rng.sample(interests, k=k)
+        else:
+            picked = []
+            while len(picked) < k:
+                choice = rng.choices(interests, weights=interest_w)[0]
+                if choice not in picked:
+                    picked.append(choice)
+        answers = [rng.randint(1, 3) for _ in QUESTIONS]
+        users.append(User(
+            id=f"bench_u{i}",
+            name=f"사용자{i}",
+            employee_number=f"B{i:07d}",
+            region=rng.choices(regions, weights=region_w)[0],
+            rank=rng.choices(ranks, weights=rank_w)[0],
+            interests=picked,
+            personality_trait=classify_personality(answers),
+            survey_answers=answers
+        ))
+    return users
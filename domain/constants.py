@@ -6,8 +6,11 @@ ensuring a single source of truth for values like regions, ranks, and interests.
 # These constants are used across multiple views to ensure consistency.
 
 # List of available regions for users
-import os
+import copy
 import json
+import os
+import tempfile
+import threading
 REGIONS = [
     "서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종",
     "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"
@@ -19,13 +22,23 @@ RANKS = ["사원", "대리", "과장", "차장", "부장"]
 # List of available interests for users
 INTERESTS = ["축구", "영화보기", "보드게임", "러닝", "독서", "헬스", "요리", "사진", "등산"]
 
-# Hard-coded demo user baseline (always present in session)
+# Demo user state. Nothing is read at import: DemoUserStore loads the defaults
+# and state files on first use and re-reads them only when their mtime changes.
 
 _BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 _DATA_DIR = os.path.join(_BASE_DIR, 'data')
 _DEFAULTS_PATH = os.path.join(_DATA_DIR, 'demo_user_defaults.json')
 _STATE_PATH = os.path.join(_DATA_DIR, 'demo_user_state.json')
 
+# Hard-coded demo user baseline (used when the defaults file is missing)
+_BUILTIN_DEFAULTS = {
+    'id': 'demo_user', 'name': '데모사용자', 'nickname': 'nemo', 'employee_number': '15000001',
+    'region': '서울', 'rank': '사원', 'interests': ['축구', '영화보기'], 'personality_trait': '중간',
+    'survey_answers': [2]*7
+}
+_DEMO_USER_KEYS = {'id', 'name', 'nickname', 'employee_number', 'region',
+                   'rank', 'interests', 'personality_trait', 'survey_answers'}
+
 
 def _load_json(path: str):
     try:
@@ -36,56 +49,119 @@ def _load_json(path: str):
 
 
 def _write_json(path: str, data: dict):
+    """Atomic write (temp file + rename) so readers never see a partial file."""
+    tmp_path = None
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w', encoding='utf-8') as f:
+        fd, tmp_path = tempfile.mkstemp(prefix='tmp_', suffix='.json', dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return True
     except Exception:
-        pass
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return False
 
 
-_defaults = _load_json(_DEFAULTS_PATH) or {
-    'id': 'demo_user', 'name': '데모사용자', 'nickname': 'nemo', 'employee_number': '15000001',
-    'region': '서울', 'rank': '사원', 'interests': ['축구', '영화보기'], 'personality_trait': '중간',
-    'survey_answers': [2]*7
-}
-_state = _load_json(_STATE_PATH)
-if not _state:
-    _state = _defaults.copy()
-    _write_json(_STATE_PATH, _state)
+def _file_token(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class DemoUserStore:
+    """Lazily loaded, mtime-cached demo user defaults and state.
+
+    Each read costs one stat(); the JSON is parsed again only when the file
+    changed on disk. A file that is not a demo_user record (malformed, or
+    another user's data) is ignored in favour of the defaults. All state
+    writes go through _write, which also refreshes the cache. Callers get deep
+    copies and may mutate them freely.
+    """
+
+    def __init__(self, defaults_path: str, state_path: str):
+        self.defaults_path = defaults_path
+        self.state_path = state_path
+        self._lock = threading.RLock()
+        self._defaults = None  # (file token, dict)
+        self._state = None
+
+    def _read(self, path: str, cached):
+        token = _file_token(path)
+        if token is not None and cached is not None and cached[0] == token:
+            return cached
+        data = _load_json(path) if token is not None else None
+        return (token, data if isinstance(data, dict) and data.get('id') == 'demo_user' else None)
+
+    def _defaults_dict(self) -> dict:
+        self._defaults = self._read(self.defaults_path, self._defaults)
+        return self._defaults[1] or _BUILTIN_DEFAULTS
+
+    def _write(self, data: dict):
+        if _write_json(self.state_path, data):
+            self._state = (_file_token(self.state_path), copy.deepcopy(data))
+        else:
+            self._state = None  # fall back to whatever is on disk
+
+    def version(self):
+        """Change token of the state file (None when it does not exist)."""
+        return _file_token(self.state_path)
+
+    def defaults(self) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._defaults_dict())
+
+    def get(self) -> dict:
+        with self._lock:
+            self._state = self._read(self.state_path, self._state)
+            if self._state[1] is None:
+                if self._state[0] is None:  # no state file yet: seed it from the defaults
+                    self._write(copy.deepcopy(self._defaults_dict()))
+                    return copy.deepcopy(self._state[1])
+                return copy.deepcopy(self._defaults_dict())
+            return copy.deepcopy(self._state[1])
+
+    def save(self, updates: dict) -> dict:
+        with self._lock:
+            current = self.get()
+            current.update({k: v for k, v in updates.items() if k in _DEMO_USER_KEYS})
+            self._write(current)
+            return copy.deepcopy(current)
+
+    def reset(self) -> dict:
+        with self._lock:
+            self._write(copy.deepcopy(self._defaults_dict()))
+            return self.get()
+
+
+demo_user_store = DemoUserStore(_DEFAULTS_PATH, _STATE_PATH)
 
 
 def get_demo_user() -> dict:
-    """Return current mutable demo user state (re-read file each call)."""
-    s = _load_json(_STATE_PATH)
-    if s and isinstance(s, dict):
-        return s
-    return _defaults.copy()
+    """Return current mutable demo user state (cached; re-read when the file changes)."""
+    return demo_user_store.get()
 
 
 def get_demo_user_defaults() -> dict:
-    """Return immutable demo user defaults (always re-read defaults file)."""
-    d = _load_json(_DEFAULTS_PATH)
-    if d and isinstance(d, dict):
-        return d
-    return _defaults.copy()
+    """Return immutable demo user defaults (cached; re-read when the file changes)."""
+    return demo_user_store.defaults()
 
 
 def save_demo_user(updates: dict):
     """Persist new demo user state (select subset of allowed keys)."""
-    allowed = {'id', 'name', 'nickname', 'employee_number', 'region',
-               'rank', 'interests', 'personality_trait', 'survey_answers'}
-    current = get_demo_user()
-    current.update({k: v for k, v in updates.items() if k in allowed})
-    _write_json(_STATE_PATH, current)
-    return current
+    return demo_user_store.save(updates)
 
 
 def reset_demo_user_state():
     """Reset state to defaults."""
-    _write_json(_STATE_PATH, _defaults.copy())
-    return get_demo_user()
+    return demo_user_store.reset()
 
 
-# Backwards-compatible constant snapshot (avoid large refactor). Use get_demo_user() for fresh copy.
-DEMO_USER = get_demo_user()
+def __getattr__(name):
+    # Backwards-compatible DEMO_USER, resolved on access instead of at import.
+    if name == 'DEMO_USER':
+        return get_demo_user()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
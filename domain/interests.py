@@ -0,0 +1,82 @@
+"""
+Compact interest encoding.
+
+Each interest maps to one bit: the INTERESTS vocabulary takes the low bits in
+declaration order, and any interest outside it (legacy or free-text data) is
+given the next free bit the first time it is seen in this process. A user's
+interests then become a single int, so "shares an interest" is a bitwise AND
+and "how many distinct interests" is a popcount.
+
+Masks are only meaningful within one process; persist names, never masks.
+"""
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+from domain.constants import INTERESTS
+
+_bits: Dict[str, int] = {name: i for i, name in enumerate(INTERESTS)}
+_names: List[str] = list(INTERESTS)
+_lock = threading.Lock()
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(mask: int) -> int:
+        return bin(mask).count('1')
+
+
+def interest_bit(name: str) -> int:
+    """Bit position for an interest, allocating one for unknown names."""
+    pos = _bits.get(name)
+    if pos is None:
+        with _lock:
+            pos = _bits.get(name)
+            if pos is None:
+                pos = len(_names)
+                _names.append(name)
+                _bits[name] = pos
+    return pos
+
+
+@lru_cache(maxsize=4096)
+def _encode(interests: tuple) -> int:
+    mask = 0
+    for name in interests:
+        mask |= 1 << interest_bit(name)
+    return mask
+
+
+def encode_interests(interests: Iterable[str]) -> int:
+    """Bitmask for a collection of interest names (order and duplicates ignored)."""
+    return _encode(tuple(interests or ()))
+
+
+def decode_interests(mask: int) -> List[str]:
+    """Interest names for a mask, vocabulary order first."""
+    names = []
+    pos = 0
+    while mask:
+        if mask & 1:
+            names.append(_names[pos])
+        mask >>= 1
+        pos += 1
+    return names
+
+
+def union_mask(interest_lists: Iterable[Iterable[str]]) -> int:
+    mask = 0
+    for interests in interest_lists:
+        mask |= encode_interests(interests)
+    return mask
+
+
+def common_mask(interest_lists: Iterable[Iterable[str]]) -> int:
+    """Interests shared by every list (0 for an empty input)."""
+    mask = None
+    for interests in interest_lists:
+        bits = encode_interests(interests)
+        mask = bits if mask is None else mask & bits
+        if not mask:
+            return 0
+    return mask or 0
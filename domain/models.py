@@ -1,13 +1,20 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 import datetime as _dt
+import re
+
+from domain.interests import encode_interests
+
+_NON_ALNUM = re.compile(r'[^A-Za-z0-9]+')
 
 
 def _now_iso():
     return _dt.datetime.now(_dt.timezone.utc).replace(microsecond=0).isoformat().replace('+00:00', 'Z')
 
 
-@dataclass
+# Models are slotted: instances carry no per-object __dict__, which matters when
+# hundreds of thousands of users are loaded.
+@dataclass(slots=True)
 class User:
     id: str
     name: str
@@ -20,6 +27,11 @@ class User:
     nickname: Optional[str] = None  # Short anonymized handle
     created_at: str = field(default_factory=_now_iso)
 
+    @property
+    def interest_mask(self) -> int:
+        """Interests as a bitmask (see domain.interests); derived, never stored."""
+        return encode_interests(self.interests)
+
 
 def user_from_dict(d: Dict[str, Any]) -> User:
     """Safe conversion dropping legacy keys (e.g., preferred_vibe)."""
@@ -33,15 +45,14 @@ def user_from_dict(d: Dict[str, Any]) -> User:
     if 'nickname' not in filtered or not filtered.get('nickname'):
         base_name = str(filtered.get('name', 'user'))
         # simple slug: keep ascii alnum, lower
-        import re
-        slug = re.sub(r'[^A-Za-z0-9]+', '', base_name).lower()
+        slug = _NON_ALNUM.sub('', base_name).lower()
         if not slug:
             slug = 'user'
         filtered['nickname'] = slug[:8]
     return User(**filtered)
 
 
-@dataclass
+@dataclass(slots=True)
 class Club:
     id: str
     member_ids: List[str]
@@ -51,14 +62,64 @@ class Club:
     status: str = 'Matched'  # Matched | Active
     chat_link: Optional[str] = None
     match_score_breakdown: Dict[str, int] = field(default_factory=dict)
+    explanation: Optional[str] = None  # why the group was formed (same for every member)
     explanations: Dict[str, Dict[str, str]] = field(
-        default_factory=dict)  # user_id -> other_user_id -> reason string
+        default_factory=dict)  # per-member overrides: user_id -> {"그룹": reason}
     match_run_id: Optional[str] = None
     created_at: str = field(default_factory=_now_iso)
     updated_at: str = field(default_factory=_now_iso)
 
 
-@dataclass
+EXPLANATION_KEY = "그룹"
+
+
+def club_explanation(club: Dict[str, Any], user_id: Optional[str] = None) -> Optional[str]:
+    """Explanation text of a club record, for one member when user_id is given.
+
+    A member override wins over the club-level text. Records written before the
+    club-level field existed only have per-member copies; the first one stands in
+    for the club.
+    """
+    overrides = club.get('explanations') or {}
+    if user_id is not None:
+        text = (overrides.get(user_id) or {}).get(EXPLANATION_KEY)
+        if text:
+            return text
+    if club.get('explanation'):
+        return club['explanation']
+    for entry in overrides.values():
+        if entry and entry.get(EXPLANATION_KEY):
+            return entry[EXPLANATION_KEY]
+    return None
+
+
+def compact_club_explanations(club: Dict[str, Any]) -> Dict[str, Any]:
+    """Club record with per-member explanation copies folded into `explanation`.
+
+    The most common member text becomes the club-level text (unless one is
+    already set); only members whose entry differs from it stay in
+    `explanations`. Returns the record unchanged when there is nothing to fold.
+    """
+    overrides = club.get('explanations') or {}
+    if not overrides and 'explanation' in club:
+        return club
+    level = club.get('explanation')
+    if not level:
+        counts: Dict[str, int] = {}
+        for entry in overrides.values():
+            text = (entry or {}).get(EXPLANATION_KEY)
+            if text:
+                counts[text] = counts.get(text, 0) + 1
+        level = max(counts, key=counts.get) if counts else None
+    kept = {uid: entry for uid, entry in overrides.items()
+            if entry and entry != {EXPLANATION_KEY: level}}
+    out = {k: v for k, v in club.items() if k not in ('explanation', 'explanations')}
+    out['explanation'] = level
+    out['explanations'] = kept
+    return out
+
+
+@dataclass(slots=True)
 class ActivityReport:
     id: str
     club_id: str
@@ -74,7 +135,7 @@ class ActivityReport:
     created_at: str = field(default_factory=_now_iso)
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchRun:
     id: str
     created_at: str
@@ -0,0 +1,112 @@
+"""Benchmark interest alignment: utils.keyword_matcher vs per-pair difflib.
+
+Run with:
+  python scripts/bench_keyword_matcher.py
+  python scripts/bench_keyword_matcher.py --reports 200 --words 400 --out benchmarks/keyword_matcher.json
+
+Generates synthetic report texts (synonyms, misspellings and filler words),
+checks both approaches agree on every (report, interest) verdict, and prints
+the time each takes.
+"""
+import argparse
+import difflib
+import json
+import os
+import random
+import sys
+import time
+
+# Add the project root to the Python path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from domain.constants import INTERESTS
+from services.activity import FUZZY_MIN_RATIO, SYNONYMS
+from utils.keyword_matcher import KeywordMatcher
+
+FILLER = ['오늘', '모임', '즐거운', '시간', '함께', '했다', '다음', '주에도', '진행', '예정', '회식',
+          '팀원들과', '이야기', 'great', 'fun', 'together', 'weekend', '카페', '점심', '저녁']
+
+
+def _misspell(word, rng):
+    chars = list(word)
+    if len(chars) > 2 and rng.random() < 0.5:
+        chars.pop(rng.randrange(len(chars)))
+    else:
+        chars.insert(rng.randrange(len(chars) + 1), rng.choice('가나다라abc'))
+    return ''.join(chars)
+
+
+def make_texts(n, words, seed):
+    rng = random.Random(seed)
+    keywords = [kw for syns in SYNONYMS.values() for kw in syns] + list(INTERESTS)
+    texts = []
+    for _ in range(n):
+        out = []
+        for _ in range(words):
+            roll = rng.random()
+            if roll < 0.05:
+                out.append(rng.choice(keywords))
+            elif roll < 0.12:
+                out.append(_misspell(rng.choice(keywords), rng))
+            else:
+                out.append(rng.choice(FILLER) + rng.choice(['', '은', '를', '에서']))
+        texts.append(' '.join(out).lower())
+    return texts
+
+
+def legacy_mentioned(interest, raw_text, tokens):
+    """The original closure from run_verification_simulation."""
+    for s in SYNONYMS.get(interest, [interest]):
+        s_low = s.lower()
+        if s_low in raw_text:
+            return True
+        for tok in tokens:
+            if len(tok) >= 2 and difflib.SequenceMatcher(a=tok, b=s_low).ratio() >= FUZZY_MIN_RATIO:
+                return True
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reports', type=int, default=100)
+    parser.add_argument('--words', type=int, default=200, help='words per report')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--out', help='write results JSON here')
+    args = parser.parse_args(argv)
+
+    texts = make_texts(args.reports, args.words, args.seed)
+    interests = list(INTERESTS)
+
+    start = time.perf_counter()
+    legacy = [{i for i in interests if legacy_mentioned(i, t, t.split())} for t in texts]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(SYNONYMS, min_ratio=FUZZY_MIN_RATIO)
+    matcher.ensure(interests)
+    fast = [{i for i in matcher.find(t, t.split()) if i in interests} for t in texts]
+    fast_s = time.perf_counter() - start
+
+    if legacy != fast:
+        diff = sum(1 for a, b in zip(legacy, fast) if a != b)
+        print(f"MISMATCH in {diff} reports")
+        return 1
+    result = {
+        'reports': args.reports,
+        'words_per_report': args.words,
+        'difflib_seconds': round(legacy_s, 4),
+        'keyword_matcher_seconds': round(fast_s, 4),
+        'speedup': round(legacy_s / fast_s, 1) if fast_s else None,
+    }
+    print(f"difflib: {legacy_s:.3f}s  keyword_matcher: {fast_s:.3f}s  "
+          f"(x{result['speedup']}, {args.reports} reports x {args.words} words, identical verdicts)")
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Benchmark compute_matches / compute_matches_demo_30 on synthetic populations.
+
+Run with:
+  python scripts/bench_matching.py                                  # 1k/10k/100k x all skews
+  python scripts/bench_matching.py --sizes 1000,10000 --skews company
+  python scripts/bench_matching.py --out benchmarks/matching_baseline.json   # record a baseline
+  python scripts/bench_matching.py --compare benchmarks/matching_baseline.json
+
+Each case reports wall time (best of --repeat), peak traced memory, clubs formed
+per second and the share of users left unmatched. The clubs depend only on --seed;
+--workers changes how many processes match buckets, not the result. --compare exits
+with status 1 when any case is slower than the baseline by more than --tolerance.
+Nothing is written to data/; users come from demo.sample_data.make_synthetic_users.
+"""
+import argparse
+import datetime as dt
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Add the project root to the Python path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from demo.sample_data import POPULATION_SKEWS, make_synthetic_users
+from services import matching
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _timed(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _peak_memory(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_case(size, skew, target_size, seed, workers, repeat, memory):
+    users = make_synthetic_users(size, seed=seed, skew=skew)
+
+    def run():
+        return matching.compute_matches(users, target_size=target_size, seed=seed, workers=workers)
+
+    seconds, clubs = _timed(run, repeat)
+    matched = sum(len(c.member_ids) for c in clubs)
+    return {
+        'name': f"compute_matches/{skew}/{size}",
+        'users': size,
+        'skew': skew,
+        'target_size': target_size,
+        'workers': workers,
+        'seconds': round(seconds, 4),
+        'peak_mem_bytes': _peak_memory(run) if memory else None,
+        'clubs': len(clubs),
+        'clubs_per_sec': round(len(clubs) / seconds, 1) if seconds else None,
+        'unmatched_ratio': round(1 - matched / size, 4),
+    }
+
+
+def bench_demo_30(repeat, memory):
+    seconds, clubs = _timed(matching.compute_matches_demo_30, repeat)
+    return {
+        'name': 'compute_matches_demo_30',
+        'seconds': round(seconds, 4),
+        'peak_mem_bytes': _peak_memory(matching.compute_matches_demo_30) if memory else None,
+        'clubs': len(clubs),
+        'clubs_per_sec': round(len(clubs) / seconds, 1) if seconds else None,
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    """Print per-case time ratios against a baseline; returns names of regressed cases."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {c['name']: c for c in json.load(f).get('cases', [])}
+    regressed = []
+    for case in results['cases']:
+        base = baseline.get(case['name'])
+        if not base or not base.get('seconds'):
+            print(f"  {case['name']}: no baseline")
+            continue
+        ratio = case['seconds'] / base['seconds']
+        flag = ''
+        if ratio > 1 + tolerance:
+            flag = '  <-- REGRESSION'
+            regressed.append(case['name'])
+        print(f"  {case['name']}: {base['seconds']:.4f}s -> {case['seconds']:.4f}s (x{ratio:.2f}){flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES))
+    parser.add_argument('--skews', default=','.join(POPULATION_SKEWS))
+    parser.add_argument('--target-size', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='passed to compute_matches (default: serial)')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--out', help='write results JSON here (baseline file)')
+    parser.add_argument('--compare', help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown vs baseline before failing (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    skews = [s for s in args.skews.split(',') if s]
+    results = {
+        'created_at': dt.datetime.now(dt.timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cases': [],
+    }
+    for skew in skews:
+        for size in sizes:
+            case = bench_case(size, skew, args.target_size, args.seed,
+                              args.workers, args.repeat, not args.no_memory)
+            results['cases'].append(case)
+            mem = f"{case['peak_mem_bytes'] / 2**20:.1f}MiB" if case['peak_mem_bytes'] else '-'
+            print(f"{case['name']}: {case['seconds']:.3f}s, {case['clubs']} clubs "
+                  f"({case['clubs_per_sec']}/s), unmatched {case['unmatched_ratio']:.1%}, peak {mem}")
+    demo = bench_demo_30(args.repeat, not args.no_memory)
+    results['cases'].append(demo)
+    print(f"{demo['name']}: {demo['seconds']:.4f}s, {demo['clubs']} clubs")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"wrote {args.out}")
+    if args.compare:
+        print(f"vs {args.compare}:")
+        if compare(results, args.compare, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
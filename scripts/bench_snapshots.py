@@ -0,0 +1,130 @@
+"""Benchmark snapshot formats (services.snapshots) on synthetic user collections.
+
+Run with:
+  python scripts/bench_snapshots.py
+  python scripts/bench_snapshots.py --sizes 10000,100000 --formats json,columnar --out benchmarks/snapshots.json
+
+For each size and format: file size, save time (encode + write + fsync, like
+persistence.atomic_write), load time (read + decode, best of --repeat) and the
+peak RSS growth of a fresh process that loads the file once. Files go to a
+temporary directory; nothing under data/ is touched.
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+
+# Add the project root to the Python path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from demo.sample_data import make_synthetic_users
+from services import snapshots
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def _maxrss_kb():
+    # Prefer VmHWM: ru_maxrss of a spawned child starts at the parent's peak on Linux
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _child(fmt, path):
+    """Load one snapshot in this (fresh) process and print the peak RSS growth in KiB."""
+    codec = snapshots.get_codec(fmt)
+    before = _maxrss_kb()
+    with open(path, 'rb') as f:
+        items = codec.decode(f.read())
+    print(json.dumps({'rss_kb': _maxrss_kb() - before, 'items': len(items)}))
+
+
+def _save(codec, items, path):
+    with open(path, 'wb') as f:
+        f.write(codec.encode(items))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _load(codec, path):
+    with open(path, 'rb') as f:
+        return codec.decode(f.read())
+
+
+def _best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_case(items, fmt, workdir, repeat):
+    codec = snapshots.get_codec(fmt)
+    path = os.path.join(workdir, f"users{codec.extension}")
+    save_s = _best(lambda: _save(codec, items, path), repeat)
+    load_s = _best(lambda: _load(codec, path), repeat)
+    if _load(codec, path) != items:
+        raise SystemExit(f"{fmt}: round trip changed the data")
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', fmt, path],
+                         capture_output=True, text=True, check=True)
+    return {
+        'format': fmt,
+        'users': len(items),
+        'file_bytes': os.path.getsize(path),
+        'save_seconds': round(save_s, 4),
+        'load_seconds': round(load_s, 4),
+        'load_rss_kb': json.loads(out.stdout)['rss_kb'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)))
+    parser.add_argument('--formats', default=','.join(snapshots.CODECS),
+                        help='comma-separated (default: every available codec)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help='write results JSON here')
+    parser.add_argument('--child', nargs=2, metavar=('FORMAT', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        _child(*args.child)
+        return 0
+
+    formats = [f for f in args.formats.split(',') if f]
+    results = []
+    with tempfile.TemporaryDirectory(prefix='rck_snap_') as workdir:
+        for size in (int(s) for s in args.sizes.split(',') if s):
+            items = [asdict(u) for u in make_synthetic_users(size, seed=1)]
+            for fmt in formats:
+                row = run_case(items, fmt, workdir, args.repeat)
+                results.append(row)
+                print(f"{size:>7} users  {fmt:<9} {row['file_bytes'] / 1e6:7.2f} MB  "
+                      f"save {row['save_seconds']:.3f}s  load {row['load_seconds']:.3f}s  "
+                      f"load RSS +{row['load_rss_kb'] / 1024:.1f} MiB")
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
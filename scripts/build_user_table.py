@@ -0,0 +1,16 @@
+"""Write data/users.tbl (the mapped user table) for the current users collection.
+
+Run after bulk user changes or as a deploy step:
+  python scripts/build_user_table.py
+"""
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import user_table
+
+if __name__ == '__main__':
+    table = user_table.build()
+    print(f"built {user_table.table_path()} ({len(table)} users)")
@@ -1,4 +1,12 @@
 import json
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.models import compact_club_explanations
+from services import persistence
 
 def migrate_personality_trait():
     """
@@ -21,6 +29,32 @@ def migrate_personality_trait():
     with open('data/users.json', 'w', encoding='utf-8') as f:
         json.dump(users, f, indent=2, ensure_ascii=False)
 
+
+def migrate_club_explanations():
+    """
+    Folds the per-member explanation copies of every club into the club-level
+    `explanation` field; members whose text differs keep it as an override.
+    Goes through persistence, so it works for any storage backend and snapshot
+    format. Returns the number of clubs rewritten.
+    """
+    changed = []
+
+    def fold(clubs):
+        changed.clear()
+        out = []
+        for club in clubs:
+            compact = compact_club_explanations(club)
+            if compact is not club and compact != club:
+                changed.append(club.get('id'))
+            out.append(compact)
+        return out
+
+    persistence.modify('clubs', fold)
+    return len(changed)
+
+
 if __name__ == '__main__':
     migrate_personality_trait()
-    print("Migration complete. 'preferred_atmosphere' has been migrated to 'personality_trait'.")
\ No newline at end of file
+    print("Migration complete. 'preferred_atmosphere' has been migrated to 'personality_trait'.")
+    count = migrate_club_explanations()
+    print(f"Migration complete. {count} club(s) now store one club-level explanation.")
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""Copy collections between the JSON files and the active storage backend.
+
+Run with:
+  RCK_STORAGE_BACKEND=sqlite python scripts/storage_sync.py import   # data/*.json -> sqlite
+  RCK_STORAGE_BACKEND=sqlite python scripts/storage_sync.py export   # sqlite -> data/*.json
+"""
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import persistence
+
+if __name__ == '__main__':
+    mode = sys.argv[1] if len(sys.argv) > 1 else ''
+    if mode not in ('import', 'export'):
+        print("usage: storage_sync.py import|export")
+        sys.exit(1)
+    backend = persistence.get_backend().name
+    for key in persistence.FILES:
+        if mode == 'import':
+            count = persistence.import_json(key)
+            print(f"[{backend}] imported {count} {key}")
+        else:
+            path = persistence.export_json(key)
+            print(f"[{backend}] exported {key} -> {path}")
@@ -1,13 +1,16 @@
 import datetime as dt
 from dataclasses import asdict
+import hashlib
 import random
-from typing import List, Dict, Any, Optional
-import difflib
+from typing import List, Dict, Any, Optional, Mapping, Union, Callable
 import os
 import struct
 from domain.models import ActivityReport
+from domain.interests import decode_interests, union_mask
 from utils.ids import create_id_with_prefix
-from . import persistence
+from utils import hangul_text
+from utils.keyword_matcher import KeywordMatcher
+from . import persistence, repository
 
 
 def create_activity_report(club_id: str, date: str, photo_name: str, raw_text: str, participant_override: Optional[int] = None):
@@ -31,9 +34,7 @@ def create_activity_report(club_id: str, date: str, photo_name: str, raw_text: s
         formatted_report=formatted,
         participant_override=participant_override
     )
-    reports = persistence.load_list('activity_reports')
-    reports.append(asdict(report))
-    persistence.replace_all('activity_reports', reports)
+    persistence.append_item('activity_reports', asdict(report))
     return report
 
 
@@ -41,71 +42,108 @@ def list_reports() -> List[Dict[str, Any]]:
     return persistence.load_list('activity_reports')
 
 
-def run_verification_simulation(report: Dict[str, Any], club: Dict[str, Any], users: List[Dict[str, Any]]) -> Dict[str, float]:
-    """Compute verification metrics.
-
-    participants: ratio of sampled participants to club size.
-    interest: proportion of club interest themes (with synonym/fuzzy matching) mentioned in report text.
-    diversity: proportion of distinct ranks represented among participants vs ranks present in club.
-    """
+UserLookup = Union[List[Dict[str, Any]], Mapping[str, Any], 'repository.Repository']
+ClubLookup = Union[List[Dict[str, Any]], Mapping[str, Any], 'repository.Repository']
+
+# Synonym / related keyword map (lowercase) used for interest alignment
+SYNONYMS: Dict[str, List[str]] = {
+    '축구': ['축구', '풋볼', '풋살', 'soccer', 'football'],
+    '보드게임': ['보드게임', '게임', '전략게임', '카드게임'],
+    '러닝': ['러닝', '조깅', '달리기', 'run', 'running', 'jogging'],
+    '독서': ['독서', '책', '독후', 'reading', 'book'],
+    '헬스': ['헬스', '운동', '트레이닝', 'fitness', 'gym'],
+    '요리': ['요리', '쿠킹', 'cooking', 'meal', '요리하기'],
+    '사진': ['사진', '촬영', '포토', 'photo', '사진찍기'],
+    '등산': ['등산', '산행', '하이킹', 'hiking', '트래킹', '트레킹']
+}
+FUZZY_MIN_RATIO = 0.72
+VERIFICATION_THRESHOLDS = {"participants": 0.75, "interest": 0.70, "diversity": 0.60}
+_SOCCER_TOKENS = ('축구', 'soccer', 'football')
+
+
+def _user_getter(users: UserLookup) -> Callable[[str], Optional[Mapping[str, Any]]]:
+    """Normalize a user list / id map / repository into an id -> user lookup."""
+    if isinstance(users, list):
+        by_id = {u['id']: u for u in users}
+        return by_id.get
+    return users.get
+
+
+_matcher = KeywordMatcher(SYNONYMS, min_ratio=FUZZY_MIN_RATIO)
+
+
+def _writer(session: Optional[persistence.Session]):
+    """Where report writes go: the caller's session (buffered) or persistence directly."""
+    return session if session is not None else persistence
+
+
+def _get_report(report_id: str, session: Optional[persistence.Session]) -> Optional[Mapping[str, Any]]:
+    if session is not None:
+        return session.get_item('activity_reports', report_id)
+    return repository.reports.get(report_id)
+
+
+class _ClubProfile:
+    """Per-club data the metrics need, computed once per club in a batch."""
+    __slots__ = ('member_count', 'interests', 'ranks', 'soccer')
+
+    def __init__(self, club: Mapping[str, Any], get_user):
+        member_ids = club.get('member_ids', []) or []
+        members = [u for u in map(get_user, member_ids) if u]
+        self.member_count = len(member_ids)
+        self.interests = set(decode_interests(
+            union_mask(user.get('interests', []) for user in members)))
+        self.ranks = {user['rank'] for user in members}
+        club_name_low = (club.get('name') or '').lower()
+        self.soccer = (any(token in club_name_low for token in _SOCCER_TOKENS)
+                       or any(token in self.interests for token in _SOCCER_TOKENS))
+
+
+# report id -> (content digest, normalized text, tokens); re-running previews on an
+# unchanged report reuses its tokens, an edited report gets a new digest.
+_TEXT_CACHE: Dict[str, tuple] = {}
+_TEXT_CACHE_MAX = 4096
+
+
+def _text_features(report: Mapping[str, Any]):
+    """Normalized report text and its tokens (see utils.hangul_text), cached per report."""
+    raw_text = report.get('raw_text') or ''
+    digest = hashlib.blake2b(raw_text.encode('utf-8'), digest_size=16).digest()
+    report_id = report.get('id')
+    cached = _TEXT_CACHE.get(report_id) if report_id is not None else None
+    if cached is not None and cached[0] == digest:
+        return cached[1], cached[2]
+    text = hangul_text.normalize(raw_text)
+    tokens = hangul_text.tokenize(text)
+    if report_id is not None:
+        if len(_TEXT_CACHE) >= _TEXT_CACHE_MAX:
+            _TEXT_CACHE.clear()
+        _TEXT_CACHE[report_id] = (digest, text, tokens)
+    return text, tokens
+
+
+def _score(report: Mapping[str, Any], profile: _ClubProfile, get_user, matcher: KeywordMatcher) -> Dict[str, float]:
+    participant_ids = report.get('participant_ids', []) or []
     # Metric 1: Participant Ratio
     participant_ratio = 0.0
-    member_ids = club.get('member_ids', []) or []
-    if member_ids:
-        participant_ratio = min(
-            1.0, len(report.get('participant_ids', [])) / len(member_ids))
-
-    # Prepare interest data
-    raw_text = (report.get('raw_text') or '').lower()
-    # Tokenize naive (split on whitespace)
-    tokens = [t.strip() for t in raw_text.replace(
-        '\n', ' ').split(' ') if t.strip()]
-    club_interests = {
-        interest for user_id in member_ids for user in users if user['id'] == user_id for interest in user.get('interests', [])}
-
-    # Synonym / related keyword map (lowercase)
-    synonym_map: Dict[str, List[str]] = {
-        '축구': ['축구', '풋볼', '풋살', 'soccer', 'football'],
-        '보드게임': ['보드게임', '게임', '전략게임', '카드게임'],
-        '러닝': ['러닝', '조깅', '달리기', 'run', 'running', 'jogging'],
-        '독서': ['독서', '책', '독후', 'reading', 'book'],
-        '헬스': ['헬스', '운동', '트레이닝', 'fitness', 'gym'],
-        '요리': ['요리', '쿠킹', 'cooking', 'meal', '요리하기'],
-        '사진': ['사진', '촬영', '포토', 'photo', '사진찍기'],
-        '등산': ['등산', '산행', '하이킹', 'hiking', '트래킹', '트레킹']
-    }
-
-    def interest_mentioned(interest: str) -> bool:
-        syns = synonym_map.get(interest, [interest])
-        for s in syns:
-            s_low = s.lower()
-            if s_low in raw_text:
-                return True
-            # Fuzzy: compare against tokens
-            for tok in tokens:
-                if len(tok) >= 2 and difflib.SequenceMatcher(a=tok, b=s_low).ratio() >= 0.72:
-                    return True
-        return False
+    if profile.member_count:
+        participant_ratio = min(1.0, len(participant_ids) / profile.member_count)
 
+    # Metric 2: Interest alignment (demo override: soccer clubs always align)
     interest_alignment = 0.0
-    if club_interests:
-        mentioned_count = sum(
-            1 for interest in club_interests if interest_mentioned(interest))
-        interest_alignment = mentioned_count / len(club_interests)
+    if profile.soccer:
+        interest_alignment = 1.0
+    elif profile.interests:
+        text, tokens = _text_features(report)
+        matcher.ensure(profile.interests)
+        mentioned_count = len(matcher.find(text, tokens, interests=profile.interests))
+        interest_alignment = mentioned_count / len(profile.interests)
 
     # Metric 3: Rank Diversity
-    participant_ranks = {user['rank'] for user_id in report.get(
-        'participant_ids', []) for user in users if user['id'] == user_id}
-    club_ranks = {user['rank']
-                  for user_id in member_ids for user in users if user['id'] == user_id}
     rank_diversity = 0.0
-    if club_ranks:
-        rank_diversity = len(participant_ranks) / len(club_ranks)
-
-    # Demo override: if this is clearly a soccer club (name or interests), force interest alignment to 100%
-    club_name_low = (club.get('name') or '').lower()
-    if any(token in club_name_low for token in ['축구', 'soccer', 'football']) or any(token in club_interests for token in ['축구', 'soccer', 'football']):
-        interest_alignment = 1.0
+    if profile.ranks:
+        participant_ranks = {user['rank'] for user in map(get_user, participant_ids) if user}
+        rank_diversity = len(participant_ranks) / len(profile.ranks)
 
     return {
         'participants': round(participant_ratio, 2),
@@ -114,16 +152,48 @@ def run_verification_simulation(report: Dict[str, Any], club: Dict[str, Any], us
     }
 
 
-def verify_report(report_id: str, points: int = 10):
-    reports = persistence.load_list('activity_reports')
-    clubs = persistence.load_list('clubs')
-    users = persistence.load_list('users')
+def run_verification_simulation(report: Dict[str, Any], club: Dict[str, Any], users: UserLookup) -> Dict[str, float]:
+    """Compute verification metrics.
 
-    report = next((r for r in reports if r['id'] == report_id), None)
-    if not report:
+    participants: ratio of sampled participants to club size.
+    interest: proportion of club interest themes (with synonym/fuzzy matching) mentioned in report text.
+    diversity: proportion of distinct ranks represented among participants vs ranks present in club.
+
+    `users` may be a list of user dicts, an id -> user mapping or a Repository.
+    """
+    get_user = _user_getter(users)
+    return _score(report, _ClubProfile(club, get_user), get_user, _matcher)
+
+
+def score_reports(reports, clubs: Optional[ClubLookup] = None, users: Optional[UserLookup] = None) -> Dict[str, Dict[str, float]]:
+    """Verification metrics for many reports in one pass: report id -> metrics.
+
+    Club member profiles are built once per club and the keyword matcher's fuzzy
+    verdicts are shared across reports. Reports whose club is missing are left out.
+    Defaults read clubs and users from the repository indexes.
+    """
+    get_club = _user_getter(clubs) if clubs is not None else repository.clubs.get
+    get_user = _user_getter(users) if users is not None else repository.users.get
+    profiles: Dict[str, Optional[_ClubProfile]] = {}
+    results: Dict[str, Dict[str, float]] = {}
+    for report in reports:
+        club_id = report.get('club_id')
+        if club_id not in profiles:
+            club = get_club(club_id)
+            profiles[club_id] = _ClubProfile(club, get_user) if club else None
+        profile = profiles[club_id]
+        if profile is not None:
+            results[report['id']] = _score(report, profile, get_user, _matcher)
+    return results
+
+
+def verify_report(report_id: str, points: int = 10, session: Optional[persistence.Session] = None):
+    found = _get_report(report_id, session)
+    if not found:
         return False
+    report = dict(found)
 
-    club = next((c for c in clubs if c['id'] == report['club_id']), None)
+    club = repository.clubs.get(report['club_id'])
     if not club:
         return False
 
@@ -133,70 +203,98 @@ def verify_report(report_id: str, points: int = 10):
     report['participant_ids'] = random.sample(
         club['member_ids'], k=min(participant_count, len(club['member_ids'])))
 
-    metrics = run_verification_simulation(report, club, users)
-
-    thresholds = {
-        "participants": 0.75,
-        "interest": 0.70,
-        "diversity": 0.60
-    }
+    metrics = run_verification_simulation(report, club, repository.users)
 
+    thresholds = VERIFICATION_THRESHOLDS
     passed = all(metrics[key] >= thresholds[key] for key in thresholds)
 
     now = dt.datetime.now(dt.timezone.utc).isoformat().replace('+00:00', 'Z')
-    report['status'] = 'Verified'
-    report['verified_at'] = now
-    report['points_awarded'] = points if passed else 0
-    report['verification_metrics'] = metrics
-
-    persistence.replace_all('activity_reports', reports)
+    _writer(session).update_item('activity_reports', report_id, {
+        'status': 'Verified',
+        'verified_at': now,
+        'points_awarded': points if passed else 0,
+        'verification_metrics': metrics,
+        'participant_ids': report['participant_ids'],
+    })
     return True
 
 
-def prepare_report_verification(report_id: str, points: int = 10) -> Optional[Dict[str, Any]]:
+def prepare_report_verification(report_id: str, points: int = 10,
+                                session: Optional[persistence.Session] = None) -> Optional[Dict[str, Any]]:
     """Runs simulation but does NOT persist final verification status.
 
     Stores a transient preview payload on the report under 'verification_preview'.
     Admin must call finalize_report_verification to commit.
     Returns the preview dict or None on failure.
     """
-    reports = persistence.load_list('activity_reports')
-    clubs = persistence.load_list('clubs')
-    users = persistence.load_list('users')
-    report = next((r for r in reports if r['id'] == report_id), None)
-    if not report:
-        return None
-    if report.get('status') == 'Verified':  # already done
-        return None
-    club = next((c for c in clubs if c['id'] == report['club_id']), None)
-    if not club:
-        return None
-    participant_count = report.get(
-        'participant_override') or min(5, len(club['member_ids']))
-    sample_ids = random.sample(club['member_ids'], k=min(
-        participant_count, len(club['member_ids'])))
-    temp_report = dict(report)
-    temp_report['participant_ids'] = sample_ids
-    metrics = run_verification_simulation(temp_report, club, users)
-    thresholds = {"participants": 0.75, "interest": 0.70, "diversity": 0.60}
-    passed = all(metrics.get(k, 0) >= v for k, v in thresholds.items())
-    preview = {
-        "report_id": report_id,
-        "metrics": metrics,
-        "thresholds": thresholds,
-        "passed": passed,
-        "points_if_finalized": points if passed else 0,
-        "participant_ids_preview": sample_ids,
-    }
-    report['verification_preview'] = preview
-    persistence.replace_all('activity_reports', reports)
-    return preview
+    return prepare_report_verifications([report_id], points, session=session).get(report_id)
+
 
+def prepare_report_verifications(report_ids: Optional[List[str]] = None, points: int = 10,
+                                 session: Optional[persistence.Session] = None) -> Dict[str, Dict[str, Any]]:
+    """Batch form of prepare_report_verification: report id -> stored preview.
 
-def finalize_report_verification(report_id: str) -> bool:
+    report_ids=None previews every Pending report that has no preview yet.
+    Participants are sampled per report in the given order (same draws as
+    calling prepare_report_verification one by one); metrics are then scored in
+    one pass via score_reports. Missing, already verified or clubless reports
+    are skipped. Previews are buffered in the caller's session, or in one opened
+    here, so the whole batch is committed once.
+    """
+    if report_ids is None:
+        candidates = [r for r in repository.reports.find('status', 'Pending')
+                      if 'verification_preview' not in r]
+        if session is not None:  # re-read through the session so buffered writes count
+            candidates = [r for r in (session.get_item('activity_reports', c['id']) for c in candidates)
+                          if r and r.get('status') == 'Pending' and 'verification_preview' not in r]
+    elif session is None:
+        candidates = [r for r in repository.reports.get_many(report_ids)
+                      if r.get('status') != 'Verified']
+    else:
+        candidates = [r for r in (session.get_item('activity_reports', rid) for rid in report_ids)
+                      if r and r.get('status') != 'Verified']
+    samples = []
+    for report in candidates:
+        club = repository.clubs.get(report['club_id'])
+        if not club:
+            continue
+        participant_count = report.get(
+            'participant_override') or min(5, len(club['member_ids']))
+        sample_ids = random.sample(club['member_ids'], k=min(
+            participant_count, len(club['member_ids'])))
+        samples.append(dict(report, participant_ids=sample_ids))
+    metrics_by_id = score_reports(samples)
+    thresholds = dict(VERIFICATION_THRESHOLDS)
+    previews: Dict[str, Dict[str, Any]] = {}
+    for temp_report in samples:
+        report_id = temp_report['id']
+        metrics = metrics_by_id[report_id]
+        passed = all(metrics.get(k, 0) >= v for k, v in thresholds.items())
+        preview = {
+            "report_id": report_id,
+            "metrics": metrics,
+            "thresholds": thresholds,
+            "passed": passed,
+            "points_if_finalized": points if passed else 0,
+            "participant_ids_preview": temp_report['participant_ids'],
+        }
+        previews[report_id] = preview
+    if session is None:
+        with persistence.session() as own:
+            _store_previews(own, previews)
+    else:
+        _store_previews(session, previews)
+    return previews
+
+
+def _store_previews(session: persistence.Session, previews: Dict[str, Dict[str, Any]]):
+    for report_id, preview in previews.items():
+        session.update_item('activity_reports', report_id, {'verification_preview': preview})
+
+
+def finalize_report_verification(report_id: str, session: Optional[persistence.Session] = None) -> bool:
     """Commits a previously prepared preview, turning it into a real verification."""
-    reports = persistence.load_list('activity_reports')
-    report = next((r for r in reports if r['id'] == report_id), None)
+    report = _get_report(report_id, session)
     if not report:
         return False
     preview = report.get('verification_preview')
@@ -204,48 +302,55 @@ def finalize_report_verification(report_id: str) -> bool:
         return False
     # Commit
     now = dt.datetime.now(dt.timezone.utc).isoformat().replace('+00:00', 'Z')
-    report['status'] = 'Verified'
-    report['verified_at'] = now
-    report['points_awarded'] = preview.get('points_if_finalized', 0)
-    report['verification_metrics'] = preview.get('metrics', {})
-    report['participant_ids'] = preview.get('participant_ids_preview', [])
+    changes = {
+        'status': 'Verified',
+        'verified_at': now,
+        'points_awarded': preview.get('points_if_finalized', 0),
+        'verification_metrics': preview.get('metrics', {}),
+        'participant_ids': preview.get('participant_ids_preview', []),
+    }
     # Persist image analysis if it was performed during preview
     if 'image_analysis' in preview:
-        report['image_analysis'] = preview['image_analysis']
+        changes['image_analysis'] = preview['image_analysis']
     # Remove preview
-    del report['verification_preview']
-    persistence.replace_all('activity_reports', reports)
+    _writer(session).update_item('activity_reports', report_id,
+                                 changes, remove=['verification_preview'])
+    return True
+
+
+def cancel_report_verification(report_id: str, session: Optional[persistence.Session] = None) -> bool:
+    """Discards a pending verification preview without verifying the report."""
+    report = _get_report(report_id, session)
+    if not report or 'verification_preview' not in report:
+        return False
+    _writer(session).update_item('activity_reports', report_id,
+                                 {}, remove=['verification_preview'])
     return True
 
 
-def unverify_report(report_id: str) -> bool:
+def unverify_report(report_id: str, session: Optional[persistence.Session] = None) -> bool:
     """Reverts a previously verified report back to Pending state.
 
     Clears verification-related fields so it can be re-processed.
     Returns True if successful, False if report missing or not Verified.
     """
-    reports = persistence.load_list('activity_reports')
-    report = next((r for r in reports if r['id'] == report_id), None)
+    report = _get_report(report_id, session)
     if not report or report.get('status') != 'Verified':
         return False
     # Reset status and remove verification metadata
-    report['status'] = 'Pending'
-    for k in ['verified_at', 'points_awarded', 'verification_metrics', 'participant_ids']:
-        if k in report:
-            del report[k]
-    persistence.replace_all('activity_reports', reports)
+    _writer(session).update_item('activity_reports', report_id, {'status': 'Pending'}, remove=[
+                                 'verified_at', 'points_awarded', 'verification_metrics', 'participant_ids'])
     return True
 
 
-def analyze_report_image(report_id: str) -> Optional[Dict[str, Any]]:
+def analyze_report_image(report_id: str, session: Optional[persistence.Session] = None) -> Optional[Dict[str, Any]]:
     """Mock AI image analysis for a report's attached photo.
 
     If a verification preview exists, attaches results under preview['image_analysis'];
     otherwise stores directly under report['image_analysis'].
     Deterministic output based on photo filename for repeatability.
     """
-    reports = persistence.load_list('activity_reports')
-    report = next((r for r in reports if r['id'] == report_id), None)
+    report = _get_report(report_id, session)
     if not report:
         return None
     photo = report.get('photo_filename')
@@ -289,8 +394,10 @@ def analyze_report_image(report_id: str) -> Optional[Dict[str, Any]]:
         'commentary': f"이미지에 추정 태그 {', '.join(tags)} 감지. 보고 내용과의 관련도 {int(relevance_score*100)}%",
     }
     if 'verification_preview' in report:
-        report['verification_preview']['image_analysis'] = analysis
+        preview = dict(report['verification_preview'], image_analysis=analysis)
+        _writer(session).update_item('activity_reports', report_id, {
+                                     'verification_preview': preview})
     else:
-        report['image_analysis'] = analysis
-    persistence.replace_all('activity_reports', reports)
+        _writer(session).update_item('activity_reports', report_id, {
+                                     'image_analysis': analysis})
     return analysis
@@ -4,23 +4,25 @@ It is responsible for data manipulation, analytics, and other admin-specific fun
 keeping the view layer clean and focused on UI rendering.
 """
 import datetime as dt
-from dataclasses import asdict
+from dataclasses import asdict, fields
 import time
 import csv
 import io
+import json
+import zlib
 
-from services import persistence, activity, matching, users as user_svc
-from domain.models import User, MatchRun
+from services import persistence, activity, analytics, data_context, matching, points, repository, user_table, users as user_svc
+from domain.models import User, Club, ActivityReport, MatchRun
 from utils.ids import create_id_with_prefix
 from services.survey import classify_personality
 from demo import sample_data
 
 
 def get_user_map():
-    """Returns a dictionary mapping user IDs to user objects."""
-    # Use user service loader to ensure demo_user is refreshed from state file.
-    users = user_svc.load_users()
-    return {u['id']: u for u in users}
+    """Returns a read-only mapping of user IDs to user records."""
+    # Ensure demo_user is refreshed from the state file; the map itself is shared per rerun.
+    user_svc.ensure_demo_present()
+    return data_context.current().user_map()
 
 
 def get_user_name(user_id, user_map):
@@ -30,90 +32,42 @@ def get_user_name(user_id, user_map):
 
 
 def get_club_points_map():
-    """Calculates the total verified points for each club."""
-    reports = persistence.load_list('activity_reports')
-    points = {}
-    for r in reports:
-        if r.get('status') == 'Verified':
-            points[r['club_id']] = points.get(
-                r['club_id'], 0) + int(r.get('points_awarded', 0))
-    return points
-
-
-def get_system_analytics():
-    """Gathers and computes key analytics for the entire system."""
-    users_all = persistence.load_list('users')
-    clubs_all = persistence.load_list('clubs')
-    runs_all = persistence.load_list('match_runs')
-    reports_all = persistence.load_list('activity_reports')
-
-    active_clubs = sum(1 for c in clubs_all if c.get('status') == 'Active')
-    pending_reports = sum(
-        1 for r in reports_all if r.get('status') == 'Pending')
-    verified_reports = sum(
-        1 for r in reports_all if r.get('status') == 'Verified')
-    club_points = get_club_points_map()
-    total_points = sum(club_points.values())
-
-    # Exclude demo_user from count when it is the only user (requested behavior)
-    if len(users_all) == 1 and users_all[0].get('id') == 'demo_user':
-        total_users_effective = 0
-    else:
-        total_users_effective = len(users_all)
-
-    analytics = {
-        "total_users": total_users_effective,
-        "total_clubs": len(clubs_all),
-        "active_clubs": active_clubs,
-        "total_match_runs": len(runs_all),
-        "pending_reports": pending_reports,
-        "verified_reports": verified_reports,
-        "total_points_awarded": total_points,
-        # averages are floats
-        "avg_rank_diversity": 0.0,
-        "avg_interest_variety": 0.0,
-    }
+    """Total verified points for each club (maintained ledger, see services.points)."""
+    return data_context.current().points_map()
 
-    if clubs_all and users_all:
-        rank_diversities = [len({m['rank'] for m in users_all if m['id'] in c['member_ids']})
-                            for c in clubs_all if c['member_ids']]
-        interest_varieties = [len({i for m in users_all if m['id'] in c['member_ids']
-                                  for i in m['interests']}) for c in clubs_all if c['member_ids']]
 
-        if rank_diversities:
-            analytics["avg_rank_diversity"] = sum(
-                rank_diversities) / len(rank_diversities)
-        if interest_varieties:
-            analytics["avg_interest_variety"] = sum(
-                interest_varieties) / len(interest_varieties)
+def get_system_analytics(table=None):
+    """Gathers key analytics for the entire system (materialized, see services.analytics).
 
-    return analytics
+    With a UserTable `table` (services.user_table), user counts and club
+    diversity are computed from its columns instead.
+    """
+    if table is not None:
+        return analytics.snapshot_from_table(table)
+    return analytics.store.snapshot()
 
 
 def get_top_clubs_by_points(limit=5):
     """Returns the top N clubs sorted by their verified points."""
-    club_points = get_club_points_map()
-    if not club_points:
+    top_club_items = points.ledger.top(limit)
+    if not top_club_items:
         return []
 
-    clubs_map = {c['id']: c for c in persistence.load_list('clubs')}
-    user_map = get_user_map()
-
-    top_club_items = sorted(club_points.items(),
-                            key=lambda item: item[1], reverse=True)[:limit]
-
     top_clubs = []
-    for club_id, points in top_club_items:
-        club = clubs_map.get(club_id)
+    for club_id, club_points in top_club_items:
+        club = repository.clubs.get(club_id)
         if club:
-            leader_name = get_user_name(club['leader_id'], user_map)
-            top_clubs.append({"name": f"{leader_name} 팀", "points": points})
+            leader_name = get_user_name(club['leader_id'], repository.users)
+            top_clubs.append({"name": f"{leader_name} 팀", "points": club_points})
 
     return top_clubs
 
 
 def update_user_profile(user_id, updates, all_users):
-    """Updates a user's profile after validation."""
+    """Updates a user's profile after validation. Returns the stored record.
+
+    `all_users` is only read (it may be the rerun's shared view).
+    """
     user = next((u for u in all_users if u['id'] == user_id), None)
     if not user:
         raise ValueError("User not found")
@@ -129,72 +83,64 @@ def update_user_profile(user_id, updates, all_users):
     new_answers = updates.get('survey_answers', user.get('survey_answers'))
     updates['personality_trait'] = classify_personality(new_answers)
 
-    user.update(updates)
-    persistence.replace_all('users', all_users)
+    # Row-level write: concurrent edits to other users are not overwritten by this copy
+    user = persistence.update_item('users', user_id, updates)
+    if user is None:
+        raise ValueError("User not found")
     # Sync demo user state JSON if applicable
     user_svc.persist_demo_user_if_changed(user)
     return user
 
 
-def delete_user(user_id, all_users):
+def delete_user(user_id):
     """Deletes a user from the system."""
-    users_after_deletion = [u for u in all_users if u['id'] != user_id]
-    if len(users_after_deletion) == len(all_users):
+    if not persistence.delete_item('users', user_id):
         raise ValueError("User not found for deletion")
-    persistence.replace_all('users', users_after_deletion)
 
 
-def run_new_matching(target_size):
-    """Executes a new matching run for all users."""
-    users_raw = persistence.load_list('users')
-    if len(users_raw) < target_size:
+def run_new_matching(target_size, workers=None):
+    """Executes a new matching run for all users (workers: see matching.compute_matches)."""
+    table = user_table.current()
+    if len(table) < target_size:
         raise ValueError(f"매칭을 실행하려면 최소 {target_size}명의 사용자가 필요합니다.")
 
-    user_objs = [User(**u) for u in users_raw]
     run_id = create_id_with_prefix('run')
 
+    # Matching runs on the columnar user table: no per-user objects are built
     clubs = matching.compute_matches(
-        user_objs, target_size=target_size, run_id=run_id)
+        table, target_size=target_size, run_id=run_id, workers=workers)
     clubs_dicts = [asdict(c) for c in clubs]
 
-    existing_clubs = persistence.load_list('clubs')
-    existing_clubs.extend(clubs_dicts)
-    persistence.replace_all('clubs', existing_clubs)
+    persistence.modify('clubs', lambda existing_clubs: existing_clubs.extend(clubs_dicts))
 
-    runs = persistence.load_list('match_runs')
     run_meta = MatchRun(
         id=run_id,
         created_at=utc_now_iso(),
         target_size=target_size,
-        user_count=len(users_raw),
+        user_count=len(table),
         club_count=len(clubs_dicts)
     )
-    runs.append(asdict(run_meta))
-    persistence.replace_all('match_runs', runs)
+    persistence.append_item('match_runs', asdict(run_meta))
 
     return run_id, len(clubs_dicts)
 
 
-def activate_club(club_id, chat_link, all_clubs):
-    """Activates a club and sets its chat link."""
-    club = next((c for c in all_clubs if c['id'] == club_id), None)
-    if not club:
+def activate_club(club_id, chat_link):
+    """Activates a club and sets its chat link (row-level write)."""
+    changes = {
+        'status': 'Active',
+        'chat_link': chat_link if chat_link else '',
+        'updated_at': utc_now_iso(),
+    }
+    if persistence.update_item('clubs', club_id, changes) is None:
         raise ValueError("Club not found")
-
-    club['status'] = 'Active'
-    club['chat_link'] = chat_link if chat_link else ''
-    club['updated_at'] = utc_now_iso()
-
-    persistence.replace_all('clubs', all_clubs)
     return True
 
 
 def generate_sample_users_and_match(num_users=9, target_size=6):
     """Generates sample users, adds them, and runs matching."""
-    users_raw = persistence.load_list('users')
     new_users = [asdict(u) for u in sample_data.make_users(num_users)]
-    users_all = users_raw + new_users
-    persistence.replace_all('users', users_all)
+    persistence.modify('users', lambda users: users.extend(new_users))
 
     # Now run matching with the combined user list
     run_id, club_count = run_new_matching(target_size)
@@ -203,25 +149,107 @@ def generate_sample_users_and_match(num_users=9, target_size=6):
 
 def add_sample_users(num_users=15):
     """Adds a specified number of sample users to the system."""
-    users = persistence.load_list('users')
     new_users = [asdict(u) for u in sample_data.make_users(num_users)]
-    users.extend(new_users)
-    persistence.replace_all('users', users)
+    persistence.modify('users', lambda users: users.extend(new_users))
+
+
+# CSV export schema: columns come from the domain dataclasses (no pre-scan of the
+# data), plus keys that are added to records after creation. Keys outside the
+# schema are left out. Dict fields listed in CSV_FLATTEN become one column per
+# sub-key ("verification_metrics.interest"); other lists/dicts are written as JSON.
+CSV_SCHEMAS = {
+    'users': User,
+    'clubs': Club,
+    'activity_reports': ActivityReport,
+    'match_runs': MatchRun,
+}
+CSV_EXTRA_FIELDS = {
+    'clubs': ['is_demo_fixed'],
+    'activity_reports': ['participant_ids', 'image_analysis'],
+}
+CSV_FLATTEN = {
+    'activity_reports': {'verification_metrics': ['participants', 'interest', 'diversity']},
+}
+CSV_CHUNK_SIZE = 64 * 1024
+
+
+def csv_columns(data_key: str):
+    """Header for a collection's CSV export."""
+    flatten = CSV_FLATTEN.get(data_key, {})
+    columns = []
+    for name in [f.name for f in fields(CSV_SCHEMAS[data_key])] + CSV_EXTRA_FIELDS.get(data_key, []):
+        if name in flatten:
+            columns.extend(f"{name}.{sub}" for sub in flatten[name])
+        else:
+            columns.append(name)
+    return columns
+
+
+def _csv_row(item, data_key: str):
+    row = {}
+    flatten = CSV_FLATTEN.get(data_key, {})
+    for key, value in item.items():
+        if key in flatten:
+            nested = value or {}
+            for sub in flatten[key]:
+                row[f"{key}.{sub}"] = nested.get(sub)
+        elif isinstance(value, (list, dict)):
+            row[key] = json.dumps(value, ensure_ascii=False)
+        else:
+            row[key] = value
+    return row
+
+
+def iter_csv(data_key: str, chunk_size: int = CSV_CHUNK_SIZE):
+    """Yield a collection's CSV text in chunks of roughly `chunk_size` characters.
+
+    Rows are read from the shared persistence view and written one at a time, so
+    memory stays at about one chunk regardless of collection size. Nothing is
+    yielded for an empty collection.
+    """
+    items = persistence.load_view(data_key)
+    if not items:
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=csv_columns(data_key), extrasaction='ignore')
+    writer.writeheader()
+    for item in items:
+        writer.writerow(_csv_row(item, data_key))
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_csv_bytes(data_key: str, compress: bool = False):
+    """UTF-8 encoded CSV chunks; with compress=True the stream is a gzip file."""
+    if not compress:
+        for chunk in iter_csv(data_key):
+            yield chunk.encode('utf-8')
+        return
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in iter_csv(data_key):
+        out = gz.compress(chunk.encode('utf-8'))
+        if out:
+            yield out
+    yield gz.flush()
+
+
+def export_csv_bytes(data_key: str, compress: bool = False) -> bytes:
+    """The whole export as bytes for st.download_button (which accepts no file handles
+    other than plain binary streams and keeps the payload in memory regardless).
+
+    Rows are still streamed from the shared view, so no list of row dicts or full CSV
+    string is built on the way.
+    """
+    return b''.join(iter_csv_bytes(data_key, compress=compress))
 
 
 def export_to_csv(data_key: str):
-    """Exports data for a given key to a CSV string."""
-    data = persistence.load_list(data_key)
-    if not data:
-        return ""
-
-    output = io.StringIO()
-    # Ensure all dicts have the same keys for the header
-    fieldnames = sorted(list(set(key for item in data for key in item.keys())))
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    writer.writerows(data)
-    return output.getvalue()
+    """Exports data for a given key to a CSV string (see iter_csv for large tables)."""
+    return ''.join(iter_csv(data_key))
 
 
 def reset_all_data():
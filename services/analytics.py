@@ -0,0 +1,168 @@
+"""Materialized system analytics.
+
+get_system_analytics used to reload every collection and re-derive club
+diversity on each admin render. AnalyticsStore instead keeps a per-club
+contribution (distinct ranks, distinct interests) and running sums and
+counts of both, updated from persistence write events:
+
+  - club insert/update/delete  -> that club's contribution is recomputed/dropped
+  - user insert/update/delete  -> clubs containing the user (member index) are recomputed
+
+Plain counters (users, clubs by status, reports by status, runs) come straight
+from the repository indexes and the points ledger, which are maintained the
+same way. Bulk replaces and writes by other processes (signature mismatch)
+fall back to recompute(), a single pass over clubs using the user-id index.
+
+Each average skips memberless clubs and clubs scoring zero on that metric
+(members no longer among the users), as the dashboard always has.
+
+snapshot_from_table computes the same numbers from a UserTable (rank codes and
+interest masks) in one pass, without touching user records.
+"""
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from domain.interests import popcount, union_mask
+from services import persistence, points, repository
+from services.user_table import UserTable
+
+_WATCHED = ('users', 'clubs')
+
+
+class AnalyticsStore:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._signatures: Dict[str, Optional[tuple]] = {}
+        self._clubs: Dict[str, Tuple[int, int]] = {}  # club id -> (rank diversity, interest variety)
+        self._rank_sum = self._rank_count = 0
+        self._interest_sum = self._interest_count = 0
+        persistence.subscribe(self._on_change)
+
+    # -- maintenance -----------------------------------------------------------
+    @staticmethod
+    def _club_metrics(club) -> Optional[Tuple[int, int]]:
+        if not club.get('member_ids'):
+            return None  # memberless clubs are left out of the averages
+        members = repository.users.get_many(club['member_ids'])
+        return (len({m['rank'] for m in members}),
+                popcount(union_mask(m['interests'] for m in members)))
+
+    def _set_club(self, club_id: str, metrics: Optional[Tuple[int, int]]):
+        previous = self._clubs.pop(club_id, None)
+        if previous is not None:
+            self._count(previous, -1)
+        if metrics is not None:
+            self._clubs[club_id] = metrics
+            self._count(metrics, 1)
+
+    def _count(self, metrics: Tuple[int, int], sign: int):
+        ranks, interests = metrics
+        self._rank_sum += sign * ranks
+        self._rank_count += sign * bool(ranks)
+        self._interest_sum += sign * interests
+        self._interest_count += sign * bool(interests)
+
+    def _refresh_club(self, club_id: str):
+        club = repository.clubs.get(club_id)
+        self._set_club(club_id, self._club_metrics(club) if club else None)
+
+    def recompute(self):
+        """Rebuild every club contribution (one pass; members resolved via the user index)."""
+        with self._lock:
+            self._signatures = {key: persistence.signature(key) for key in _WATCHED}
+            self._clubs = {}
+            self._rank_sum = self._rank_count = self._interest_sum = self._interest_count = 0
+            for club in repository.clubs.all():
+                self._set_club(club['id'], self._club_metrics(club))
+            self._loaded = True
+
+    def _ensure(self):
+        current = {key: persistence.signature(key) for key in _WATCHED}
+        with self._lock:
+            if (not self._loaded or None in current.values()
+                    or current != self._signatures):
+                self.recompute()
+
+    def _on_change(self, key: str, op: str, payload: Any):
+        if key not in _WATCHED:
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            before, after = persistence.announced_write(key)
+            recorded = self._signatures.get(key)
+            if op == 'replace' or recorded is None or recorded not in (before, after):
+                self._loaded = False  # bulk write, or another process wrote in between
+                return
+            record_id = payload if op == 'delete' else payload['id']
+            if key == 'clubs':
+                self._refresh_club(record_id)
+            else:
+                for club_id in repository.clubs.ids_by('member_id', record_id):
+                    self._refresh_club(club_id)
+            self._signatures[key] = after
+
+    # -- reads -----------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        """Current analytics (same keys as admin.get_system_analytics)."""
+        self._ensure()
+        analytics = _counters(len(repository.users), 'demo_user' in repository.users)
+        with self._lock:
+            if len(repository.users):
+                _set_averages(analytics, self._rank_sum, self._rank_count,
+                              self._interest_sum, self._interest_count)
+        return analytics
+
+
+def _set_averages(analytics: Dict[str, Any], rank_sum: int, rank_count: int,
+                  interest_sum: int, interest_count: int):
+    if rank_count:
+        analytics["avg_rank_diversity"] = rank_sum / rank_count
+    if interest_count:
+        analytics["avg_interest_variety"] = interest_sum / interest_count
+
+
+def _counters(user_count: int, has_demo_user: bool) -> Dict[str, Any]:
+    total_users = user_count
+    # Exclude demo_user from count when it is the only user (requested behavior)
+    if total_users == 1 and has_demo_user:
+        total_users = 0
+    return {
+        "total_users": total_users,
+        "total_clubs": len(repository.clubs),
+        "active_clubs": repository.clubs.count_by('status', 'Active'),
+        "total_match_runs": len(repository.runs),
+        "pending_reports": repository.reports.count_by('status', 'Pending'),
+        "verified_reports": repository.reports.count_by('status', 'Verified'),
+        "total_points_awarded": points.ledger.total(),
+        # averages are floats
+        "avg_rank_diversity": 0.0,
+        "avg_interest_variety": 0.0,
+    }
+
+
+def snapshot_from_table(table: UserTable) -> Dict[str, Any]:
+    """Analytics with users and club diversity taken from a UserTable (no user records)."""
+    row_of = table.row_index()
+    analytics = _counters(len(table), 'demo_user' in row_of)
+    ranks, masks = table.rank_codes, table.masks
+    rank_sum = rank_count = interest_sum = interest_count = 0
+    for club in repository.clubs.all():
+        if not club.get('member_ids'):
+            continue  # memberless clubs are left out of the averages
+        rows = [row_of[m] for m in club['member_ids'] if m in row_of]
+        mask = 0
+        for row in rows:
+            mask |= masks[row]
+        distinct_ranks, interests = len({ranks[row] for row in rows}), popcount(mask)
+        rank_sum += distinct_ranks
+        rank_count += bool(distinct_ranks)
+        interest_sum += interests
+        interest_count += bool(interests)
+    if len(table):
+        _set_averages(analytics, rank_sum, rank_count, interest_sum, interest_count)
+    return analytics
+
+
+store = AnalyticsStore()
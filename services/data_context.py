@@ -0,0 +1,145 @@
+"""Per-rerun data context shared by views.
+
+One Streamlit rerun renders several views and admin tabs that each used to call
+persistence.load_list for the same collections and rebuild the same id maps.
+A DataContext loads each collection at most once per rerun (again only after
+the collection was written, i.e. its signature changed) and builds the shared
+derived maps (user_map, clubs_map, club_names, points_map) once from those lists.
+
+app.main opens a context per rerun:
+
+    with data_context.rerun() as ctx:
+        ...
+
+and views / tabs take it from data_context.current() (or as a parameter).
+Outside a rerun, current() returns a fresh context, so callers behave as if
+they loaded the data themselves. Per-item fallbacks that may run outside a
+rerun (club_name) check active() and use the repository indexes instead, so
+they never pay a full collection copy per call.
+
+While a rerun context is active every persistence.load_list call in the
+thread is counted (ctx.loads), as are the context's own loads;
+ctx.redundant_loads() lists the collections loaded more than once, which
+points at code still bypassing the context.
+
+Collections and maps are handed out read-only (persistence.load_view: a tuple
+of mapping proxies) because everyone in the rerun shares them. Copy before
+changing anything (dict(record), list(items)) and write through persistence;
+nested values such as member_ids are shared too and must not be modified.
+"""
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Sequence
+
+from services import persistence, points, repository
+
+USERS, CLUBS, REPORTS, RUNS = 'users', 'clubs', 'activity_reports', 'match_runs'
+
+
+class DataContext:
+    def __init__(self):
+        self.loads: Dict[str, int] = {}  # collection loads (incl. persistence.load_list) while active
+        self._lists: Dict[str, tuple] = {}  # key -> (signature, view)
+        self._derived: Dict[str, tuple] = {}  # name -> (token, value)
+
+    # -- collections -----------------------------------------------------------
+    def list(self, key: str) -> Sequence[Mapping[str, Any]]:
+        """Read-only view of the collection, loaded once per rerun (reloaded after a write)."""
+        sig = persistence.signature(key)
+        cached = self._lists.get(key)
+        if cached is not None and sig is not None and cached[0] == sig:
+            return cached[1]
+        items = persistence.load_view(key)
+        self.loads[key] = self.loads.get(key, 0) + 1
+        self._lists[key] = (sig, items)
+        return items
+
+    def users(self) -> Sequence[Mapping[str, Any]]:
+        return self.list(USERS)
+
+    def clubs(self) -> Sequence[Mapping[str, Any]]:
+        return self.list(CLUBS)
+
+    def reports(self) -> Sequence[Mapping[str, Any]]:
+        return self.list(REPORTS)
+
+    def runs(self) -> Sequence[Mapping[str, Any]]:
+        return self.list(RUNS)
+
+    # -- derived maps ----------------------------------------------------------
+    def _derive(self, name: str, token: Any, build: Callable[[], Any]):
+        cached = self._derived.get(name)
+        if cached is not None and token is not None and cached[0] is token:
+            return cached[1]
+        value = build()
+        self._derived[name] = (token, value)
+        return value
+
+    def user_map(self) -> Mapping[str, Mapping[str, Any]]:
+        """id -> user record."""
+        users = self.users()
+        return self._derive('user_map', users, lambda: MappingProxyType({u['id']: u for u in users}))
+
+    def clubs_map(self) -> Mapping[str, Mapping[str, Any]]:
+        """id -> club record."""
+        clubs = self.clubs()
+        return self._derive('clubs_map', clubs, lambda: MappingProxyType({c['id']: c for c in clubs}))
+
+    def club_names(self) -> Mapping[str, str]:
+        """id -> club name, for clubs that have one (report lists resolve names in bulk)."""
+        clubs = self.clubs()
+        return self._derive('club_names', clubs,
+                            lambda: MappingProxyType({c['id']: c['name'] for c in clubs if c.get('name')}))
+
+    def points_map(self) -> Mapping[str, int]:
+        """Verified points per club (services.points ledger)."""
+        sig = persistence.signature(REPORTS)
+        cached = self._derived.get('points_map')
+        if cached is not None and sig is not None and cached[0] == sig:
+            return cached[1]
+        value = MappingProxyType(points.ledger.points_map())
+        self._derived['points_map'] = (sig, value)
+        return value
+
+    # -- instrumentation -------------------------------------------------------
+    def redundant_loads(self) -> Dict[str, int]:
+        """Collections loaded more than once in this rerun -> extra loads."""
+        return {key: n - 1 for key, n in self.loads.items() if n > 1}
+
+
+_local = threading.local()
+
+
+def active() -> Optional[DataContext]:
+    """The rerun context open in this thread, if any."""
+    return getattr(_local, 'ctx', None)
+
+
+def current() -> DataContext:
+    """The active rerun context of this thread (a fresh one when none is open)."""
+    ctx = active()
+    return ctx if ctx is not None else DataContext()
+
+
+def club_name(club_id: str) -> Optional[str]:
+    """Name of one club: from the rerun's club_names, else the clubs index."""
+    ctx = active()
+    if ctx is not None:
+        return ctx.club_names().get(club_id)
+    club = repository.clubs.get(club_id)
+    return club.get('name') if club is not None else None
+
+
+@contextmanager
+def rerun() -> Iterator[DataContext]:
+    """Open a context for one rerun and count this thread's loads into it."""
+    previous: Optional[DataContext] = getattr(_local, 'ctx', None)
+    ctx = DataContext()
+    _local.ctx = ctx
+    persistence.count_loads(ctx.loads)
+    try:
+        yield ctx
+    finally:
+        _local.ctx = previous
+        persistence.count_loads(previous.loads if previous is not None else None)
@@ -1,11 +1,15 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Tuple, Union
 from domain.models import User, Club
+from domain.interests import common_mask, decode_interests, popcount
 from utils.ids import create_id_with_prefix
 import datetime as _dt
+import hashlib
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import random
 # for existing club lookup to avoid duplicate demo fallback
 from services import persistence
+from services.user_table import UserTable
 
 
 from collections import Counter
@@ -41,23 +45,154 @@ def get_common_interests(users: List[User]) -> set[str]:
     """Computes the set of interests shared by all users in a list."""
     if not users:
         return set()
+    return set(decode_interests(common_mask(u.interests for u in users)))
 
-    interest_sets = [set(u.interests) for u in users]
 
-    common = interest_sets[0].copy()
-    for interests in interest_sets[1:]:
-        common.intersection_update(interests)
+def _table_primary_interest(table: UserTable, rows: List[int]) -> Optional[str]:
+    """get_primary_interest over table rows (most frequent, ties lexicographic)."""
+    counts: Counter = Counter()
+    for row in rows:
+        counts.update(table.interest_names(table.masks[row]))
+    max_count = 0
+    primary = None
+    for interest, count in sorted(counts.items()):
+        if count > max_count:
+            max_count = count
+            primary = interest
+    return primary
+
+
+def _table_common_interests(table: UserTable, rows: List[int]) -> set:
+    if not rows:
+        return set()
+    mask = table.masks[rows[0]]
+    for row in rows[1:]:
+        mask &= table.masks[row]
+    return set(table.interest_names(mask))
+
+
+def _kth_set_bit(mask: int, k: int) -> int:
+    """Position of the k-th (0-based) set bit of mask, counting from the lowest."""
+    lo, hi = 0, mask.bit_length()
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if popcount(mask & ((1 << mid) - 1)) > k:
+            hi = mid
+        else:
+            lo = mid
+    return lo
+
+
+# One bucket in column form: (ids, interest masks, rank codes), all in candidate order.
+BucketColumns = Tuple[List[str], List[int], List[int]]
+
+
+def _bucket_columns(order: List[str], table: UserTable, row_of: Dict[str, int]) -> BucketColumns:
+    rows = [row_of[uid] for uid in order]
+    masks, ranks = table.masks, table.rank_codes
+    return order, [masks[r] for r in rows], [ranks[r] for r in rows]
+
+
+def _bucket_groups(columns: BucketColumns, target_size: int, rng) -> Iterator[List[str]]:
+    """Greedy club formation for one (region, personality) bucket.
+
+    Yields member id lists lazily so callers interleave their own `rng` use exactly
+    as before. Users are addressed by their position in `columns` (the order the
+    original candidate lists were built in), and per-interest / per-rank bitsets
+    over those positions act as the inverted index: the interest-compatible
+    candidates are the OR of the common interests' masks intersected with the
+    unassigned mask, and the lowest set bit is the first candidate the list scan
+    would have reached. Random picks draw the same number from `rng` as choosing
+    from the equivalent list.
+    """
+    order, masks, ranks = columns
+    # interest bit -> positions having it; rank -> positions
+    by_interest: Dict[int, int] = defaultdict(int)
+    by_rank: Dict[str, int] = defaultdict(int)
+    for pos in range(len(order)):
+        bit = 1 << pos
+        mask = masks[pos]
+        while mask:
+            low = mask & -mask
+            by_interest[low.bit_length() - 1] |= bit
+            mask ^= low
+        by_rank[ranks[pos]] |= bit
+
+    def candidates_for(common: int) -> int:
+        found = 0
+        while common:
+            low = common & -common
+            found |= by_interest[low.bit_length() - 1]
+            common ^= low
+        return found
+
+    unassigned = (1 << len(order)) - 1
+    remaining = len(order)
+    while remaining >= target_size:
+        # Seed a new club with a random user
+        pos = _kth_set_bit(unassigned, rng.choice(range(remaining)))
+        unassigned &= ~(1 << pos)
+        remaining -= 1
+        group_ids = [order[pos]]
+        common = masks[pos]
+        compatible = candidates_for(common)
+        rank_mask = by_rank[ranks[pos]]
+
+        # Members always share every interest in `common`, so it only narrows.
+        while len(group_ids) < target_size and unassigned and common:
+            potential = unassigned & compatible
+            if not potential:
+                break
+            # Prefer a candidate with a new rank, else pick a random compatible one
+            fresh = potential & ~rank_mask
+            if fresh:
+                pos = (fresh & -fresh).bit_length() - 1
+            else:
+                pos = _kth_set_bit(potential, rng.choice(range(popcount(potential))))
+            unassigned &= ~(1 << pos)
+            remaining -= 1
+            group_ids.append(order[pos])
+            rank_mask |= by_rank[ranks[pos]]
+            narrowed = common & masks[pos]
+            if narrowed != common:
+                common = narrowed
+                compatible = candidates_for(common)
+
+        if len(group_ids) < target_size:
+            # Failed to form a full group; nobody else in this bucket can be placed
+            return
+        yield group_ids
+
+
+def _bucket_seed(basis, bucket_key: Tuple[str, str]) -> int:
+    """Stable per-bucket RNG seed from the run basis (seed or run_id) and bucket key."""
+    raw = '\x1f'.join(str(part) for part in (basis, *bucket_key))
+    return int(hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16], 16)
+
 
-    return common
+def _match_bucket(job: Tuple[BucketColumns, int, int]) -> List[List[str]]:
+    """Process-pool entry point: all groups for one bucket with its own RNG."""
+    columns, target_size, bucket_seed = job
+    return list(_bucket_groups(columns, target_size, random.Random(bucket_seed)))
 
 
-def compute_matches(users: List[User], target_size: int = 5, run_id: Optional[str] = None, seed: Optional[int] = None) -> List[Club]:
+def compute_matches(users: Union[List[User], UserTable], target_size: int = 5, run_id: Optional[str] = None,
+                    seed: Optional[int] = None, workers: Optional[int] = None) -> List[Club]:
     """
     Computes matches based on hard constraints and greedy grouping.
     1. Buckets users by (region, personality_trait).
     2. Forms clubs within each bucket.
     3. Enforces that all members of a club share at least one interest.
     4. Greedily groups users to maximize rank diversity.
+
+    `users` is a list of User objects or a UserTable (services.user_table); a
+    list is converted to a table first, so both give the same clubs and the
+    table form never creates per-user objects.
+
+    Every bucket draws from its own RNG derived from (seed or run_id, bucket key)
+    and takes candidates in input order, so each bucket's result is independent
+    of the others. workers > 1 fans buckets out to a process pool; the worker
+    count only changes speed, never the clubs.
     """
     if not users:
         return []
@@ -69,99 +204,54 @@ def compute_matches(users: List[User], target_size: int = 5, run_id: Optional[st
     elif run_id is not None:
         random.seed(run_id)
 
-    user_map = {u.id: u for u in users}
-    buckets = defaultdict(list)
-    for user in users:
-        buckets[(user.region, user.personality_trait)].append(user)
+    table = users if isinstance(users, UserTable) else UserTable.from_users(users)
+    ids, masks = table.ids, table.masks
+    row_of = table.row_index()
+    buckets = defaultdict(list)  # (region code, trait code) -> rows
+    for row, key in enumerate(zip(table.region_codes, table.trait_codes)):
+        buckets[key].append(row)
+
+    eligible = [((table.regions[rc], table.traits[tc]), rows) for (rc, tc), rows in buckets.items()
+                if len(rows) >= target_size]
+    basis = seed if seed is not None else run_id
+    if basis is None:
+        basis = random.getrandbits(64)
+    jobs = [(_bucket_columns(list(dict.fromkeys(ids[r] for r in rows)), table, row_of),
+             target_size, _bucket_seed(basis, key))
+            for key, rows in eligible]
+    if workers is not None and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_match_bucket, jobs))
+    else:
+        results = [_match_bucket(job) for job in jobs]
+    # Merge in bucket order so naming sequences match the serial run
+    bucket_groups = zip((key for key, _ in eligible), results)
 
     all_clubs = []
 
     # Maintain separate sequence per (region, personality) bucket for A,B,... labeling
     bucket_seq: Dict[tuple[str, str], int] = {}
-    for (region, personality), bucket_users in buckets.items():
-        if len(bucket_users) < target_size:
-            continue
-
-        unassigned_ids = {u.id for u in bucket_users}
-
-        while len(unassigned_ids) >= target_size:
-            # Seed a new club with a random user
-            seed_id = random.choice(list(unassigned_ids))
-            unassigned_ids.remove(seed_id)
-
-            group_ids = [seed_id]
-
-            # Find candidates who could potentially join the group
-            candidates = list(unassigned_ids)
-
-            while len(group_ids) < target_size and candidates:
-                group_users = [user_map[uid] for uid in group_ids]
-
-                # Filter candidates to those who share at least one interest with the current group
-                potential_candidates = []
-                current_common_interests = get_common_interests(group_users)
-                if not current_common_interests:  # Should not happen after the first user
-                    # In case the seed user has no interests, we can't form a club
-                    break
-
-                for cand_id in candidates:
-                    if current_common_interests & set(user_map[cand_id].interests):
-                        potential_candidates.append(cand_id)
-
-                if not potential_candidates:
-                    break  # No more valid candidates to add
-
-                # Select the best candidate to add, prioritizing rank diversity
-                current_ranks = {user_map[uid].rank for uid in group_ids}
-
-                best_candidate_id = None
-                # Find a candidate with a new rank
-                for cand_id in potential_candidates:
-                    if user_map[cand_id].rank not in current_ranks:
-                        best_candidate_id = cand_id
-                        break
-
-                # If no candidate with a new rank is found, pick a random one from the valid candidates
-                if best_candidate_id is None:
-                    best_candidate_id = random.choice(potential_candidates)
-
-                group_ids.append(best_candidate_id)
-                unassigned_ids.remove(best_candidate_id)
-                candidates.remove(best_candidate_id)
-
-            # Final check: if a full group was formed, create the club
-            if len(group_ids) == target_size:
-                final_group_users = [user_map[uid] for uid in group_ids]
-                # This check is redundant if the loop logic is correct, but good for safety
-                if get_common_interests(final_group_users):
-                    leader_id = group_ids[0]
-                    primary_interest = get_primary_interest(final_group_users)
-                    seq_val = bucket_seq.get((region, personality), 0)
-                    club_label = chr(ord('A') + (seq_val % 26))
-                    bucket_seq[(region, personality)] = seq_val + 1
-                    # Region + primary_interest + letter style
-                    base_region = region or "지역"
-                    base_interest = primary_interest or "취미"
-                    club_name = f"{base_region} {base_interest} 클럽 {club_label}"
-
-                    new_club = Club(
-                        id=create_id_with_prefix('club'),
-                        name=club_name,
-                        member_ids=group_ids,
-                        leader_id=leader_id,
-                        primary_interest=primary_interest,
-                        match_run_id=run_id
-                    )
-                    all_clubs.append(new_club)
-                else:
-                    # This case is unlikely, but if it happens, dissolve the group
-                    # and return users to the unassigned pool for the next iteration.
-                    unassigned_ids.update(group_ids)
-            else:
-                # Failed to form a full group, return users to the pool
-                unassigned_ids.update(group_ids)
-                # Break to avoid infinite loop if we can't form any more groups
-                break
+    for (region, personality), groups in bucket_groups:
+        for group_ids in groups:
+            leader_id = group_ids[0]
+            primary_interest = _table_primary_interest(table, [row_of[uid] for uid in group_ids])
+            seq_val = bucket_seq.get((region, personality), 0)
+            club_label = chr(ord('A') + (seq_val % 26))
+            bucket_seq[(region, personality)] = seq_val + 1
+            # Region + primary_interest + letter style
+            base_region = region or "지역"
+            base_interest = primary_interest or "취미"
+            club_name = f"{base_region} {base_interest} 클럽 {club_label}"
+
+            new_club = Club(
+                id=create_id_with_prefix('club'),
+                name=club_name,
+                member_ids=group_ids,
+                leader_id=leader_id,
+                primary_interest=primary_interest,
+                match_run_id=run_id
+            )
+            all_clubs.append(new_club)
 
     # Finalize club objects with timestamps and explanations
     now = _dt.datetime.now(_dt.timezone.utc).isoformat().replace('+00:00', 'Z')
@@ -170,18 +260,15 @@ def compute_matches(users: List[User], target_size: int = 5, run_id: Optional[st
         club.updated_at = now
 
         # Build explanation string
-        group_users = [user_map[uid] for uid in club.member_ids]
-        common_interests = get_common_interests(group_users)
-        distinct_ranks = len({u.rank for u in group_users})
+        group_rows = [row_of[uid] for uid in club.member_ids]
+        common_interests = _table_common_interests(table, group_rows)
+        distinct_ranks = len({table.rank_codes[r] for r in group_rows})
 
         explanation_str = (
             f"공통 관심사 ({len(common_interests)}개): {', '.join(sorted(list(common_interests)))}. "
             f"직급 다양성: {distinct_ranks}개."
         )
-
-        # Adapt to the existing explanation data structure
-        club.explanations = {uid: {"그룹": explanation_str}
-                             for uid in club.member_ids}
+        club.explanation = explanation_str
         club.match_score_breakdown = {}  # Clear obsolete scores
 
     # Fallback: ensure demo_user is in at least one club when possible.
@@ -193,31 +280,35 @@ def compute_matches(users: List[User], target_size: int = 5, run_id: Optional[st
         existing_clubs = []
     if not any('demo_user' in c.member_ids for c in all_clubs) and not any(
             'demo_user' in (ec.get('member_ids') or []) for ec in existing_clubs):
-        demo_user = next((u for u in users if u.id == 'demo_user'), None)
-        if demo_user:
+        demo_row = row_of.get('demo_user')
+        if demo_row is not None:
+            region_codes, trait_codes, rank_codes = table.region_codes, table.trait_codes, table.rank_codes
+
             def _pick_candidates(predicate):
-                return [u for u in users if u.id != 'demo_user' and predicate(u)]
+                return [r for r in range(len(table)) if ids[r] != 'demo_user' and predicate(r)]
 
             # Strict candidates: same region & personality & share interest
-            strict = _pick_candidates(lambda u: u.region == demo_user.region and u.personality_trait ==
-                                      demo_user.personality_trait and set(demo_user.interests) & set(u.interests))
+            demo_mask = masks[demo_row]
+            demo_region, demo_trait = region_codes[demo_row], trait_codes[demo_row]
+            strict = _pick_candidates(lambda r: region_codes[r] == demo_region and trait_codes[r] ==
+                                      demo_trait and demo_mask & masks[r])
             pool = strict
             # Relax personality if insufficient
             if len(pool) < target_size - 1:
                 relaxed_personality = _pick_candidates(
-                    lambda u: u.region == demo_user.region and set(demo_user.interests) & set(u.interests))
+                    lambda r: region_codes[r] == demo_region and demo_mask & masks[r])
                 pool = relaxed_personality
             # Relax region if still insufficient
             if len(pool) < target_size - 1:
                 relaxed_region = _pick_candidates(
-                    lambda u: set(demo_user.interests) & set(u.interests))
+                    lambda r: demo_mask & masks[r])
                 pool = relaxed_region
             # Need at least target_size-1 peers
             if len(pool) >= target_size - 1:
                 # Rank diversity: pick peers preferring distinct ranks first
                 by_rank = {}
-                for u in pool:
-                    by_rank.setdefault(u.rank, []).append(u)
+                for r in pool:
+                    by_rank.setdefault(rank_codes[r], []).append(r)
                 selected = []
                 for rank, members in by_rank.items():
                     if len(selected) >= target_size - 1:
@@ -225,22 +316,23 @@ def compute_matches(users: List[User], target_size: int = 5, run_id: Optional[st
                     selected.append(members[0])
                 # Fill remaining with any leftover users
                 if len(selected) < target_size - 1:
-                    remaining = [u for u in pool if u not in selected]
+                    chosen = set(selected)
+                    remaining = [r for r in pool if r not in chosen]
                     selected.extend(
                         remaining[: (target_size - 1 - len(selected))])
-                group_users = [demo_user] + selected
-                common_interests = get_common_interests(group_users)
+                group_rows = [demo_row] + selected
+                common_interests = _table_common_interests(table, group_rows)
                 if common_interests:  # safety check
-                    leader_id = demo_user.id
-                    primary_interest = get_primary_interest(group_users)
+                    leader_id = 'demo_user'
+                    primary_interest = _table_primary_interest(table, group_rows)
                     # Fallback demo naming consistent with bucket format (no letter)
-                    base_region = demo_user.region or "지역"
+                    base_region = table.region(demo_row) or "지역"
                     base_interest = primary_interest or "취미"
                     club_name = f"{base_region} {base_interest} 클럽"
                     fallback_club = Club(
                         id=create_id_with_prefix('club'),
                         name=club_name,
-                        member_ids=[u.id for u in group_users],
+                        member_ids=[ids[r] for r in group_rows],
                         leader_id=leader_id,
                         primary_interest=primary_interest,
                         match_run_id=run_id,
@@ -248,12 +340,11 @@ def compute_matches(users: List[User], target_size: int = 5, run_id: Optional[st
                     )
                     fallback_club.created_at = now
                     fallback_club.updated_at = now
-                    distinct_ranks = len({u.rank for u in group_users})
+                    distinct_ranks = len({rank_codes[r] for r in group_rows})
                     explanation_str = (
                         f"공통 관심사 ({len(common_interests)}개): {', '.join(sorted(list(common_interests)))}. 직급 다양성: {distinct_ranks}개. (데모 보장)"
                     )
-                    fallback_club.explanations = {
-                        u.id: {"그룹": explanation_str} for u in group_users}
+                    fallback_club.explanation = explanation_str
                     fallback_club.match_score_breakdown = {}
                     all_clubs.append(fallback_club)
 
@@ -329,8 +420,7 @@ def compute_matches_demo_30(target_size: int = 6) -> List[Club]:
             status='Active'
         )
         # Simple explanation tag for fixed demo club
-        fixed_club.explanations = {mid: {"그룹": "고정 데모 팀 A"}
-                                   for mid in fixed_member_ids}
+        fixed_club.explanation = "고정 데모 팀 A"
         now = _dt.datetime.now(
             _dt.timezone.utc).isoformat().replace('+00:00', 'Z')
         fixed_club.created_at = now
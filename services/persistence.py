@@ -1,8 +1,16 @@
+import copy
 import json
+import marshal
 import os
 import tempfile
-import shutil
-from typing import List, Dict, Any
+import threading
+import time
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence, Mapping
+
+from services import snapshots
+from services.storage import StorageBackend, JsonFileBackend, SqliteBackend, _merge, _replay
 
 DATA_DIR = os.path.join(os.path.dirname(
     os.path.abspath(__file__)), '..', 'data')
@@ -15,36 +23,547 @@ FILES = {
     'match_runs': 'match_runs.json'
 }
 
+SQLITE_FILE = 'rck.sqlite3'
+
+# Append-heavy collections kept as snapshot + append-only journal (JSON backend only).
+JOURNALED = ('activity_reports', 'match_runs')
+
+# Backend selection: 'json' (default, files above) or 'sqlite' (SQLITE_FILE in DATA_DIR).
+BACKEND_ENV = 'RCK_STORAGE_BACKEND'
+
+# Snapshot encoding per collection for the JSON backend (see services.snapshots);
+# unlisted collections stay pretty JSON. Example: RCK_SNAPSHOT_FORMATS=users=columnar,clubs=columnar
+SNAPSHOT_FORMATS_ENV = 'RCK_SNAPSHOT_FORMATS'
+SNAPSHOT_FORMATS: Dict[str, str] = {}
+
+
+def snapshot_format(key: str) -> str:
+    _apply_env_formats()
+    return SNAPSHOT_FORMATS.get(key, 'json')
+
 
 def _path(key: str) -> str:
+    """Snapshot file of a collection in its configured format (data/users.json, data/users.col, ...)."""
+    base = os.path.splitext(FILES[key])[0]
+    return os.path.join(DATA_DIR, base + snapshots.get_codec(snapshot_format(key)).extension)
+
+
+def _json_path(key: str) -> str:
+    """Pretty JSON file of a collection (import/export format, whatever the snapshot format)."""
     return os.path.join(DATA_DIR, FILES[key])
 
 
-def load_list(key: str) -> List[Dict[str, Any]]:
-    file_path = _path(key)
-    if not os.path.exists(file_path):
-        return []
+def _sqlite_path() -> str:
+    return os.path.join(DATA_DIR, SQLITE_FILE)
+
+
+# --- Read cache -------------------------------------------------------------
+# Process-wide parsed-list cache keyed by the backend signature (for JSON files:
+# path, mtime_ns, size, inode). Entries hold a marshal blob of the parsed list so
+# every load_list caller gets its own cheap deep copy (copy-on-read), plus a lazily
+# built read-only view shared by callers that only look at the data.
+
+class _CacheEntry:
+    __slots__ = ('signature', 'blob', 'view')
+
+    def __init__(self, signature: tuple, blob: bytes):
+        self.signature = signature
+        self.blob = blob
+        self.view: Optional[tuple] = None
+
+
+_cache: Dict[str, _CacheEntry] = {}
+_cache_lock = threading.Lock()
+_cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def _cache_entry(key: str) -> Optional[_CacheEntry]:
+    # Signature is taken before reading: a concurrent write then just forces a reload next time.
+    sig = _backend.signature(key)
+    if sig is None:
+        return None
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry.signature == sig:
+            _cache_stats['hits'] += 1
+            return entry
+        _cache_stats['misses'] += 1
+    entry = _CacheEntry(sig, marshal.dumps(_backend.load_list(key)))
+    with _cache_lock:
+        _cache[key] = entry
+    return entry
+
+
+def invalidate(key: Optional[str] = None):
+    """Drop cached data for one collection (or all when key is None)."""
+    with _cache_lock:
+        if key is None:
+            _cache.clear()
+        else:
+            _cache.pop(key, None)
+        _cache_stats['invalidations'] += 1
+
+
+def _prime(key: str, data: List[Dict[str, Any]]):
+    """Seed the cache with data just written so the next read skips parsing."""
+    sig = _backend.signature(key)
+    if sig is None:
+        return
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception:
-        return []
+        entry = _CacheEntry(sig, marshal.dumps(data))
+    except ValueError:  # non-JSON-native values; let the next read re-parse
+        return
+    with _cache_lock:
+        _cache[key] = entry
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit/miss counters for the read cache (plus current entry count)."""
+    with _cache_lock:
+        return {**_cache_stats, 'entries': len(_cache)}
+
+
+def reset_cache_stats():
+    with _cache_lock:
+        for k in _cache_stats:
+            _cache_stats[k] = 0
 
 
 def atomic_write(key: str, data: List[Dict[str, Any]]):
+    codec = snapshots.get_codec(snapshot_format(key))
     file_path = _path(key)
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    tmp_fd, tmp_path = tempfile.mkstemp(prefix='tmp_', suffix='.json')
-    with os.fdopen(tmp_fd, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    shutil.move(tmp_path, file_path)
+    data_dir = os.path.dirname(file_path)
+    os.makedirs(data_dir, exist_ok=True)
+    # Temp file in the target directory: os.replace is then a same-filesystem rename.
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix='tmp_', suffix=codec.extension, dir=data_dir)
+    try:
+        with os.fdopen(tmp_fd, 'wb') as f:
+            f.write(codec.encode(data))
+            f.flush()
+            os.fsync(f.fileno())
+        invalidate(key)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    _prime(key, data)
+
+
+def make_backend(name: str) -> StorageBackend:
+    """Build a backend by name ('json' | 'sqlite')."""
+    if name == 'json':
+        return JsonFileBackend(_path, atomic_write, journaled=JOURNALED,
+                               reader=lambda key: load_view(key),
+                               decoder=lambda key, raw: snapshots.get_codec(snapshot_format(key)).decode(raw))
+    if name == 'sqlite':
+        return SqliteBackend(_sqlite_path, json_path_for=_json_path)
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+_backend: StorageBackend = make_backend(
+    os.environ.get(BACKEND_ENV, 'json').strip().lower() or 'json')
+
+
+def get_backend() -> StorageBackend:
+    return _backend
+
+
+def set_backend(backend: StorageBackend) -> StorageBackend:
+    """Swap the active backend (returns the previous one so callers/tests can restore it)."""
+    global _backend
+    previous, _backend = _backend, backend
+    invalidate()
+    return previous
+
+
+def set_snapshot_format(key: str, fmt: str):
+    """Switch the snapshot encoding of one collection, rewriting its current data.
+
+    The journal (if any) is folded into the new snapshot. Files in the previous
+    format are left in place; data/<name>.json keeps serving as the export.
+    """
+    snapshots.get_codec(fmt)
+    if fmt == snapshot_format(key):
+        return
+    with _backend.lock(key):
+        items = load_list(key)
+        SNAPSHOT_FORMATS[key] = fmt
+        invalidate(key)
+        atomic_write(key, items)
+    _notify(key, 'replace', items)
+
+
+_env_formats_lock = threading.RLock()
+_env_formats_started = False
+_env_formats_done = False
+
+
+def _formats_from_env() -> Dict[str, str]:
+    formats = {}
+    for part in os.environ.get(SNAPSHOT_FORMATS_ENV, '').split(','):
+        key, _, fmt = part.strip().partition('=')
+        if not key:
+            continue
+        if key not in FILES:
+            raise ValueError(f"Unknown collection in {SNAPSHOT_FORMATS_ENV}: {key}")
+        snapshots.get_codec(fmt.strip())
+        formats[key] = fmt.strip()
+    return formats
+
+
+def _apply_env_formats():
+    """Apply RCK_SNAPSHOT_FORMATS once, on the first snapshot access (not at import).
+
+    A collection without a snapshot in its format yet is seeded from its pretty
+    JSON file. Other threads wait until seeding is done; the seeding thread's own
+    nested calls (atomic_write -> snapshot_format) return right away.
+    """
+    global _env_formats_started, _env_formats_done
+    if _env_formats_done:
+        return
+    with _env_formats_lock:
+        if _env_formats_started:
+            return
+        formats = _formats_from_env()
+        _env_formats_started = True
+        try:
+            SNAPSHOT_FORMATS.update(formats)
+            for key in formats:
+                if not os.path.exists(_path(key)) and os.path.exists(_json_path(key)):
+                    with open(_json_path(key), 'r', encoding='utf-8') as f:
+                        atomic_write(key, json.load(f))
+        finally:
+            _env_formats_done = True
+
+
+# --- Change notification ----------------------------------------------------
+# Derived in-process structures (repository indexes, ledgers, aggregates) subscribe
+# here to follow writes incrementally. Events: 'insert' (item), 'update' (merged
+# item), 'delete' (item id), 'replace' (full list). Writes from other processes are
+# not announced; subscribers compare signature(key) to catch those. While an event
+# is delivered, announced_write(key) gives the signatures just before and just after
+# the write (both taken under the collection lock): a subscriber whose recorded
+# signature is neither missed someone else's write and must rebuild.
+_listeners: List[Callable[[str, str, Any], None]] = []
+_announcing = threading.local()
+
+
+def subscribe(listener: Callable[[str, str, Any], None]):
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def unsubscribe(listener: Callable[[str, str, Any], None]):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _notify(key: str, op: str, payload: Any, signatures: tuple = (None, None)):
+    previous = getattr(_announcing, 'writes', None)
+    _announcing.writes = dict(previous or {}, **{key: signatures})
+    try:
+        for listener in list(_listeners):
+            listener(key, op, payload)
+    finally:
+        _announcing.writes = previous
+
+
+def announced_write(key: str) -> tuple:
+    """(signature before, signature after) of the write being announced for `key`."""
+    return (getattr(_announcing, 'writes', None) or {}).get(key, (None, None))
+
+
+@contextmanager
+def _tracked(key: str) -> Iterator[list]:
+    """Hold the collection lock around a write; yields [before, after] filled in on exit."""
+    with _backend.lock(key):
+        signatures = [_backend.signature(key), None]
+        yield signatures
+        signatures[1] = _backend.signature(key)
+
+
+def signature(key: str) -> Optional[tuple]:
+    """Change token of a collection as seen by the active backend (None: unknown)."""
+    return _backend.signature(key)
+
+
+# --- Optimistic concurrency -------------------------------------------------
+# The signature doubles as an etag: load_versioned returns it with the data, and
+# replace_all(..., expected=etag) only writes if nobody (thread or process)
+# changed the collection in between. The check and the write happen under
+# the backend's per-collection lock (fcntl for JSON files).
+
+class ConflictError(RuntimeError):
+    """The collection changed since it was read (etag mismatch)."""
+
+
+MODIFY_RETRIES = 5
+
+
+def load_versioned(key: str) -> tuple:
+    """(private copy of the collection, etag) - pass the etag to replace_all(expected=...)."""
+    entry = _cache_entry(key)
+    if entry is None:
+        return _backend.load_list(key), None
+    return marshal.loads(entry.blob), entry.signature
+
+
+def modify(key: str, fn: Callable[[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]],
+           retries: int = MODIFY_RETRIES) -> List[Dict[str, Any]]:
+    """Read-modify-write with conflict retry.
+
+    fn gets a fresh private copy of the collection and either mutates it in
+    place (returning None) or returns the new list. If another writer got in
+    between, fn runs again on the new data, up to `retries` extra times before
+    ConflictError is raised. Returns the list that was written.
+    """
+    for attempt in range(retries + 1):
+        items, etag = load_versioned(key)
+        result = fn(items)
+        items = items if result is None else result
+        try:
+            replace_all(key, items, expected=etag)
+            return items
+        except ConflictError:
+            if attempt == retries:
+                raise
+            time.sleep(0.005 * (attempt + 1))
+    return items
+
+
+# Optional per-thread counter of load_list calls per collection (each returns a
+# fresh copy; load_view is shared and not counted). services.data_context
+# installs one for the duration of a Streamlit rerun.
+_load_counts = threading.local()
+
+
+def count_loads(counts: Optional[Dict[str, int]]):
+    """Count this thread's loads into `counts` (None stops counting)."""
+    _load_counts.counts = counts
+
+
+def _count_load(key: str):
+    counts = getattr(_load_counts, 'counts', None)
+    if counts is not None:
+        counts[key] = counts.get(key, 0) + 1
+
+
+def load_list(key: str) -> List[Dict[str, Any]]:
+    """Return the collection as a private, freely mutable list of dicts."""
+    _count_load(key)
+    entry = _cache_entry(key)
+    if entry is None:
+        return _backend.load_list(key)
+    return marshal.loads(entry.blob)
+
+
+def load_view(key: str) -> Sequence[Mapping[str, Any]]:
+    """Return a shared read-only view (tuple of mapping proxies) of the collection.
+
+    Cheaper than load_list for callers that only read. Nested values (lists such as
+    member_ids) are shared between callers and must not be modified.
+    """
+    entry = _cache_entry(key)
+    if entry is None:
+        return tuple(MappingProxyType(i) for i in _backend.load_list(key))
+    if entry.view is None:
+        entry.view = tuple(MappingProxyType(i) for i in marshal.loads(entry.blob))
+    return entry.view
 
 
 def append_item(key: str, item: Dict[str, Any]):
-    data = load_list(key)
-    data.append(item)
-    atomic_write(key, data)
+    with _tracked(key) as sigs:
+        _backend.append_item(key, item)
+    _notify(key, 'insert', item, tuple(sigs))
+
+
+def replace_all(key: str, items: List[Dict[str, Any]], expected: Optional[tuple] = None):
+    """Overwrite the collection. With `expected` (etag from load_versioned), raise
+    ConflictError instead of writing when the collection changed since that read."""
+    with _backend.lock(key):
+        if expected is not None and _backend.signature(key) != expected:
+            raise ConflictError(key)
+        _backend.replace_all(key, items)
+    _notify(key, 'replace', items)
+
+
+def get_item(key: str, item_id: str) -> Optional[Dict[str, Any]]:
+    return _backend.get_item(key, item_id)
+
+
+def update_item(key: str, item_id: str, changes: Dict[str, Any], remove: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+    """Row-level update: merge `changes`, drop `remove` keys. Returns updated item or None if missing."""
+    with _tracked(key) as sigs:
+        updated = _backend.update_item(key, item_id, changes, remove)
+    if updated is not None:
+        _notify(key, 'update', updated, tuple(sigs))
+    return updated
+
+
+def delete_item(key: str, item_id: str) -> bool:
+    with _tracked(key) as sigs:
+        deleted = _backend.delete_item(key, item_id)
+    if deleted:
+        _notify(key, 'delete', item_id, tuple(sigs))
+    return deleted
+
+
+# --- Unit of work ------------------------------------------------------------
+# Service calls that touch the same records back to back (preview, then image
+# analysis, ...) can share a Session: writes are buffered and coalesced per
+# record, reads see the buffered state, and commit() issues one backend write
+# per touched collection (StorageBackend.apply_batch, or replace_all after a
+# replace) followed by the usual change events.
+
+class Session:
+    def __init__(self):
+        self._records: Dict[str, Dict[str, Dict[str, Any]]] = {}  # key -> id -> coalesced record
+        self._staged: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}  # key -> id -> item (None: deleted)
+        self._replaced: Dict[str, List[Dict[str, Any]]] = {}
+
+    def _current(self, key: str, item_id: str) -> Optional[Dict[str, Any]]:
+        if key in self._replaced:
+            return next((i for i in self._replaced[key] if i.get('id') == item_id), None)
+        staged = self._staged.get(key, {})
+        if item_id in staged:
+            return staged[item_id]
+        return get_item(key, item_id)
+
+    # -- reads -----------------------------------------------------------------
+    def get_item(self, key: str, item_id: str) -> Optional[Dict[str, Any]]:
+        item = self._current(key, item_id)
+        return copy.deepcopy(item) if item is not None else None
+
+    def load_list(self, key: str) -> List[Dict[str, Any]]:
+        if key in self._replaced:
+            return copy.deepcopy(self._replaced[key])
+        return _replay(load_list(key), copy.deepcopy(list(self._records.get(key, {}).values())))
+
+    # -- buffered writes -------------------------------------------------------
+    def append_item(self, key: str, item: Dict[str, Any]):
+        if key in self._replaced:
+            self._replaced[key].append(item)
+            return
+        self._staged.setdefault(key, {})[item['id']] = item
+        self._records.setdefault(key, {})[item['id']] = {'op': 'add', 'item': item}
+
+    def update_item(self, key: str, item_id: str, changes: Dict[str, Any],
+                    remove: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        remove = list(remove)
+        if key in self._replaced:
+            item = self._current(key, item_id)
+            return copy.deepcopy(_merge(item, changes, remove)) if item is not None else None
+        current = self._current(key, item_id)
+        if current is None:
+            return None
+        item = _merge(copy.deepcopy(current), changes, remove)
+        self._staged.setdefault(key, {})[item_id] = item
+        records = self._records.setdefault(key, {})
+        record = records.get(item_id)
+        if record is not None and record['op'] == 'add':
+            record['item'] = item
+        else:
+            if record is None:
+                record = records[item_id] = {'op': 'patch', 'id': item_id, 'set': {}, 'unset': []}
+            record['set'].update(changes)
+            record['unset'] = [k for k in record['unset'] if k not in changes]
+            for k in remove:
+                record['set'].pop(k, None)
+                if k not in record['unset']:
+                    record['unset'].append(k)
+        return copy.deepcopy(item)
+
+    def delete_item(self, key: str, item_id: str) -> bool:
+        if key in self._replaced:
+            items = self._replaced[key]
+            kept = [i for i in items if i.get('id') != item_id]
+            self._replaced[key] = kept
+            return len(kept) != len(items)
+        if self._current(key, item_id) is None:
+            return False
+        self._staged.setdefault(key, {})[item_id] = None
+        records = self._records.setdefault(key, {})
+        if item_id in records and records[item_id]['op'] == 'add' and get_item(key, item_id) is None:
+            del records[item_id]  # added and removed within the session
+        else:
+            records[item_id] = {'op': 'delete', 'id': item_id}
+        return True
+
+    def replace_all(self, key: str, items: List[Dict[str, Any]]):
+        self._replaced[key] = list(items)
+        self._records.pop(key, None)
+        self._staged.pop(key, None)
+
+    # -- commit ----------------------------------------------------------------
+    def pending(self) -> Dict[str, int]:
+        """Buffered writes per collection (a replace counts as one)."""
+        counts = {key: len(recs) for key, recs in self._records.items() if recs}
+        counts.update({key: 1 for key in self._replaced})
+        return counts
+
+    def commit(self):
+        """Write every touched collection once, then announce the changes."""
+        replaced, records, staged = self._replaced, self._records, self._staged
+        self._replaced, self._records, self._staged = {}, {}, {}
+        for key, items in replaced.items():
+            _backend.replace_all(key, items)
+            _notify(key, 'replace', items)
+        for key, by_id in records.items():
+            batch = list(by_id.values())
+            if not batch:
+                continue
+            with _tracked(key) as sigs:
+                _backend.apply_batch(key, batch)
+            sigs = tuple(sigs)
+            for rec in batch:
+                if rec['op'] == 'add':
+                    _notify(key, 'insert', rec['item'], sigs)
+                elif rec['op'] == 'patch':
+                    _notify(key, 'update', staged[key][rec['id']], sigs)
+                else:
+                    _notify(key, 'delete', rec['id'], sigs)
+
+    def rollback(self):
+        self._replaced, self._records, self._staged = {}, {}, {}
+
+
+@contextmanager
+def session() -> Iterator[Session]:
+    """Batch writes: `with persistence.session() as s: ...` commits on exit, discards on error."""
+    s = Session()
+    try:
+        yield s
+    except BaseException:
+        s.rollback()
+        raise
+    s.commit()
+
+
+def compact(key: str):
+    """Fold a journaled collection back into its snapshot (no-op for other backends/keys)."""
+    fold = getattr(_backend, 'compact', None)
+    if fold is not None:
+        fold(key)
+
+
+def import_json(key: str, path: Optional[str] = None) -> int:
+    """Load a JSON list file (default: the collection's data/*.json) into the active backend."""
+    path = path or _json_path(key)
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    _backend.replace_all(key, items)
+    _notify(key, 'replace', items)
+    return len(items)
 
 
-def replace_all(key: str, items: List[Dict[str, Any]]):
-    atomic_write(key, items)
+def export_json(key: str, path: Optional[str] = None) -> str:
+    """Write the collection from the active backend as pretty JSON (default: data/*.json)."""
+    path = path or _json_path(key)
+    items = _backend.load_list(key)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(items, f, ensure_ascii=False, indent=2)
+    return path
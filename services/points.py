@@ -0,0 +1,144 @@
+"""Club points ledger.
+
+Verified activity reports award points to their club. Instead of summing every
+report on each page render, ClubPointsLedger keeps per-club totals current from
+persistence write events: verify_report / finalize_report_verification /
+unverify_report all go through persistence.update_item, so each adjusts the
+ledger by that one report's delta. A full rebuild from the reports happens on
+first use, after a bulk replace, or when the reports collection signature shows
+it was changed by another process.
+
+Leaderboards pop from a lazily maintained max-heap, so top(k) costs O(k log n)
+rather than a sort of every club.
+"""
+import heapq
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from services import persistence
+
+REPORTS_KEY = 'activity_reports'
+
+
+def report_points(report: Mapping[str, Any]) -> Optional[Tuple[str, int]]:
+    """(club_id, points) a report contributes, or None when it is not Verified."""
+    if report.get('status') != 'Verified':
+        return None
+    return report['club_id'], int(report.get('points_awarded', 0) or 0)
+
+
+class ClubPointsLedger:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._signature: Optional[tuple] = None
+        self._contrib: Dict[str, Tuple[str, int]] = {}  # report id -> (club id, points)
+        self._totals: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}  # verified reports per club
+        self._grand_total = 0
+        self._order: Dict[str, int] = {}  # first-seen sequence (tie-break like the old dict order)
+        self._next = 0
+        self._heap: List[Tuple[int, int, str]] = []  # (-points, order, club id); stale entries skipped
+        persistence.subscribe(self._on_change)
+
+    # -- maintenance -----------------------------------------------------------
+    def _apply(self, report_id: str, contribution: Optional[Tuple[str, int]]):
+        previous = self._contrib.pop(report_id, None)
+        if previous is not None:
+            club_id, pts = previous
+            self._totals[club_id] -= pts
+            self._grand_total -= pts
+            self._counts[club_id] -= 1
+            if not self._counts[club_id]:
+                del self._counts[club_id], self._totals[club_id]
+            else:
+                self._push(club_id)
+        if contribution is not None:
+            club_id, pts = contribution
+            self._contrib[report_id] = contribution
+            if club_id not in self._totals:
+                self._totals[club_id] = 0
+                self._counts[club_id] = 0
+                if club_id not in self._order:
+                    self._order[club_id] = self._next
+                    self._next += 1
+            self._totals[club_id] += pts
+            self._grand_total += pts
+            self._counts[club_id] += 1
+            self._push(club_id)
+
+    def _push(self, club_id: str):
+        heapq.heappush(self._heap, (-self._totals[club_id], self._order[club_id], club_id))
+        if len(self._heap) > 2 * len(self._totals) + 64:
+            self._heap = [(-pts, self._order[cid], cid) for cid, pts in self._totals.items()]
+            heapq.heapify(self._heap)
+
+    def rebuild(self):
+        """Recompute every total from the stored reports."""
+        with self._lock:
+            sig = persistence.signature(REPORTS_KEY)
+            self._contrib, self._totals, self._counts = {}, {}, {}
+            self._grand_total = 0
+            self._order, self._next, self._heap = {}, 0, []
+            for report in persistence.load_view(REPORTS_KEY):
+                self._apply(report['id'], report_points(report))
+            self._signature = sig
+            self._loaded = True
+
+    def _ensure(self):
+        sig = persistence.signature(REPORTS_KEY)
+        with self._lock:
+            if not self._loaded or sig is None or sig != self._signature:
+                self.rebuild()
+
+    def _on_change(self, key: str, op: str, payload: Any):
+        if key != REPORTS_KEY:
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            before, after = persistence.announced_write(REPORTS_KEY)
+            if op == 'replace' or self._signature is None or self._signature not in (before, after):
+                self._loaded = False  # bulk write, or another process wrote in between
+                return
+            if op in ('insert', 'update'):
+                self._apply(payload['id'], report_points(payload))
+            elif op == 'delete':
+                self._apply(payload, None)
+            self._signature = after
+
+    # -- queries ---------------------------------------------------------------
+    def points_map(self) -> Dict[str, int]:
+        """club_id -> verified points (clubs with at least one verified report)."""
+        self._ensure()
+        with self._lock:
+            return dict(self._totals)
+
+    def points_for(self, club_id: str) -> int:
+        self._ensure()
+        return self._totals.get(club_id, 0)
+
+    def total(self) -> int:
+        """Verified points across all clubs."""
+        self._ensure()
+        return self._grand_total
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """The k highest-scoring clubs as (club_id, points), ties in first-seen order."""
+        self._ensure()
+        with self._lock:
+            picked: List[Tuple[int, int, str]] = []
+            seen = set()
+            while self._heap and len(picked) < k:
+                entry = heapq.heappop(self._heap)
+                neg, _, club_id = entry
+                if club_id in seen or self._totals.get(club_id) != -neg:
+                    continue  # stale or duplicate entry
+                seen.add(club_id)
+                picked.append(entry)
+            for entry in picked:
+                heapq.heappush(self._heap, entry)
+            return [(club_id, -neg) for neg, _, club_id in picked]
+
+
+ledger = ClubPointsLedger()
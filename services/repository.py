@@ -0,0 +1,240 @@
+"""Indexed, read-mostly access to persisted collections.
+
+A Repository mirrors one persistence collection in memory with an id -> record
+hash index plus optional secondary indexes (e.g. clubs by member id, reports by
+status). Indexes are kept current incrementally from persistence write events;
+anything written by another process is caught by comparing the collection
+signature and rebuilding on next access.
+
+Records handed out are read-only mappings shared with other callers; use
+persistence.update_item (or dict(record)) to change data.
+
+Repository.query pages through a collection with the filter (index lookup
+and/or predicate) and sort applied here, so list views only ever receive one
+page of records.
+
+Module-level instances cover the four collections:
+    users, clubs, reports, runs
+"""
+import copy
+import heapq
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from services import persistence
+
+Record = Mapping[str, Any]
+KeyFunc = Callable[[Record], Iterable[Any]]
+
+
+class Page:
+    """One page of a query result; `number` is 1-based and clamped to the last page."""
+
+    def __init__(self, items: List[Record], total: int, number: int, size: int):
+        self.items = items
+        self.total = total
+        self.number = number
+        self.size = size
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.size))
+
+    @property
+    def start(self) -> int:
+        """0-based position of the first item in the whole result."""
+        return (self.number - 1) * self.size
+
+
+class Repository:
+    def __init__(self, key: str, indexes: Optional[Dict[str, KeyFunc]] = None):
+        self.key = key
+        self._index_funcs: Dict[str, KeyFunc] = dict(indexes or {})
+        self._lock = threading.RLock()
+        self._signature: Optional[tuple] = None
+        self._loaded = False
+        # Kept in collection order: updates replace a record in its slot, inserts append.
+        self._by_id: Dict[str, Record] = {}
+        # Insertion sequence per id, to keep index buckets in collection order too.
+        self._pos: Dict[str, int] = {}
+        self._next_pos = 0
+        # index name -> value -> {id: None} (dict used as an ordered set)
+        self._indexes: Dict[str, Dict[Any, Dict[str, None]]] = {
+            name: {} for name in self._index_funcs}
+        # (index name, value) of buckets an id joined out of order; ids_by re-sorts them once
+        self._unsorted: set = set()
+        persistence.subscribe(self._on_change)
+
+    # -- maintenance -----------------------------------------------------------
+    def _reset(self):
+        self._by_id = {}
+        self._pos = {}
+        self._next_pos = 0
+        self._indexes = {name: {} for name in self._index_funcs}
+        self._unsorted = set()
+
+    def _add(self, record: Record):
+        rid = record.get('id')
+        if rid is None:
+            return
+        previous = self._by_id.get(rid)
+        if previous is not None:
+            self._unindex(rid, previous, keep=record)
+        self._by_id[rid] = record
+        if rid not in self._pos:
+            self._pos[rid] = self._next_pos
+            self._next_pos += 1
+        pos = self._pos[rid]
+        for name, func in self._index_funcs.items():
+            bucket = self._indexes[name]
+            for value in func(record) or ():
+                ids = bucket.setdefault(value, {})
+                if rid in ids:
+                    continue
+                if ids and self._pos[next(reversed(ids))] > pos:
+                    self._unsorted.add((name, value))
+                ids[rid] = None
+
+    def _unindex(self, rid: str, record: Record, keep: Optional[Record] = None):
+        """Drop `rid` from the index buckets of `record`, except those `keep` is also in."""
+        for name, func in self._index_funcs.items():
+            bucket = self._indexes[name]
+            kept = set(func(keep) or ()) if keep is not None else ()
+            for value in func(record) or ():
+                if value in kept:
+                    continue
+                ids = bucket.get(value)
+                if ids is not None:
+                    ids.pop(rid, None)
+                    if not ids:
+                        del bucket[value]
+                        self._unsorted.discard((name, value))
+
+    def _remove(self, rid: str):
+        record = self._by_id.pop(rid, None)
+        if record is None:
+            return
+        self._pos.pop(rid, None)
+        self._unindex(rid, record)
+
+    def _rebuild(self, signature: Optional[tuple]):
+        self._reset()
+        for record in persistence.load_view(self.key):
+            self._add(record)
+        self._signature = signature
+        self._loaded = True
+
+    def _ensure(self):
+        sig = persistence.signature(self.key)
+        with self._lock:
+            if not self._loaded or sig is None or sig != self._signature:
+                self._rebuild(sig)
+
+    def _on_change(self, key: str, op: str, payload: Any):
+        if key != self.key:
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            before, after = persistence.announced_write(self.key)
+            if op == 'replace' or self._signature is None or self._signature not in (before, after):
+                self._loaded = False  # lazy rebuild: bulk write, or another process wrote in between
+                return
+            if op in ('insert', 'update'):
+                self._add(MappingProxyType(copy.deepcopy(dict(payload))))
+            elif op == 'delete':
+                self._remove(payload)
+            self._signature = after
+
+    def refresh(self):
+        """Force a full rebuild on next access."""
+        with self._lock:
+            self._loaded = False
+
+    # -- lookups ---------------------------------------------------------------
+    def get(self, record_id: Optional[str]) -> Optional[Record]:
+        self._ensure()
+        return self._by_id.get(record_id) if record_id is not None else None
+
+    def __contains__(self, record_id: str) -> bool:
+        return self.get(record_id) is not None
+
+    def __len__(self) -> int:
+        self._ensure()
+        return len(self._by_id)
+
+    def get_many(self, record_ids: Iterable[str]) -> List[Record]:
+        """Records for the given ids, skipping unknown ones (input order kept)."""
+        self._ensure()
+        return [self._by_id[rid] for rid in record_ids if rid in self._by_id]
+
+    def ids_by(self, index: str, value: Any) -> List[str]:
+        self._ensure()
+        with self._lock:
+            ids = self._indexes[index].get(value) or {}
+            if (index, value) in self._unsorted:
+                ids = self._indexes[index][value] = dict.fromkeys(sorted(ids, key=self._pos.__getitem__))
+                self._unsorted.discard((index, value))
+            return list(ids)
+
+    def find(self, index: str, value: Any) -> List[Record]:
+        """Records whose `index` key contains `value`, in collection order."""
+        return [self._by_id[rid] for rid in self.ids_by(index, value)]
+
+    def count_by(self, index: str, value: Any) -> int:
+        self._ensure()
+        return len(self._indexes[index].get(value) or ())
+
+    def values(self, index: str) -> List[Any]:
+        """Distinct values currently present in a secondary index."""
+        self._ensure()
+        return list(self._indexes[index].keys())
+
+    def all(self) -> List[Record]:
+        self._ensure()
+        return list(self._by_id.values())
+
+    def as_map(self) -> Dict[str, Record]:
+        """Snapshot dict id -> record (the dict is new; records are shared)."""
+        self._ensure()
+        return dict(self._by_id)
+
+    def query(self, page: int = 1, size: int = 20, index: Optional[str] = None, value: Any = None,
+              where: Optional[Callable[[Record], bool]] = None,
+              sort_key: Optional[Callable[[Record], Any]] = None, reverse: bool = False) -> Page:
+        """One page of records, filtered and sorted before slicing.
+
+        `index`/`value` narrows through a secondary index, `where` filters the
+        rest; without `sort_key` records keep collection order and nothing is
+        sorted. Sorting is stable and only selects the records up to the
+        requested page (heapq.nsmallest / nlargest) instead of ordering the
+        whole result.
+        """
+        size = max(1, int(size))
+        records = self.find(index, value) if index is not None else self.all()
+        if where is not None:
+            records = [r for r in records if where(r)]
+        total = len(records)
+        number = min(max(1, int(page)), max(1, -(-total // size)))
+        start, stop = (number - 1) * size, number * size
+        if sort_key is not None:
+            if stop < total:
+                select = heapq.nlargest if reverse else heapq.nsmallest
+                records = select(stop, records, key=sort_key)
+            else:
+                records = sorted(records, key=sort_key, reverse=reverse)
+        return Page(records[start:stop], total, number, size)
+
+
+users = Repository('users')
+clubs = Repository('clubs', indexes={
+    'member_id': lambda c: c.get('member_ids') or (),
+    'match_run_id': lambda c: (c.get('match_run_id'),),
+    'status': lambda c: (c.get('status'),),
+})
+reports = Repository('activity_reports', indexes={
+    'club_id': lambda r: (r.get('club_id'),),
+    'status': lambda r: (r.get('status'),),
+})
+runs = Repository('match_runs')
@@ -0,0 +1,153 @@
+"""Snapshot encodings for collections stored by JsonFileBackend.
+
+Each collection's snapshot file is written by one codec, chosen per collection
+(persistence.SNAPSHOT_FORMATS / RCK_SNAPSHOT_FORMATS):
+
+- 'json': pretty-printed JSON list (default, also the export format).
+- 'columnar': one column per field with repeated strings interned. Low-
+  cardinality string fields (region, rank, status, ...) become indexes into a
+  shared string table, string-list fields (interests, member_ids) indexes into
+  it or, when the same lists repeat, into a table of distinct lists. The
+  document itself is compact JSON behind a magic header, so parsing stays in
+  the C json module and rows are rebuilt with zip (garbage collection paused:
+  the rebuild only allocates, and collector passes over a large heap would
+  otherwise dominate). Decoded rows share the interned string objects, which
+  also keeps resident memory down.
+- 'msgpack': msgpack-encoded list, only when the msgpack package is installed.
+
+Codecs round-trip records exactly except for key order inside a record, which
+follows the first record that has each key.
+"""
+import gc
+import json
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+
+class Codec:
+    def __init__(self, name: str, extension: str,
+                 encode: Callable[[List[Dict[str, Any]]], bytes],
+                 decode: Callable[[bytes], List[Dict[str, Any]]]):
+        self.name = name
+        self.extension = extension
+        self.encode = encode
+        self.decode = decode
+
+
+# -- pretty JSON ---------------------------------------------------------------
+
+def _json_encode(items: List[Dict[str, Any]]) -> bytes:
+    return json.dumps(items, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _json_decode(raw: bytes) -> List[Dict[str, Any]]:
+    return json.loads(raw.decode('utf-8'))
+
+
+# -- columnar ------------------------------------------------------------------
+
+COLUMNAR_MAGIC = b'RCKCOL1\n'
+_MISSING = object()
+
+
+def _intern(table: Dict[str, int], value: str) -> int:
+    idx = table.get(value)
+    if idx is None:
+        idx = table[value] = len(table)
+    return idx
+
+
+@contextmanager
+def _gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _columnar_encode(items: List[Dict[str, Any]]) -> bytes:
+    keys = list(dict.fromkeys(k for item in items for k in item))
+    strings: Dict[str, int] = {}
+    lists: Dict[Tuple[int, ...], int] = {}
+    cols = []
+    n = len(items)
+    for key in keys:
+        values = [item.get(key, _MISSING) for item in items]
+        missing = [i for i, v in enumerate(values) if v is _MISSING]
+        present = [v for v in values if v is not _MISSING]
+        if present and all(isinstance(v, str) for v in present) and 2 * len(set(present)) <= n:
+            kind = 's'
+            data = [-1 if v is _MISSING else _intern(strings, v) for v in values]
+        elif present and all(isinstance(v, list) and all(isinstance(x, str) for x in v) for v in present):
+            encoded = [None if v is _MISSING else tuple(_intern(strings, x) for x in v) for v in values]
+            if 2 * len(set(encoded)) <= n:
+                kind = 'L'
+                data = [-1 if v is None else _intern(lists, v) for v in encoded]
+            else:
+                kind = 'S'
+                data = [None if v is None else list(v) for v in encoded]
+        else:
+            kind = 'r'
+            data = [None if v is _MISSING else v for v in values]
+        cols.append([kind, data, missing])
+    doc = {'n': n, 'keys': keys, 'strings': list(strings), 'lists': list(lists), 'cols': cols}
+    return COLUMNAR_MAGIC + json.dumps(doc, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _columnar_decode(raw: bytes) -> List[Dict[str, Any]]:
+    if not raw.startswith(COLUMNAR_MAGIC):
+        raise ValueError('not a columnar snapshot')
+    doc = json.loads(raw[len(COLUMNAR_MAGIC):].decode('utf-8'))
+    strings, keys = doc['strings'], doc['keys']
+    lists = [tuple(strings[i] for i in row) for row in doc.get('lists', ())]
+    with _gc_paused():
+        columns = []
+        for kind, data, missing in doc['cols']:
+            # -1 / None placeholders of missing values are dropped below
+            if kind == 's':
+                columns.append([strings[i] for i in data])
+            elif kind == 'L':
+                columns.append([list(lists[i]) for i in data])  # each row owns its list
+            elif kind == 'S':
+                if missing:
+                    columns.append([None if row is None else [strings[i] for i in row] for row in data])
+                else:
+                    columns.append([[strings[i] for i in row] for row in data])
+            else:
+                columns.append(data)
+        if keys:
+            rows = [dict(zip(keys, values)) for values in zip(*columns)]
+        else:
+            rows = [{} for _ in range(doc['n'])]
+        for key, (_, _, missing) in zip(keys, doc['cols']):
+            for i in missing:
+                del rows[i][key]
+    return rows
+
+
+# -- registry ------------------------------------------------------------------
+
+CODECS: Dict[str, Codec] = {
+    'json': Codec('json', '.json', _json_encode, _json_decode),
+    'columnar': Codec('columnar', '.col', _columnar_encode, _columnar_decode),
+}
+if msgpack is not None:
+    CODECS['msgpack'] = Codec('msgpack', '.msgpack',
+                              lambda items: msgpack.packb(items, use_bin_type=True),
+                              lambda raw: msgpack.unpackb(raw, raw=False))
+
+
+def get_codec(name: str) -> Codec:
+    codec = CODECS.get(name)
+    if codec is None:
+        hint = ' (install msgpack)' if name == 'msgpack' else ''
+        raise ValueError(f"Unknown snapshot format: {name}{hint}")
+    return codec
@@ -0,0 +1,626 @@
+"""Storage backends used by services.persistence.
+
+A backend owns how a collection ('users', 'clubs', 'activity_reports',
+'match_runs') is laid out on disk. persistence keeps the public helpers
+(load_list / replace_all / append_item / ...) and delegates to whichever
+backend is active, so callers never talk to a backend directly.
+
+- JsonFileBackend: one pretty-printed JSON list per collection (legacy layout),
+  optionally with an append-only JSON Lines journal for append-heavy collections.
+- SqliteBackend: one table per collection with row-level insert/update/get.
+  The JSON files stay the import/export format (see persistence.import_json /
+  persistence.export_json).
+
+Every backend exposes lock(key): the JSON backend holds an advisory fcntl lock
+on `<name>.lock` next to the data file, so read-modify-write cycles from
+several processes (multiple Streamlit workers) are serialized per collection.
+The SQLite backend holds a BEGIN IMMEDIATE write transaction instead, which
+serializes writers across processes for the whole database.
+"""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: in-process locking only
+    fcntl = None
+
+# Columns lifted out of the JSON payload so they can be indexed / filtered in SQL.
+SQL_COLUMNS: Dict[str, tuple] = {
+    'users': ('name', 'region', 'rank', 'personality_trait'),
+    'clubs': ('status', 'leader_id', 'match_run_id'),
+    'activity_reports': ('club_id', 'status', 'date'),
+    'match_runs': ('created_at',),
+}
+
+SQL_INDEXES: Dict[str, tuple] = {
+    'clubs': ('status', 'match_run_id'),
+    'activity_reports': ('club_id', 'status'),
+}
+
+# Seconds a SQLite writer waits for another connection's write transaction.
+BUSY_TIMEOUT = 30.0
+
+
+def _merge(item: Dict[str, Any], changes: Dict[str, Any], remove: Iterable[str] = ()) -> Dict[str, Any]:
+    item.update(changes)
+    for k in remove:
+        item.pop(k, None)
+    return item
+
+
+def _replay(items: List[Dict[str, Any]], records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Replay is idempotent: 'add' of a known id replaces it in place.
+    index = {it.get('id'): i for i, it in enumerate(items)}
+    rows: List[Optional[Dict[str, Any]]] = list(items)
+    for rec in records:
+        op = rec.get('op')
+        if op == 'add':
+            item = rec.get('item') or {}
+            pos = index.get(item.get('id'))
+            if pos is None or rows[pos] is None:
+                index[item.get('id')] = len(rows)
+                rows.append(item)
+            else:
+                rows[pos] = item
+        elif op == 'patch':
+            pos = index.get(rec.get('id'))
+            if pos is not None and rows[pos] is not None:
+                _merge(rows[pos], rec.get('set') or {}, rec.get('unset') or ())
+        elif op == 'delete':
+            pos = index.pop(rec.get('id'), None)
+            if pos is not None:
+                rows[pos] = None
+    return [r for r in rows if r is not None]
+
+
+class FileLock:
+    """Reentrant lock that also holds an exclusive advisory flock on `path`.
+
+    flock locks belong to an open file, so a second open in the same process
+    would block on itself; the thread lock plus a depth counter make nested and
+    concurrent in-process use safe while only the outermost holder flocks.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fd, self._fd = self._fd, None
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class StorageBackend:
+    """Interface every backend implements. Items are plain dicts keyed by 'id'."""
+
+    name = 'base'
+
+    def __init__(self):
+        self._key_locks: Dict[str, threading.RLock] = defaultdict(threading.RLock)
+
+    def lock(self, key: str):
+        """Context manager serializing writers of one collection (in-process by default)."""
+        return self._key_locks[key]
+
+    def signature(self, key: str) -> Optional[tuple]:
+        """Cheap change token for a collection; None means "not cacheable"."""
+        return None
+
+    def load_list(self, key: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def replace_all(self, key: str, items: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def append_item(self, key: str, item: Dict[str, Any]):
+        raise NotImplementedError
+
+    def get_item(self, key: str, item_id: str) -> Optional[Dict[str, Any]]:
+        return next((i for i in self.load_list(key) if i.get('id') == item_id), None)
+
+    def update_item(self, key: str, item_id: str, changes: Dict[str, Any],
+                    remove: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """Merge `changes` into the item (dropping `remove` keys). Returns the new item or None."""
+        with self.lock(key):
+            items = self.load_list(key)
+            item = next((i for i in items if i.get('id') == item_id), None)
+            if item is None:
+                return None
+            _merge(item, changes, remove)
+            self.replace_all(key, items)
+        return item
+
+    def delete_item(self, key: str, item_id: str) -> bool:
+        with self.lock(key):
+            items = self.load_list(key)
+            kept = [i for i in items if i.get('id') != item_id]
+            if len(kept) == len(items):
+                return False
+            self.replace_all(key, kept)
+        return True
+
+    def apply_batch(self, key: str, records: List[Dict[str, Any]]):
+        """Apply several journal-style records ('add' / 'patch' / 'delete') as one write."""
+        if records:
+            with self.lock(key):
+                self.replace_all(key, _replay(self.load_list(key), records))
+
+
+class JsonFileBackend(StorageBackend):
+    """Whole-file JSON lists, with an optional append-only journal per collection.
+
+    Snapshots are pretty JSON unless a collection is configured for another
+    encoding (services.snapshots); the journal is always JSON Lines.
+
+    Plain collections: row-level operations fall back to load-modify-rewrite.
+
+    Journaled collections (append-heavy: activity_reports, match_runs) keep the
+    pretty JSON snapshot plus `<name>.journal.jsonl`. New records and patches are
+    appended as one fsync'd line each; load_list replays the journal over the
+    snapshot. The journal's first line records the sha1 of the snapshot it
+    extends, so a journal left behind by a crash next to a newer snapshot is
+    ignored. replace_all / compact also delete the journal under the lock: an
+    identical rewrite (e.g. `[]` after a reset) hashes to the same digest and
+    would otherwise pick the stale journal back up.
+    """
+
+    name = 'json'
+
+    def __init__(self, path_for: Callable[[str], str], writer: Callable[[str, List[Dict[str, Any]]], None],
+                 journaled: Iterable[str] = (), reader: Optional[Callable[[str], Sequence[Mapping[str, Any]]]] = None,
+                 compact_after: int = 500, decoder: Optional[Callable[[str, bytes], List[Dict[str, Any]]]] = None):
+        super().__init__()
+        self._path_for = path_for
+        self._writer = writer
+        # Snapshot bytes -> items (persistence passes the collection's snapshot codec)
+        self._decode = decoder or (lambda key, raw: json.loads(raw.decode('utf-8')))
+        # Read-only view provider for row lookups (persistence passes its cached load_view)
+        self._reader = reader
+        self.journaled = frozenset(journaled)
+        self.compact_after = compact_after
+        self._locks: Dict[str, FileLock] = {}  # lock file path -> lock
+        self._locks_guard = threading.Lock()
+        self._digests: Dict[str, tuple] = {}  # snapshot path -> (stat signature, sha1)
+        self._journal_lines: Dict[str, int] = {}
+        self._compacting: set = set()
+
+    def journal_path(self, key: str) -> str:
+        return os.path.splitext(self._path_for(key))[0] + '.journal.jsonl'
+
+    def lock(self, key: str) -> FileLock:
+        path = os.path.splitext(self._path_for(key))[0] + '.lock'
+        with self._locks_guard:
+            found = self._locks.get(path)
+            if found is None:
+                found = self._locks[path] = FileLock(path)
+            return found
+
+    @staticmethod
+    def _stat_sig(path: str) -> tuple:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return (path, None, None, None)
+        # inode changes on every atomic rename, so same-size rewrites within one mtime tick still differ
+        return (path, st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def signature(self, key: str) -> Optional[tuple]:
+        sig = self._stat_sig(self._path_for(key))
+        if key in self.journaled:
+            sig += self._stat_sig(self.journal_path(key))
+        return sig
+
+    # -- reading ---------------------------------------------------------------
+    def _read_snapshot(self, key: str) -> tuple:
+        """Returns (items, sha1 of the snapshot bytes)."""
+        file_path = self._path_for(key)
+        try:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = b''
+        digest = hashlib.sha1(raw).hexdigest()
+        if not raw:
+            return [], digest
+        try:
+            items = self._decode(key, raw)
+        except Exception:
+            items = []
+        return items, digest
+
+    def _snapshot_digest(self, key: str) -> str:
+        file_path = self._path_for(key)
+        sig = self._stat_sig(file_path)
+        cached = self._digests.get(file_path)
+        if cached and cached[0] == sig:
+            return cached[1]
+        _, digest = self._read_snapshot(key)
+        self._digests[file_path] = (sig, digest)
+        return digest
+
+    def _journal_records(self, key: str, digest: str) -> List[Dict[str, Any]]:
+        jpath = self.journal_path(key)
+        records: List[Dict[str, Any]] = []
+        try:
+            with open(jpath, 'r', encoding='utf-8') as f:
+                header = f.readline()
+                try:
+                    base = json.loads(header).get('base')
+                except Exception:
+                    base = None
+                if base != digest:  # journal belongs to an older snapshot
+                    return []
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except Exception:
+                        continue  # torn trailing line from an interrupted append
+        except FileNotFoundError:
+            return []
+        self._journal_lines[jpath] = len(records)
+        return records
+
+    def load_list(self, key: str) -> List[Dict[str, Any]]:
+        items, digest = self._read_snapshot(key)
+        if key not in self.journaled:
+            return items
+        self._digests[self._path_for(key)] = (self._stat_sig(self._path_for(key)), digest)
+        return _replay(items, self._journal_records(key, digest))
+
+    def _view(self, key: str) -> Sequence[Mapping[str, Any]]:
+        return self._reader(key) if self._reader else self.load_list(key)
+
+    def _find(self, key: str, item_id: str) -> Optional[Mapping[str, Any]]:
+        return next((i for i in self._view(key) if i.get('id') == item_id), None)
+
+    def get_item(self, key: str, item_id: str) -> Optional[Dict[str, Any]]:
+        found = self._find(key, item_id)
+        return copy.deepcopy(dict(found)) if found is not None else None
+
+    # -- journal writes --------------------------------------------------------
+    def _append_journal(self, key: str, *records: Dict[str, Any]):
+        jpath = self.journal_path(key)
+        with self.lock(key):
+            digest = self._snapshot_digest(key)
+            fresh = True
+            try:
+                with open(jpath, 'r', encoding='utf-8') as f:
+                    fresh = json.loads(f.readline() or '{}').get('base') != digest
+            except (FileNotFoundError, ValueError):
+                fresh = True
+            lines = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+            with open(jpath, 'w' if fresh else 'a', encoding='utf-8') as f:
+                if fresh:
+                    f.write(json.dumps({'op': 'base', 'base': digest}) + '\n')
+                    self._journal_lines[jpath] = 0
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            if jpath not in self._journal_lines:
+                self._journal_records(key, digest)
+            else:
+                self._journal_lines[jpath] += len(records)
+            if self._journal_lines[jpath] >= self.compact_after and key not in self._compacting:
+                self._compacting.add(key)
+                threading.Thread(target=self._background_compact, args=(key,), daemon=True).start()
+
+    def _background_compact(self, key: str):
+        try:
+            self.compact(key)
+        except Exception:
+            pass  # journal stays valid; the next threshold crossing retries
+        finally:
+            self._compacting.discard(key)
+
+    def _drop_journal(self, key: str):
+        """Remove the journal after its snapshot was rewritten (caller holds the lock)."""
+        jpath = self.journal_path(key)
+        try:
+            os.remove(jpath)
+        except FileNotFoundError:
+            pass
+        self._journal_lines[jpath] = 0
+
+    def compact(self, key: str):
+        """Fold the journal into a fresh snapshot and drop the journal."""
+        if key not in self.journaled:
+            return
+        with self.lock(key):
+            items = self.load_list(key)
+            self._writer(key, items)
+            self._drop_journal(key)
+
+    # -- collection API --------------------------------------------------------
+    def replace_all(self, key: str, items: List[Dict[str, Any]]):
+        with self.lock(key):
+            self._writer(key, items)
+            if key in self.journaled:
+                self._drop_journal(key)
+
+    def append_item(self, key: str, item: Dict[str, Any]):
+        if key in self.journaled:
+            self._append_journal(key, {'op': 'add', 'item': item})
+            return
+        with self.lock(key):
+            data = self.load_list(key)
+            data.append(item)
+            self._writer(key, data)
+
+    def update_item(self, key: str, item_id: str, changes: Dict[str, Any],
+                    remove: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        remove = list(remove)
+        if key in self.journaled:
+            with self.lock(key):
+                current = self._find(key, item_id)
+                if current is None:
+                    return None
+                self._append_journal(
+                    key, {'op': 'patch', 'id': item_id, 'set': changes, 'unset': remove})
+            return _merge(copy.deepcopy(dict(current)), changes, remove)
+        with self.lock(key):
+            # Shallow copies are enough: only top-level keys of one item are touched.
+            items = [dict(i) for i in self._view(key)]
+            item = next((i for i in items if i.get('id') == item_id), None)
+            if item is None:
+                return None
+            _merge(item, changes, remove)
+            self._writer(key, items)
+        return item
+
+    def delete_item(self, key: str, item_id: str) -> bool:
+        if key in self.journaled:
+            with self.lock(key):
+                if self._find(key, item_id) is None:
+                    return False
+                self._append_journal(key, {'op': 'delete', 'id': item_id})
+            return True
+        with self.lock(key):
+            items = [dict(i) for i in self._view(key)]
+            kept = [i for i in items if i.get('id') != item_id]
+            if len(kept) == len(items):
+                return False
+            self._writer(key, kept)
+        return True
+
+    def apply_batch(self, key: str, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        if key in self.journaled:
+            self._append_journal(key, *records)  # one append + fsync for the whole batch
+            return
+        with self.lock(key):
+            self._writer(key, _replay([dict(i) for i in self._view(key)], records))
+
+
+class SqliteBackend(StorageBackend):
+    """Embedded SQLite store: one table per collection, full record kept as JSON text.
+
+    Rows keep insertion order through an autoincrement `seq` so load_list returns
+    the same ordering the JSON files had. A fresh database is bootstrapped from
+    the existing JSON files (if any) the first time it is opened.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, db_path_for: Callable[[], str], json_path_for: Optional[Callable[[str], str]] = None):
+        super().__init__()
+        self._db_path_for = db_path_for
+        self._json_path_for = json_path_for
+        self._local = threading.local()
+        # Bumped on every write through this backend (any thread); other
+        # processes' commits show up through PRAGMA data_version.
+        self._versions: Dict[str, int] = defaultdict(int)
+
+    def signature(self, key: str) -> Optional[tuple]:
+        self._table(key)
+        data_version = self._conn().execute('PRAGMA data_version').fetchone()[0]
+        return (self._db_path_for(), data_version, self._versions[key])
+
+    def _bump(self, key: str):
+        self._versions[key] += 1
+
+    # -- connection / schema -------------------------------------------------
+    def _conn(self) -> sqlite3.Connection:
+        db_path = self._db_path_for()
+        conns = getattr(self._local, 'conns', None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(db_path)
+        if conn is None:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            fresh = not os.path.exists(db_path)
+            conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._ensure_schema(conn)
+            conns[db_path] = conn
+            if fresh and self._json_path_for is not None:
+                for key in SQL_COLUMNS:
+                    self.import_json(key, self._json_path_for(key))
+        return conn
+
+    def lock(self, key: str):
+        """Hold a write transaction (BEGIN IMMEDIATE) on this thread's connection.
+
+        SQLite admits one writer per database, so this serializes read-modify-write
+        cycles across threads and processes alike; it covers every collection, not
+        just `key`. Nested use joins the outer transaction, which commits when the
+        outermost block exits and rolls back if it raises.
+        """
+        self._table(key)
+        return self._transaction()
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn()
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            conn.execute('BEGIN IMMEDIATE')
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+            raise
+        else:
+            if depth == 0:
+                conn.commit()
+        finally:
+            self._local.depth = depth
+
+    def close(self):
+        for conn in (getattr(self._local, 'conns', None) or {}).values():
+            conn.close()
+        self._local.conns = {}
+
+    @staticmethod
+    def _ensure_schema(conn: sqlite3.Connection):
+        with conn:
+            for key, cols in SQL_COLUMNS.items():
+                extra = ''.join(f', "{c}" TEXT' for c in cols)
+                conn.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{key}" ('
+                    'seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE'
+                    f'{extra}, data TEXT NOT NULL)')
+                for col in SQL_INDEXES.get(key, ()):
+                    conn.execute(
+                        f'CREATE INDEX IF NOT EXISTS "ix_{key}_{col}" ON "{key}" ("{col}")')
+
+    @staticmethod
+    def _table(key: str) -> str:
+        if key not in SQL_COLUMNS:
+            raise KeyError(key)
+        return key
+
+    @staticmethod
+    def _row(key: str, item: Dict[str, Any]) -> tuple:
+        cols = SQL_COLUMNS[key]
+        return (item.get('id'), *[item.get(c) for c in cols], json.dumps(item, ensure_ascii=False))
+
+    @staticmethod
+    def _insert_sql(key: str) -> str:
+        cols = ['id', *SQL_COLUMNS[key], 'data']
+        names = ', '.join(f'"{c}"' for c in cols)
+        marks = ', '.join('?' for _ in cols)
+        # Duplicate ids replace the earlier row (last write wins, like a dict keyed by id).
+        return f'INSERT OR REPLACE INTO "{key}" ({names}) VALUES ({marks})'
+
+    # -- collection API ------------------------------------------------------
+    def load_list(self, key: str) -> List[Dict[str, Any]]:
+        table = self._table(key)
+        rows = self._conn().execute(f'SELECT data FROM "{table}" ORDER BY seq')
+        return [json.loads(r[0]) for r in rows]
+
+    def replace_all(self, key: str, items: List[Dict[str, Any]]):
+        table = self._table(key)
+        with self._transaction() as conn:
+            conn.execute(f'DELETE FROM "{table}"')
+            conn.executemany(self._insert_sql(key), [self._row(key, i) for i in items])
+        self._bump(key)
+
+    def append_item(self, key: str, item: Dict[str, Any]):
+        self._table(key)
+        with self._transaction() as conn:
+            conn.execute(self._insert_sql(key), self._row(key, item))
+        self._bump(key)
+
+    def get_item(self, key: str, item_id: str) -> Optional[Dict[str, Any]]:
+        table = self._table(key)
+        row = self._conn().execute(
+            f'SELECT data FROM "{table}" WHERE id = ?', (item_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update_item(self, key: str, item_id: str, changes: Dict[str, Any],
+                    remove: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        table = self._table(key)
+        with self._transaction() as conn:
+            row = conn.execute(
+                f'SELECT data FROM "{table}" WHERE id = ?', (item_id,)).fetchone()
+            if not row:
+                return None
+            item = _merge(json.loads(row[0]), changes, remove)
+            cols = SQL_COLUMNS[key]
+            sets = ', '.join(f'"{c}" = ?' for c in (*cols, 'data'))
+            conn.execute(f'UPDATE "{table}" SET {sets} WHERE id = ?',
+                         (*self._row(key, item)[1:], item_id))
+        self._bump(key)
+        return item
+
+    def delete_item(self, key: str, item_id: str) -> bool:
+        table = self._table(key)
+        with self._transaction() as conn:
+            cur = conn.execute(f'DELETE FROM "{table}" WHERE id = ?', (item_id,))
+        self._bump(key)
+        return cur.rowcount > 0
+
+    def apply_batch(self, key: str, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        table = self._table(key)
+        cols = SQL_COLUMNS[key]
+        sets = ', '.join(f'"{c}" = ?' for c in (*cols, 'data'))
+        with self._transaction() as conn:  # one transaction for the whole batch
+            for rec in records:
+                op = rec.get('op')
+                if op == 'add':
+                    conn.execute(self._insert_sql(key), self._row(key, rec['item']))
+                elif op == 'patch':
+                    row = conn.execute(
+                        f'SELECT data FROM "{table}" WHERE id = ?', (rec['id'],)).fetchone()
+                    if row:
+                        item = _merge(json.loads(row[0]), rec.get('set') or {}, rec.get('unset') or ())
+                        conn.execute(f'UPDATE "{table}" SET {sets} WHERE id = ?',
+                                     (*self._row(key, item)[1:], rec['id']))
+                elif op == 'delete':
+                    conn.execute(f'DELETE FROM "{table}" WHERE id = ?', (rec['id'],))
+        self._bump(key)
+
+    # -- JSON interchange ----------------------------------------------------
+    def import_json(self, key: str, path: str) -> int:
+        """Replace the table contents with a JSON list file. Returns rows imported."""
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except Exception:
+            return 0
+        if not isinstance(items, list):
+            return 0
+        self.replace_all(key, items)
+        return len(items)
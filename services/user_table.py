@@ -0,0 +1,301 @@
+"""Columnar, memory-mappable user table for matching and analytics.
+
+Matching and analytics only need a few fields per user. UserTable keeps them
+as columns instead of one dict / User object per user:
+
+- ids: string table (list in memory; utf-8 blob + offsets when mapped)
+- region / rank / personality: uint16 codes into small vocabularies
+- interests: uint64 bitmask over the table's interest vocabulary (the
+  INTERESTS constants first, then any other name in first-seen order)
+
+A table can be saved to a single file and opened again with mmap: the
+columns are then memoryviews over the mapping, so loading costs no parsing
+and the pages are shared by every process that maps the same file. Code and
+mask columns (array or memoryview) support the buffer protocol, so
+numpy.frombuffer(table.masks, dtype='uint64') is a zero-copy view if needed.
+build() writes data/users.tbl for the current users collection (deploy step or
+scripts/build_user_table.py); current() maps that file while it matches the
+collection's signature and otherwise builds the table in memory, so request
+handlers never write it.
+"""
+import array
+import json
+import mmap
+import os
+import sys
+import tempfile
+import threading
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from domain.constants import INTERESTS
+from services import persistence
+
+TABLE_FILE = 'users.tbl'
+MAGIC = b'RCKUTBL1'
+MAX_INTERESTS = 64  # one uint64 mask per user
+_ALIGN = 8
+
+
+class _StringColumn:
+    """Read-only sequence of strings stored as one utf-8 blob plus offsets.
+
+    The blob is decoded into a list on first access and kept, so indexing a
+    mapped column costs the same as indexing a list afterwards.
+    """
+
+    def __init__(self, blob: memoryview, offsets: Sequence[int]):
+        self._blob = blob
+        self._offsets = offsets
+        self._strings: Optional[List[str]] = None
+
+    def _decoded(self) -> List[str]:
+        if self._strings is None:
+            blob, offsets = self._blob, self._offsets
+            self._strings = [bytes(blob[offsets[i]:offsets[i + 1]]).decode('utf-8')
+                             for i in range(len(offsets) - 1)]
+        return self._strings
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self._decoded()[i]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decoded())
+
+
+class _Vocab:
+    def __init__(self, initial: Iterable[str] = ()):
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for name in initial:
+            self.code(name)
+
+    def code(self, name: str) -> int:
+        found = self._codes.get(name)
+        if found is None:
+            found = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return found
+
+
+class UserTable:
+    """One row per user; columns are indexable sequences of equal length."""
+
+    def __init__(self, ids: Sequence[str], regions: List[str], ranks: List[str], traits: List[str],
+                 interests: List[str], region_codes: Sequence[int], rank_codes: Sequence[int],
+                 trait_codes: Sequence[int], masks: Sequence[int], source: Optional[list] = None):
+        self.ids = ids
+        self.regions = regions
+        self.ranks = ranks
+        self.traits = traits
+        self.interests = interests
+        self.region_codes = region_codes
+        self.rank_codes = rank_codes
+        self.trait_codes = trait_codes
+        self.masks = masks
+        self.source = source  # users collection signature the table was built from
+        self._index: Optional[Dict[str, int]] = None
+        self._interest_bits = {name: i for i, name in enumerate(interests)}
+        self._mapping = None
+
+    # -- building --------------------------------------------------------------
+    @classmethod
+    def _build(cls, rows: Iterable[tuple], source: Optional[list] = None) -> 'UserTable':
+        regions, ranks, traits = _Vocab(), _Vocab(), _Vocab()
+        interests = _Vocab(INTERESTS)
+        ids: List[str] = []
+        region_codes, rank_codes, trait_codes = array.array('H'), array.array('H'), array.array('H')
+        masks: List[int] = []
+        for uid, region, rank, trait, names in rows:
+            ids.append(uid)
+            region_codes.append(regions.code(region))
+            rank_codes.append(ranks.code(rank))
+            trait_codes.append(traits.code(trait))
+            mask = 0
+            for name in names or ():
+                mask |= 1 << interests.code(name)
+            masks.append(mask)
+        if len(interests.names) <= MAX_INTERESTS:
+            masks = array.array('Q', masks)  # else: plain ints (in-memory only, save() refuses)
+        return cls(ids, regions.names, ranks.names, traits.names, interests.names,
+                   region_codes, rank_codes, trait_codes, masks, source)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping], source: Optional[list] = None) -> 'UserTable':
+        """From user dicts (persistence records)."""
+        return cls._build(((r['id'], r.get('region'), r.get('rank'), r.get('personality_trait'),
+                            r.get('interests')) for r in records), source)
+
+    @classmethod
+    def from_users(cls, users: Iterable) -> 'UserTable':
+        """From User objects (domain.models.User)."""
+        return cls._build((u.id, u.region, u.rank, u.personality_trait, u.interests) for u in users)
+
+    # -- access ----------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.region_codes)
+
+    def row_index(self) -> Dict[str, int]:
+        """id -> row (built once; the last row wins for duplicate ids)."""
+        if self._index is None:
+            self._index = {uid: row for row, uid in enumerate(self.ids)}
+        return self._index
+
+    def region(self, row: int) -> str:
+        return self.regions[self.region_codes[row]]
+
+    def rank(self, row: int) -> str:
+        return self.ranks[self.rank_codes[row]]
+
+    def trait(self, row: int) -> str:
+        return self.traits[self.trait_codes[row]]
+
+    def interest_names(self, mask: int) -> List[str]:
+        """Interest names of a mask over this table's vocabulary, vocabulary order."""
+        names = []
+        pos = 0
+        while mask:
+            if mask & 1:
+                names.append(self.interests[pos])
+            mask >>= 1
+            pos += 1
+        return names
+
+    def interest_mask(self, names: Iterable[str]) -> int:
+        """Mask of interest names in this table's bits (names it has never seen are ignored)."""
+        mask = 0
+        for name in names:
+            bit = self._interest_bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    # -- file format -----------------------------------------------------------
+    # MAGIC, uint64 header length, JSON header (vocabularies, byte order, column
+    # offsets), then 8-byte aligned columns: id offsets (Q), id blob, region /
+    # rank / trait codes (H), masks (Q).
+    def save(self, path: str):
+        """Write the table atomically (temp file in the same directory + rename)."""
+        if len(self.interests) > MAX_INTERESTS:
+            raise ValueError(f"more than {MAX_INTERESTS} distinct interests; table cannot be saved")
+        encoded = [uid.encode('utf-8') for uid in self.ids]
+        offsets = array.array('Q', [0])
+        total = 0
+        for raw in encoded:
+            total += len(raw)
+            offsets.append(total)
+        sections = [('id_offsets', 'Q', offsets.tobytes()), ('id_blob', 'B', b''.join(encoded)),
+                    ('region_codes', 'H', array.array('H', self.region_codes).tobytes()),
+                    ('rank_codes', 'H', array.array('H', self.rank_codes).tobytes()),
+                    ('trait_codes', 'H', array.array('H', self.trait_codes).tobytes()),
+                    ('masks', 'Q', array.array('Q', self.masks).tobytes())]
+        header = {'rows': len(self), 'byteorder': sys.byteorder, 'source': self.source,
+                  'regions': self.regions, 'ranks': self.ranks, 'traits': self.traits,
+                  'interests': self.interests, 'columns': {}}
+        pos = 0  # column offsets are relative to the end of the header
+        for name, code, raw in sections:
+            header['columns'][name] = [code, pos, len(raw)]
+            pos += len(raw) + (-len(raw)) % _ALIGN
+        head = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        head += b' ' * ((-(len(MAGIC) + 8 + len(head))) % _ALIGN)
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='tmp_', suffix='.tbl', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(MAGIC + len(head).to_bytes(8, 'little') + head)
+                for _, _, raw in sections:
+                    f.write(raw + b'\0' * ((-len(raw)) % _ALIGN))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def open(cls, path: str) -> 'UserTable':
+        """Map a saved table read-only; columns are views over the mapping (no copy)."""
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < len(MAGIC) + 8:
+                raise ValueError('not a user table')
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError('not a user table')
+        head_len = int.from_bytes(view[len(MAGIC):len(MAGIC) + 8], 'little')
+        head_end = len(MAGIC) + 8 + head_len
+        header = json.loads(bytes(view[len(MAGIC) + 8:head_end]).decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError('user table was written on a machine with another byte order')
+
+        def column(name):
+            code, offset, length = header['columns'][name]
+            return view[head_end + offset:head_end + offset + length].cast(code)
+
+        table = cls(_StringColumn(column('id_blob'), column('id_offsets')),
+                    header['regions'], header['ranks'], header['traits'], header['interests'],
+                    column('region_codes'), column('rank_codes'), column('trait_codes'),
+                    column('masks'), header.get('source'))
+        table._mapping = mapping  # keep the mapping alive as long as the table
+        return table
+
+
+# -- table for the current users collection -------------------------------------
+
+_lock = threading.Lock()
+_current: Optional[UserTable] = None
+
+
+def table_path() -> str:
+    return os.path.join(persistence.DATA_DIR, TABLE_FILE)
+
+
+def _users_token() -> Optional[list]:
+    sig = persistence.signature('users')
+    return json.loads(json.dumps(list(sig))) if sig is not None else None
+
+
+def build() -> UserTable:
+    """Write data/users.tbl for the current users collection and return it mapped.
+
+    Holds the users collection lock (a file lock for the JSON backend), so the
+    table matches one state of the collection and concurrent builders in other
+    processes take turns. Tables that cannot be saved are returned in memory.
+    """
+    global _current
+    with persistence.get_backend().lock('users'):
+        token = _users_token()
+        table = UserTable.from_records(persistence.load_view('users'), source=token)
+        if token is not None and len(table.interests) <= MAX_INTERESTS:
+            table.save(table_path())
+            table = UserTable.open(table_path())
+    with _lock:
+        _current = table
+    return table
+
+
+def current() -> UserTable:
+    """The users collection as a UserTable: the mapped file from build() while it
+    matches the collection, else built in memory (nothing is written here)."""
+    global _current
+    token = _users_token()
+    with _lock:
+        if token is not None and _current is not None and _current.source == token:
+            return _current
+        table = None
+        if token is not None:
+            try:
+                table = UserTable.open(table_path())
+            except (OSError, ValueError, KeyError):
+                table = None
+            if table is not None and table.source != token:
+                table = None
+        if table is None:
+            table = UserTable.from_records(persistence.load_view('users'), source=token)
+        _current = table
+        return table
@@ -1,21 +1,20 @@
-"""User service helpers: loading, saving, duplicate detection, session convenience.
+"""User service helpers: loading, row-level writes, duplicate detection, session convenience.
 
-Demo user definition is centralized in domain.constants.DEMO_USER so edits persist.
+Demo user state is centralized in domain.constants (demo_user_store) so edits persist.
 """
 from __future__ import annotations
 from typing import List, Dict, Any, Optional
 from dataclasses import asdict
 from domain.models import User
-from services import persistence
-from domain.constants import get_demo_user, save_demo_user
+from services import persistence, repository
+from domain.constants import demo_user_store, get_demo_user, save_demo_user
 import os
 import json
+import threading
 from utils.paths import resolve_data_file
 
 _SEED_USERS_PATH = resolve_data_file('seed_users.json') or os.path.join(
     os.path.abspath(os.path.join(os.path.dirname(__file__), '..')), 'data', 'seed_users.json')
-_DEMO_STATE_PATH = resolve_data_file('demo_user_state.json') or os.path.join(
-    os.path.abspath(os.path.join(os.path.dirname(__file__), '..')), 'data', 'demo_user_state.json')
 
 
 def _load_seed_users():
@@ -36,62 +35,74 @@ def ensure_demo_user(users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
     Steps:
     1. If users list empty, attempt bootstrap from seed_users.json.
-    2. Load demo_user_state.json; fallback to get_demo_user() if missing/invalid.
+    2. Take the demo state from get_demo_user() (demo_user_state.json, else defaults).
     3. Overwrite existing demo_user entry or insert it (at front) if absent.
-    4. Persist only if a change was applied.
+    4. Persist only if a change was applied. The write re-applies steps 1-3 to
+       the stored collection via persistence.modify, so users registered since
+       `users` was read are kept.
     """
-    changed = False
-    if not users:
-        seed_set = _load_seed_users()
-        if seed_set:
-            users = seed_set
-            changed = True
-
-    # Load state file
-    demo_state: Dict[str, Any] = {}
-    if _DEMO_STATE_PATH and os.path.exists(_DEMO_STATE_PATH):
-        try:
-            with open(_DEMO_STATE_PATH, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, dict) and data.get('id') == 'demo_user':
-                    demo_state = data
-        except Exception:
-            demo_state = {}
-    else:
-        demo_state = {}
-    if not demo_state:  # fallback
+    def sync(current: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not current:
+            current = _load_seed_users() or current
+        # Current demo state (cached by domain.constants, re-read only when the file changed)
         demo_state = get_demo_user()
+        idx = next((i for i, u in enumerate(current)
+                   if u.get('id') == 'demo_user'), None)
+        if idx is None:
+            current.insert(0, demo_state)
+        elif current[idx] != demo_state:
+            current[idx] = demo_state
+        return current
 
-    # Find existing demo_user index
-    idx = next((i for i, u in enumerate(users)
-               if u.get('id') == 'demo_user'), None)
-    if idx is None:
-        users.insert(0, demo_state)
-        changed = True
-    else:
-        # Only overwrite if different
-        if users[idx] != demo_state:
-            users[idx] = demo_state
-            changed = True
+    if sync(list(users)) == users:
+        return users
+    return persistence.modify('users', sync)
 
-    if changed:
-        persistence.replace_all('users', users)
-    return users
 
+# (users signature, demo state version) at which demo_user was last found in sync
+_demo_checked: Optional[tuple] = None
+_demo_lock = threading.Lock()
 
-def load_users() -> List[Dict[str, Any]]:
-    users = persistence.load_list('users')
-    return ensure_demo_user(users)
 
+def _demo_token() -> Optional[tuple]:
+    sig = persistence.signature('users')
+    return None if sig is None else (sig, demo_user_store.version())
 
-def save_users(users: List[Dict[str, Any]]):
-    """Persist users without clobbering an edited demo user.
 
-    If demo user missing entirely, seed baseline; otherwise keep current demo fields.
+def ensure_demo_present() -> bool:
+    """Cheap per-rerun form of ensure_demo_user; returns True if users were written.
+
+    The check is memoized for the process and only repeated when the users
+    collection or the demo state file changed. It probes the users-by-id index
+    instead of loading the list; a mismatching demo record is patched in place
+    and only a missing one (or an empty collection) takes the full
+    ensure_demo_user path.
     """
-    if not any(u.get('id') == 'demo_user' for u in users):
-        users.append(get_demo_user())
-    persistence.replace_all('users', users)
+    global _demo_checked
+    token = _demo_token()
+    if token is not None and token == _demo_checked:
+        return False
+    with _demo_lock:
+        token = _demo_token()
+        if token is not None and token == _demo_checked:
+            return False
+        demo_state = get_demo_user()
+        record = repository.users.get('demo_user')
+        changed = False
+        if record is None:
+            ensure_demo_user(persistence.load_list('users'))
+            changed = True
+        elif dict(record) != demo_state:
+            persistence.update_item('users', 'demo_user', demo_state,
+                                    remove=[k for k in record if k not in demo_state])
+            changed = True
+        _demo_checked = _demo_token()
+        return changed
+
+
+def load_users() -> List[Dict[str, Any]]:
+    ensure_demo_present()
+    return persistence.load_list('users')
 
 
 def is_duplicate_user(name: str, region: str, users: List[Dict[str, Any]], exclude_id: Optional[str] = None) -> bool:
@@ -106,9 +117,13 @@ def is_duplicate_user(name: str, region: str, users: List[Dict[str, Any]], exclu
 
 
 def append_user(user: User):
-    users = load_users()
-    users.append(asdict(user))
-    save_users(users)
+    ensure_demo_present()
+    persistence.append_item('users', asdict(user))
+
+
+def update_user(user_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Row-level update of one user; other users' concurrent edits are kept."""
+    return persistence.update_item('users', user_id, changes)
 
 
 def persist_demo_user_if_changed(updated: Dict[str, Any]):
@@ -1,5 +1,16 @@
 import sys
 import os
 
+import pytest
+
 # Add the project root to the Python path to allow for absolute imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
\ No newline at end of file
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Empty data directory that services.persistence reads and writes for this test."""
+    path = tmp_path / 'data'
+    path.mkdir()
+    monkeypatch.setattr('services.persistence.DATA_DIR', str(path))
+    return path
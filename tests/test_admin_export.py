@@ -0,0 +1,38 @@
+import csv
+import gzip
+import io
+
+from services import admin, persistence
+
+
+def test_streaming_csv_export_schema_flatten_and_gzip(data_dir):
+    persistence.replace_all('activity_reports', [
+        {'id': 'r1', 'club_id': 'c1', 'status': 'Verified', 'participant_ids': ['a', 'b'],
+         'verification_metrics': {'participants': 0.8, 'interest': 1.0, 'diversity': 0.5}},
+        {'id': 'r2', 'club_id': 'c1', 'status': 'Pending', 'unexpected': 'dropped'},
+    ])
+    text = ''.join(admin.iter_csv('activity_reports', chunk_size=10))
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert list(rows[0]) == admin.csv_columns('activity_reports')
+    assert rows[0]['verification_metrics.interest'] == '1.0'
+    assert rows[0]['participant_ids'] == '["a", "b"]'
+    assert rows[1]['verification_metrics.diversity'] == '' and 'unexpected' not in rows[1]
+    packed = admin.export_csv_bytes('activity_reports', compress=True)
+    assert gzip.decompress(packed).decode('utf-8') == text
+    assert admin.export_to_csv('match_runs') == ''
+
+
+def test_export_buttons_render_download_through_streamlit(data_dir):
+    from streamlit.testing.v1 import AppTest
+
+    def script():
+        from views.admin_tabs.data import render_data_tab
+        render_data_tab()
+
+    persistence.replace_all('activity_reports', [{'id': 'r1', 'club_id': 'c1', 'status': 'Pending'}])
+    at = AppTest.from_function(script).run()
+    for compress in (False, True):
+        at.checkbox(key='export_gzip').set_value(compress).run()
+        next(b for b in at.button if b.label == "보고서").click().run()
+        assert not at.exception
+        assert [e for e in at.get('download_button')]
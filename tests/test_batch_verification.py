@@ -0,0 +1,15 @@
+from services import activity, persistence
+
+
+def test_batch_verification_previews_commit_once(data_dir, monkeypatch):
+    persistence.replace_all('clubs', [{'id': 'c1', 'status': 'Active', 'member_ids': ['a', 'b']}])
+    persistence.replace_all('activity_reports', [
+        {'id': f'r{i}', 'club_id': 'c1', 'status': 'Pending', 'raw_text': '산책'} for i in range(3)])
+    backend = persistence.get_backend()
+    appends = []
+    original = backend._append_journal
+    monkeypatch.setattr(backend, '_append_journal', lambda key, *records: (appends.append(len(records)), original(key, *records)))
+    previews = activity.prepare_report_verifications()
+    assert sorted(previews) == ['r0', 'r1', 'r2']
+    assert appends == [3]  # one fsync'd journal append for the whole batch
+    assert all('verification_preview' in r for r in persistence.load_list('activity_reports'))
@@ -0,0 +1,73 @@
+import pytest
+from services import data_context, persistence
+
+
+def test_rerun_context_loads_each_collection_once(tmp_path, monkeypatch):
+    monkeypatch.setattr('services.persistence.DATA_DIR', str(tmp_path))
+    persistence.replace_all('users', [{'id': 'u1', 'name': 'A'}, {'id': 'u2', 'name': 'B'}])
+    persistence.replace_all('clubs', [{'id': 'c1', 'member_ids': ['u1', 'u2'], 'leader_id': 'u1'}])
+
+    with data_context.rerun() as ctx:
+        assert data_context.current() is ctx
+        user_map = ctx.user_map()
+        assert data_context.current().user_map() is user_map
+        assert ctx.users() is ctx.users()
+        assert set(ctx.clubs_map()) == {'c1'}
+        assert ctx.loads == {'users': 1, 'clubs': 1}
+        assert ctx.redundant_loads() == {}
+
+        # A write makes the next access reload (and rebuild the derived map)
+        persistence.update_item('users', 'u2', {'name': 'B2'})
+        assert ctx.user_map()['u2']['name'] == 'B2'
+
+        # Code bypassing the context shows up as a redundant load
+        persistence.load_list('clubs')
+        assert ctx.redundant_loads() == {'users': 1, 'clubs': 1}
+
+    assert data_context.current() is not ctx
+    persistence.load_list('users')
+    assert ctx.loads['users'] == 2  # counting stopped with the rerun
+
+
+def test_report_cards_share_one_club_name_lookup(tmp_path, monkeypatch):
+    from unittest.mock import MagicMock, patch
+    monkeypatch.setattr('services.persistence.DATA_DIR', str(tmp_path))
+    persistence.replace_all('clubs', [{'id': f'c{i}', 'name': f'Club {i}', 'member_ids': []} for i in range(20)]
+                            + [{'id': 'unnamed', 'member_ids': []}])
+    with patch.dict('sys.modules', {'streamlit': MagicMock()}):
+        from ui.components import cards
+        with data_context.rerun() as ctx:
+            names = ctx.club_names()
+            assert names['c3'] == 'Club 3' and 'unnamed' not in names
+            for i in range(20):
+                cards.report_card({'id': f'r{i}', 'club_id': f'c{i}'}, club_names=names)
+            cards.report_card({'id': 'r-fallback', 'club_id': 'c1'})  # falls back to the context
+        assert ctx.loads == {'clubs': 1}
+        # Outside a rerun the fallback probes the clubs index, not a full load
+        counts = {}
+        persistence.count_loads(counts)
+        try:
+            cards.report_card({'id': 'r-index', 'club_id': 'c2'})
+            assert data_context.club_name('c2') == 'Club 2'
+            assert data_context.club_name('unnamed') is None and data_context.club_name('nope') is None
+        finally:
+            persistence.count_loads(None)
+        assert counts == {}
+
+
+def test_context_hands_out_read_only_views(data_dir):
+    from services import admin
+    persistence.replace_all('users', [{'id': 'u1', 'name': 'A', 'region': '서울', 'survey_answers': [2]}])
+    with data_context.rerun() as ctx:
+        users = ctx.users()
+        with pytest.raises(TypeError):
+            users[0]['name'] = 'changed'
+        with pytest.raises((TypeError, AttributeError)):
+            users.append({'id': 'u2'})
+        with pytest.raises(TypeError):
+            ctx.user_map()['u2'] = {'id': 'u2'}
+        # Services given the shared view write through persistence instead of editing it
+        updated = admin.update_user_profile('u1', {'name': 'B', 'region': '서울', 'survey_answers': [2]}, users)
+        assert updated['name'] == 'B' and users[0]['name'] == 'A'
+        assert ctx.user_map()['u1']['name'] == 'B'
+        assert ctx.loads == {'users': 2}
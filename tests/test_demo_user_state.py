@@ -59,3 +59,66 @@ def test_admin_update_persists_state():
     assert state['rank'] == new_rank
     # revert
     reset_demo_user_state()
+
+
+def test_demo_state_cached_until_file_changes(monkeypatch):
+    from domain import constants
+    reset_demo_user_state()
+    reads = []
+    real_load = constants._load_json
+    monkeypatch.setattr(constants, '_load_json', lambda path: reads.append(path) or real_load(path))
+    first = get_demo_user()
+    first['name'] = 'mutated copy'
+    assert get_demo_user()['name'] != 'mutated copy'
+    assert reads == []  # the reset already cached what it wrote
+
+    state = _read(STATE_PATH)
+    state['region'] = '제주'
+    _write(STATE_PATH, state)
+    st = os.stat(STATE_PATH)
+    os.utime(STATE_PATH, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert get_demo_user()['region'] == '제주'
+    assert get_demo_user()['region'] == '제주'
+    assert reads == [STATE_PATH]
+    reset_demo_user_state()
+
+
+def test_ensure_demo_present_memoized_until_users_change(tmp_path, monkeypatch):
+    from services import users as user_svc
+    monkeypatch.setattr('services.persistence.DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(user_svc, '_load_seed_users', lambda: [])
+    reset_demo_user_state()
+    persistence.replace_all('users', [{'id': 'u1', 'name': 'U1'}])
+
+    assert user_svc.ensure_demo_present() is True
+    assert persistence.get_item('users', 'demo_user') == get_demo_user()
+
+    # Unchanged users and state: answered from the memo, no index probe
+    probes = []
+    real_get = user_svc.repository.users.get
+    monkeypatch.setattr(user_svc.repository.users, 'get', lambda rid: probes.append(rid) or real_get(rid))
+    assert user_svc.ensure_demo_present() is False
+    assert probes == []
+
+    # A stale demo record is patched in place once users change
+    persistence.update_item('users', 'demo_user', {'region': 'stale'})
+    assert user_svc.ensure_demo_present() is True
+    assert persistence.get_item('users', 'demo_user') == get_demo_user()
+    assert [u['id'] for u in persistence.load_list('users')] == ['demo_user', 'u1']
+    reset_demo_user_state()
+
+
+def test_foreign_state_file_falls_back_to_defaults(tmp_path, monkeypatch):
+    from services import users as user_svc
+    monkeypatch.setattr('services.persistence.DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(user_svc, '_load_seed_users', lambda: [])
+    reset_demo_user_state()
+    persistence.replace_all('users', [{'id': 'u1', 'name': 'U1'}])
+    _write(STATE_PATH, {'id': 'u1', 'name': 'someone else'})
+    try:
+        assert get_demo_user() == _read(DEFAULTS_PATH)
+        user_svc.ensure_demo_present()
+        assert persistence.get_item('users', 'demo_user') == _read(DEFAULTS_PATH)
+        assert persistence.get_item('users', 'u1') == {'id': 'u1', 'name': 'U1'}
+    finally:
+        reset_demo_user_state()
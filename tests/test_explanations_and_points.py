@@ -1,5 +1,5 @@
 from dataclasses import asdict
-from domain.models import Club
+from domain.models import Club, club_explanation, compact_club_explanations
 from domain.models import User
 from services.matching import compute_matches
 from services import activity, persistence
@@ -24,13 +24,24 @@ def test_match_explanations_present(tmp_path, monkeypatch):
     clubs = compute_matches(users, target_size=5, run_id='testrun')
     assert clubs, 'Expected at least one club'
     club = clubs[0]
-    # For each member, an explanation should exist.
+    # One club-level explanation, no per-member copies.
+    assert "공통 관심사" in club.explanation
+    assert "직급 다양성" in club.explanation
+    assert club.explanations == {}
     for uid in club.member_ids:
-        assert uid in club.explanations
-        explanation = club.explanations[uid]
-        assert "그룹" in explanation
-        assert "공통 관심사" in explanation["그룹"]
-        assert "직급 다양성" in explanation["그룹"]
+        assert club_explanation(asdict(club), uid) == club.explanation
+
+
+def test_compact_club_explanations_keeps_overrides():
+    legacy = {'id': 'c1', 'member_ids': ['a', 'b', 'c'],
+              'explanations': {'a': {'그룹': 'same'}, 'b': {'그룹': 'same'}, 'c': {'그룹': 'own'}}}
+    assert club_explanation(legacy) == 'same'
+    compact = compact_club_explanations(legacy)
+    assert compact['explanation'] == 'same'
+    assert compact['explanations'] == {'c': {'그룹': 'own'}}
+    assert club_explanation(compact, 'a') == 'same'
+    assert club_explanation(compact, 'c') == 'own'
+    assert compact_club_explanations(compact) == compact
 
 
 def test_verify_report_points(tmp_path, monkeypatch):
@@ -69,3 +80,101 @@ def test_verify_report_points(tmp_path, monkeypatch):
     assert 'points_awarded' not in reverted
     assert 'verification_metrics' not in reverted
     assert 'verified_at' not in reverted
+
+
+def test_points_ledger_tracks_verification_changes(tmp_path, monkeypatch):
+    from services import admin, points
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    monkeypatch.setattr('services.persistence.DATA_DIR', str(data_dir))
+    persistence.replace_all('activity_reports', [
+        {'id': 'r1', 'club_id': 'cA', 'status': 'Verified', 'points_awarded': 10},
+        {'id': 'r2', 'club_id': 'cB', 'status': 'Verified', 'points_awarded': 15},
+        {'id': 'r3', 'club_id': 'cA', 'status': 'Pending'},
+    ])
+    assert admin.get_club_points_map() == {'cA': 10, 'cB': 15}
+    persistence.update_item('activity_reports', 'r3', {'status': 'Verified', 'points_awarded': 10})
+    assert points.ledger.top(2) == [('cA', 20), ('cB', 15)]
+    persistence.update_item('activity_reports', 'r2', {'status': 'Pending'}, remove=['points_awarded'])
+    persistence.append_item('activity_reports', {'id': 'r4', 'club_id': 'cC', 'status': 'Verified', 'points_awarded': 5})
+    assert points.ledger.top(5) == [('cA', 20), ('cC', 5)]
+    # Incremental state equals a rebuild from the stored reports
+    expected = points.ledger.points_map()
+    points.ledger.rebuild()
+    assert points.ledger.points_map() == expected
+    # A write by another process just before ours is not absorbed by our own event
+    import json
+    stored = persistence.load_list('activity_reports')
+    stored.append({'id': 'r5', 'club_id': 'cB', 'status': 'Verified', 'points_awarded': 7})
+    (data_dir / 'activity_reports.json').write_text(json.dumps(stored), encoding='utf-8')
+    persistence.update_item('activity_reports', 'r1', {'points_awarded': 12})
+    assert points.ledger.points_map() == {'cA': 22, 'cB': 7, 'cC': 5}
+
+
+def test_analytics_store_follows_user_and_club_writes(tmp_path, monkeypatch):
+    from services import admin, analytics
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    monkeypatch.setattr('services.persistence.DATA_DIR', str(data_dir))
+    users = [make_user(1, ['축구'], rank='사원'), make_user(2, ['축구', '독서'], rank='대리'),
+             make_user(3, ['요리'], rank='사원')]
+    persistence.replace_all('users', [asdict(u) for u in users])
+    persistence.replace_all('clubs', [asdict(Club(id='c1', member_ids=['tu1', 'tu2'], leader_id='tu1'))])
+    for key in ('activity_reports', 'match_runs'):
+        persistence.replace_all(key, [])
+    stats = admin.get_system_analytics()
+    assert (stats['total_users'], stats['total_clubs']) == (3, 1)
+    assert (stats['avg_rank_diversity'], stats['avg_interest_variety']) == (2.0, 2.0)
+    persistence.append_item('clubs', asdict(Club(id='c2', member_ids=['tu3'], leader_id='tu3', status='Active')))
+    persistence.update_item('users', 'tu2', {'rank': '사원'})
+    stats = admin.get_system_analytics()
+    assert stats['active_clubs'] == 1
+    assert (stats['avg_rank_diversity'], stats['avg_interest_variety']) == (1.0, 1.5)
+    analytics.store.recompute()
+    assert analytics.store.snapshot() == stats
+    # Same numbers straight from the mapped columnar user table
+    from services import user_table
+    assert admin.get_system_analytics(user_table.current()) == stats
+    assert not (data_dir / user_table.TABLE_FILE).exists()  # request path builds in memory only
+    table = user_table.build()
+    assert (data_dir / user_table.TABLE_FILE).exists() and table is user_table.current()
+    assert list(table.ids) == [u['id'] for u in persistence.load_view('users')]
+    assert admin.get_system_analytics(table) == stats
+    # A club written by another process just before our own write is picked up
+    import json
+    clubs = persistence.load_list('clubs')
+    clubs.append(asdict(Club(id='c4', member_ids=['tu1', 'tu3'], leader_id='tu1')))
+    (data_dir / 'clubs.json').write_text(json.dumps(clubs, ensure_ascii=False), encoding='utf-8')
+    persistence.update_item('clubs', 'c2', {'status': 'Matched'})
+    stats = admin.get_system_analytics()
+    assert (stats['total_clubs'], stats['active_clubs']) == (3, 0)
+    assert (stats['avg_rank_diversity'], stats['avg_interest_variety']) == (1.0, 5 / 3)
+    # A club whose members are all gone scores zero and stays out of the averages
+    persistence.append_item('clubs', asdict(Club(id='c5', member_ids=['gone'], leader_id='gone')))
+    assert admin.get_system_analytics() == dict(stats, total_clubs=4)
+    assert admin.get_system_analytics(user_table.current()) == dict(stats, total_clubs=4)
+
+
+def test_batch_scoring_matches_single_report_simulation(tmp_path, monkeypatch):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    monkeypatch.setattr('services.persistence.DATA_DIR', str(data_dir))
+    users = [make_user(1, ['독서', '요리'], rank='사원'), make_user(2, ['독서'], rank='대리'),
+             make_user(3, ['등산', '사진'], rank='과장'), make_user(4, ['등산'], rank='사원')]
+    clubs = [Club(id='cR', member_ids=['tu1', 'tu2'], leader_id='tu1', name='책 모임'),
+             Club(id='cH', member_ids=['tu3', 'tu4', 'ghost'], leader_id='tu3', name='산악회')]
+    persistence.replace_all('users', [asdict(u) for u in users])
+    persistence.replace_all('clubs', [asdict(c) for c in clubs])
+    reports = [
+        {'id': 'r1', 'club_id': 'cR', 'raw_text': '독후감 나누고 쿠킹 클래스', 'participant_ids': ['tu1', 'tu2']},
+        {'id': 'r2', 'club_id': 'cH', 'raw_text': '하이킹 후 포토 타임\n사진찍기', 'participant_ids': ['tu3']},
+        {'id': 'r3', 'club_id': 'cH', 'raw_text': 'Hikeing and photos', 'participant_ids': []},
+        {'id': 'r4', 'club_id': 'missing', 'raw_text': '', 'participant_ids': []},
+    ]
+    batch = activity.score_reports(reports)
+    assert set(batch) == {'r1', 'r2', 'r3'}
+    by_id = {c.id: asdict(c) for c in clubs}
+    user_dicts = [asdict(u) for u in users]
+    for r in reports[:3]:
+        assert batch[r['id']] == activity.run_verification_simulation(r, by_id[r['club_id']], user_dicts)
+    assert batch['r2'] == {'participants': 0.33, 'interest': 1.0, 'diversity': 0.5}
@@ -0,0 +1,62 @@
+import difflib
+
+from utils.keyword_matcher import AhoCorasick, KeywordMatcher, lcs_length
+
+
+SYNS = {'러닝': ['러닝', '조깅', 'running'], '보드게임': ['보드게임', '게임']}
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    ac = AhoCorasick(['게임', '보드게임', '드게'])
+    assert ac.find_all('주말 보드게임 모임') == {'게임', '보드게임', '드게'}
+    assert ac.find_all('산책') == set()
+
+
+def test_lcs_length_small_cases():
+    assert lcs_length('running', 'runing') == 6
+    assert lcs_length('', 'abc') == 0
+    assert lcs_length('조깅하기', '조깅') == 2
+
+
+def test_find_reports_matched_keyword_or_token():
+    km = KeywordMatcher(SYNS)
+    assert km.find('아침 조깅 후 카드 게임') == {'러닝': '조깅', '보드게임': '게임'}
+    assert km.find('we went runnning') == {'러닝': 'runnning'}
+    km.ensure(['영화보기'])
+    assert km.find('영화보기') == {'영화보기': '영화보기'}
+
+
+def test_fuzzy_hits_agree_with_difflib():
+    km = KeywordMatcher(SYNS)
+    keywords = ['러닝', '조깅', 'running', '보드게임', '게임']
+    for token in ['runing', 'runn', 'rnning', '보드겜', '게임들', '조깅함', '러', 'xx', '보드게임즈']:
+        expected = {k for k in keywords if difflib.SequenceMatcher(a=token, b=k).ratio() >= 0.72}
+        assert set(km.fuzzy_keywords(token)) == expected, token
+
+
+def test_hangul_normalize_and_stems():
+    import unicodedata
+    from utils import hangul_text
+    assert hangul_text.normalize(unicodedata.normalize('NFD', '축구 GYM')) == '축구 gym'
+    assert hangul_text.stems('등산했다') == ['등산']
+    assert hangul_text.stems('독서와') == ['독서']
+    # A final ㄴ/ㄹ belongs to the noun, not a contracted particle
+    assert hangul_text.stems('사진') == []
+    # Nouns ending in a particle-like syllable keep their last syllable
+    for noun in ('고양이', '작가', '포도', '회의', '사과', '가을'):
+        assert hangul_text.stems(noun) == [], noun
+    assert hangul_text.stems('모임에서는') == ['모임']
+    assert '사지' not in hangul_text.tokenize('사진 찍기')
+    assert hangul_text.stems('running') == []
+    tokens = hangul_text.tokenize('주말에 축구를, 등산했다!')
+    assert tokens[:3] == ['주말에', '축구를,', '등산했다!']
+    assert {'축구를', '축구', '등산'} <= set(tokens)
+
+
+def test_report_tokens_cached_per_report_and_content():
+    from services import activity
+    report = {'id': 'rep_cache', 'raw_text': '축구를 모임'}
+    text, tokens = activity._text_features(report)
+    assert '축구' in tokens
+    assert activity._text_features(dict(report))[1] is tokens
+    assert '등산' in activity._text_features(dict(report, raw_text='등산했다'))[1]
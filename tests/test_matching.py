@@ -43,3 +43,116 @@ def test_compute_matches_requires_minimum_users():
     else:
         assert False, "Expected assertion for insufficient users"
 # (Removed duplicate legacy tests to keep suite minimal and focused.)
+
+
+def _reference_groups(users, target_size, seed):
+    """The original list-scan grouping with a per-bucket RNG, kept to pin the indexed engine's output."""
+    import random
+    from collections import defaultdict
+    user_map = {u.id: u for u in users}
+    buckets = defaultdict(list)
+    for u in users:
+        buckets[(u.region, u.personality_trait)].append(u)
+    groups = []
+    for key, bucket_users in buckets.items():
+        if len(bucket_users) < target_size:
+            continue
+        rng = random.Random(matching._bucket_seed(seed, key))
+        unassigned = dict.fromkeys(u.id for u in bucket_users)
+        while len(unassigned) >= target_size:
+            seed_id = rng.choice(list(unassigned))
+            del unassigned[seed_id]
+            group = [seed_id]
+            candidates = list(unassigned)
+            while len(group) < target_size and candidates:
+                common = matching.get_common_interests([user_map[g] for g in group])
+                if not common:
+                    break
+                potential = [c for c in candidates if common & set(user_map[c].interests)]
+                if not potential:
+                    break
+                ranks = {user_map[g].rank for g in group}
+                best = next((c for c in potential if user_map[c].rank not in ranks), None)
+                if best is None:
+                    best = rng.choice(potential)
+                group.append(best)
+                del unassigned[best]
+                candidates.remove(best)
+            if len(group) < target_size:
+                break
+            groups.append(group)
+    return groups
+
+
+def test_compute_matches_identical_to_reference_for_seed():
+    import random
+    rng = random.Random(7)
+    pool = ["축구", "독서", "요리", "헬스", "등산", "사진"]
+    ranks = ["사원", "대리", "과장", "차장", "부장"]
+    users = [make_user(i, region=rng.choice(["서울", "부산"]), trait=rng.choice(["외향", "내향"]),
+                       rank=rng.choice(ranks), interests=rng.sample(pool, k=rng.randint(1, 3)))
+             for i in range(300)]
+    for seed in (1, 2, 3):
+        expected = _reference_groups(users, 5, seed)
+        clubs = matching.compute_matches(users, target_size=5, seed=seed)
+        assert expected and [c.member_ids for c in clubs] == expected
+
+
+def test_interest_mask_roundtrip_and_unknown_interests():
+    from domain.interests import decode_interests, encode_interests
+    known = encode_interests(["독서", "축구", "축구"])
+    assert decode_interests(known) == ["축구", "독서"]
+    odd = encode_interests(["축구", "스쿠버다이빙"])
+    assert decode_interests(odd) == ["축구", "스쿠버다이빙"]
+    assert decode_interests(known & odd) == ["축구"]
+    assert make_user(1, interests=["헬스"]).interest_mask == encode_interests(["헬스"])
+    assert matching.get_common_interests(
+        [make_user(1, interests=["스쿠버다이빙", "축구"]), make_user(2, interests=["스쿠버다이빙"])]) == {"스쿠버다이빙"}
+
+
+def _mixed_users(n, seed=7):
+    import random
+    rng = random.Random(seed)
+    pool = ["축구", "독서", "요리", "헬스", "등산", "사진"]
+    ranks = ["사원", "대리", "과장", "차장", "부장"]
+    return [make_user(i, region=rng.choice(["서울", "부산"]), trait=rng.choice(["외향", "내향"]),
+                      rank=rng.choice(ranks), interests=rng.sample(pool, k=rng.randint(1, 3)))
+            for i in range(n)]
+
+
+def test_worker_count_never_changes_the_clubs():
+    users = _mixed_users(200)
+    serial = matching.compute_matches(users, target_size=5, seed=11)
+    assert serial
+    for workers in (1, 2):
+        parallel = matching.compute_matches(users, target_size=5, seed=11, workers=workers)
+        assert [(c.name, c.member_ids) for c in serial] == [(c.name, c.member_ids) for c in parallel]
+    # Per-bucket RNG: a bucket's clubs don't depend on which other buckets exist
+    seoul = [u for u in users if u.region == "서울"]
+    alone = matching.compute_matches(seoul, target_size=5, seed=11)
+    assert [c.member_ids for c in alone] == [c.member_ids for c in serial if c.name.startswith("서울")]
+
+
+def test_synthetic_population_is_reproducible():
+    from demo.sample_data import make_synthetic_users
+    a = make_synthetic_users(50, seed=3, skew='company')
+    b = make_synthetic_users(50, seed=3, skew='company')
+    assert [(u.region, u.rank, u.interests) for u in a] == [(u.region, u.rank, u.interests) for u in b]
+    assert {u.personality_trait for u in make_synthetic_users(300, seed=1)} == {"외향", "내향", "중간"}
+
+
+def test_matching_on_mapped_user_table_matches_user_objects(tmp_path):
+    from services.user_table import UserTable
+    users = _mixed_users(120)
+    table = UserTable.from_users(users)
+    table.save(str(tmp_path / 'users.tbl'))
+    mapped = UserTable.open(str(tmp_path / 'users.tbl'))
+    assert list(mapped.ids) == [u.id for u in users]
+    assert [mapped.rank(r) for r in range(len(mapped))] == [u.rank for u in users]
+    assert sorted(mapped.interest_names(mapped.masks[7])) == sorted(users[7].interests)
+    for workers in (None, 1):
+        from_objects = matching.compute_matches(users, target_size=5, seed=5, workers=workers)
+        from_table = matching.compute_matches(mapped, target_size=5, seed=5, workers=workers)
+        assert from_objects
+        assert ([(c.name, c.member_ids, c.explanation) for c in from_objects]
+                == [(c.name, c.member_ids, c.explanation) for c in from_table])
@@ -0,0 +1,21 @@
+import pytest
+from dataclasses import asdict
+from domain.models import ActivityReport, Club, MatchRun, User
+
+
+@pytest.mark.parametrize('model', [User, Club, ActivityReport, MatchRun])
+def test_models_are_slotted(model):
+    assert '__slots__' in model.__dict__
+    assert '__dict__' not in model.__dict__
+
+
+def test_slotted_models_keep_dataclass_behaviour():
+    user = User(id='u1', name='가', employee_number='1', region='서울', rank='사원',
+                interests=['축구'], personality_trait='외향')
+    assert not hasattr(user, '__dict__')
+    with pytest.raises(AttributeError):
+        user.extra = 1
+    club = Club(id='c1', member_ids=['u1'], leader_id='u1')
+    club.status = 'Active'
+    assert asdict(club)['status'] == 'Active' and asdict(club)['explanations'] == {}
+    assert Club(id='c2', member_ids=[], leader_id='u1').explanations is not club.explanations
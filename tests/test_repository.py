@@ -0,0 +1,55 @@
+import json
+from services import persistence, repository
+
+
+def test_repository_indexes_follow_writes(data_dir):
+    persistence.replace_all('clubs', [
+        {'id': 'c1', 'member_ids': ['a', 'b'], 'status': 'Matched', 'match_run_id': 'run1'},
+        {'id': 'c2', 'member_ids': ['b'], 'status': 'Matched', 'match_run_id': 'run1'},
+    ])
+    clubs = repository.clubs
+    assert clubs.ids_by('member_id', 'b') == ['c1', 'c2']
+    persistence.append_item('clubs', {'id': 'c3', 'member_ids': ['a'], 'status': 'Active'})
+    persistence.update_item('clubs', 'c1', {'member_ids': ['a'], 'status': 'Active'})
+    assert clubs.ids_by('member_id', 'b') == ['c2']
+    assert clubs.ids_by('status', 'Active') == ['c1', 'c3']
+    # Updates keep collection order without re-sorting, also across a bucket round trip
+    persistence.update_item('clubs', 'c1', {'status': 'Matched'})
+    assert clubs.ids_by('status', 'Matched') == ['c1', 'c2']
+    persistence.update_item('clubs', 'c1', {'status': 'Active', 'name': 'renamed'})
+    assert [c['id'] for c in clubs.all()] == [c['id'] for c in persistence.load_view('clubs')] == ['c1', 'c2', 'c3']
+    assert clubs.ids_by('status', 'Active') == ['c1', 'c3']
+    persistence.delete_item('clubs', 'c2')
+    assert clubs.get('c2') is None and clubs.count_by('match_run_id', 'run1') == 1
+    # Writes from elsewhere are picked up through the signature
+    (data_dir / 'clubs.json').write_text(json.dumps(
+        [{'id': 'c9', 'member_ids': ['b'], 'status': 'Matched'}]), encoding='utf-8')
+    assert [c['id'] for c in clubs.find('member_id', 'b')] == ['c9']
+    # ... also when they land right before one of our own writes
+    (data_dir / 'clubs.json').write_text(json.dumps(
+        [{'id': 'c9', 'member_ids': ['b'], 'status': 'Matched'},
+         {'id': 'c10', 'member_ids': ['b'], 'status': 'Matched'}]), encoding='utf-8')
+    persistence.update_item('clubs', 'c9', {'status': 'Active'})
+    assert clubs.ids_by('member_id', 'b') == ['c9', 'c10']
+
+
+def test_repository_query_pages_filters_and_sorts(data_dir):
+    persistence.replace_all('activity_reports', [
+        {'id': f'r{i}', 'status': 'Pending' if i % 3 else 'Verified', 'date': f'2025-01-{i % 7 + 1:02d}'}
+        for i in range(30)])
+    reports = repository.reports
+    pending = [r for r in reports.all() if r['status'] == 'Pending']
+
+    page = reports.query(2, 5, index='status', value='Pending')
+    assert (page.total, page.pages, page.number) == (20, 4, 2)
+    assert [r['id'] for r in page.items] == [r['id'] for r in pending[5:10]]
+
+    by_date = sorted(pending, key=lambda r: r['date'], reverse=True)
+    for number in (1, 3):
+        page = reports.query(number, 6, index='status', value='Pending',
+                             sort_key=lambda r: r['date'], reverse=True)
+        assert page.items == by_date[(number - 1) * 6:number * 6]
+
+    page = reports.query(99, 10, where=lambda r: r['date'] == '2025-01-01')
+    assert page.number == page.pages == 1 and page.total == 5
+    assert reports.query(1, 10, where=lambda r: False).items == []
@@ -0,0 +1,40 @@
+from services import persistence, repository
+
+
+def test_session_coalesces_writes_per_collection(data_dir, monkeypatch):
+    persistence.replace_all('clubs', [{'id': 'c1', 'status': 'Matched'}])
+    persistence.replace_all('activity_reports', [{'id': 'r1', 'status': 'Pending', 'tmp': 1}])
+    writes = []
+    backend = persistence.get_backend()
+    monkeypatch.setattr(backend, '_writer', lambda key, items: (writes.append(key), persistence.atomic_write(key, items)))
+    events = []
+    listener = lambda key, op, payload: events.append((key, op))
+    persistence.subscribe(listener)
+    try:
+        with persistence.session() as s:
+            s.update_item('clubs', 'c1', {'status': 'Active'})
+            s.append_item('clubs', {'id': 'c2', 'status': 'Matched'})
+            s.update_item('clubs', 'c2', {'status': 'Active'})
+            s.update_item('activity_reports', 'r1', {'preview': 1}, remove=['tmp'])
+            s.update_item('activity_reports', 'r1', {'image': 2})
+            # Reads see the buffered state; nothing is written yet
+            assert s.get_item('activity_reports', 'r1') == {'id': 'r1', 'status': 'Pending', 'preview': 1, 'image': 2}
+            assert persistence.get_item('clubs', 'c1')['status'] == 'Matched'
+            assert writes == [] and events == []
+    finally:
+        persistence.unsubscribe(listener)
+    assert writes == ['clubs']  # one snapshot rewrite for clubs
+    journal = (data_dir / 'activity_reports.journal.jsonl').read_text(encoding='utf-8').splitlines()
+    assert len(journal) == 2  # base line + one coalesced patch
+    assert persistence.load_list('activity_reports') == [{'id': 'r1', 'status': 'Pending', 'preview': 1, 'image': 2}]
+    assert [(c['id'], c['status']) for c in persistence.load_list('clubs')] == [('c1', 'Active'), ('c2', 'Active')]
+    assert events == [('clubs', 'update'), ('clubs', 'insert'), ('activity_reports', 'update')]
+    assert repository.clubs.ids_by('status', 'Active') == ['c1', 'c2']
+    # An exception inside the block discards the buffered writes
+    try:
+        with persistence.session() as s:
+            s.delete_item('clubs', 'c1')
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert persistence.get_item('clubs', 'c1') is not None
@@ -14,56 +14,29 @@ def _read(path):
         return json.load(f)
 
 
-def test_signup_demo_update_no_duplicate(monkeypatch):
-    """Simulate the two-step signup flow for demo user and ensure:
-    - demo_user record is updated in users.json
-    - no new user with different id but same employee_number/name is appended
-    """
-    # 1. Reset state & persistence to a clean demo_user only scenario
-    reset_demo_user_state()
-    demo_state = get_demo_user()
-    persistence.replace_all('users', [demo_state])
+# Monkeypatch streamlit session_state behavior minimalistically
+class DummySession(dict):
+    def pop(self, k, default=None):
+        return super().pop(k, default)
 
-    # 2. Import the signup view module fresh (so we can monkeypatch session state like Streamlit)
-    signup = importlib.import_module('views.user_signup')
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
 
-    # 3. Prepare a fake draft (what form_basic would store)
-    draft_payload = {
-        'name': demo_state['name'],  # same name triggers update logic
-        'nickname': 'updatedNick',
-        'employee_number': demo_state['employee_number'],
-        'region': '부산' if demo_state.get('region') != '부산' else '서울',
-        'rank': '대리' if demo_state.get('rank') != '대리' else '사원',
-        'interests': ['축구', '보드게임'],
-    }
+    def __setattr__(self, name, value):
+        self[name] = value
 
-    # Monkeypatch streamlit session_state behavior minimalistically
-    class DummySession(dict):
-        def pop(self, k, default=None):
-            return super().pop(k, default)
-
-        def __getattr__(self, name):
-            try:
-                return self[name]
-            except KeyError:
-                raise AttributeError(name)
-
-        def __setattr__(self, name, value):
-            self[name] = value
-
-        def __delattr__(self, name):
-            if name in self:
-                del self[name]
-            else:
-                raise AttributeError(name)
-    dummy_state = DummySession()
-    dummy_state['new_user_draft'] = draft_payload
-    dummy_state['current_user_id'] = 'demo_user'
-    # ensure we skip read-only lock path
-    dummy_state['signup_first_visit'] = False
-    dummy_state['clear_survey_answers'] = False
+    def __delattr__(self, name):
+        if name in self:
+            del self[name]
+        else:
+            raise AttributeError(name)
 
-    # Fake Streamlit API pieces used in finish block
+
+# Fake Streamlit API pieces used in finish block
+def _dummy_st(dummy_state, draft_payload):
     class DummyST:
         session_state = dummy_state
 
@@ -118,9 +91,40 @@ def test_signup_demo_update_no_duplicate(monkeypatch):
         def form_submit_button(self, *a, **kw):
             # Always simulate clicking submit inside form contexts
             return True
+    return DummyST()
 
-    # Monkeypatch streamlit
-    monkeypatch.setitem(signup.__dict__, 'st', DummyST())
+
+def test_signup_demo_update_no_duplicate(monkeypatch):
+    """Simulate the two-step signup flow for demo user and ensure:
+    - demo_user record is updated in users.json
+    - no new user with different id but same employee_number/name is appended
+    """
+    # 1. Reset state & persistence to a clean demo_user only scenario
+    reset_demo_user_state()
+    demo_state = get_demo_user()
+    persistence.replace_all('users', [demo_state])
+
+    # 2. Import the signup view module fresh (so we can monkeypatch session state like Streamlit)
+    signup = importlib.import_module('views.user_signup')
+
+    # 3. Prepare a fake draft (what form_basic would store)
+    draft_payload = {
+        'name': demo_state['name'],  # same name triggers update logic
+        'nickname': 'updatedNick',
+        'employee_number': demo_state['employee_number'],
+        'region': '부산' if demo_state.get('region') != '부산' else '서울',
+        'rank': '대리' if demo_state.get('rank') != '대리' else '사원',
+        'interests': ['축구', '보드게임'],
+    }
+
+    dummy_state = DummySession()
+    dummy_state['new_user_draft'] = draft_payload
+    dummy_state['current_user_id'] = 'demo_user'
+    # ensure we skip read-only lock path
+    dummy_state['signup_first_visit'] = False
+    dummy_state['clear_survey_answers'] = False
+
+    monkeypatch.setitem(signup.__dict__, 'st', _dummy_st(dummy_state, draft_payload))
 
     # 4. Prepare survey answers (simulate finish block path). We call classify_personality indirectly.
     # Directly invoke only the finish portion: easier to call view() with session state conditions
@@ -141,3 +145,21 @@ def test_signup_demo_update_no_duplicate(monkeypatch):
     state = _read(STATE_PATH)
     assert state['nickname'] == 'updatedNick'
     assert state['interests'] == ['축구', '보드게임']
+
+
+def test_interleaved_signups_both_survive(data_dir, monkeypatch):
+    """Two browser sessions read the users list, then submit one after the other."""
+    signup = importlib.import_module('views.user_signup')
+    persistence.replace_all('users', [get_demo_user()])
+    # Both reruns rendered from the same read, before either submitted
+    stale = persistence.load_list('users')
+    monkeypatch.setattr(signup, 'load_users', lambda: [dict(u) for u in stale])
+    for name, employee_number in [('가입자일', '20240001'), ('가입자이', '20240002')]:
+        draft = {'name': name, 'nickname': None, 'employee_number': employee_number,
+                 'region': '서울', 'rank': '사원', 'interests': ['독서']}
+        state = DummySession(new_user_draft=draft, signup_first_visit=False, clear_survey_answers=False)
+        monkeypatch.setitem(signup.__dict__, 'st', _dummy_st(state, draft))
+        signup.view()
+    names = [u['name'] for u in persistence.load_list('users')]
+    assert names[1:] == ['가입자일', '가입자이']
+    assert names[0] == get_demo_user()['name']
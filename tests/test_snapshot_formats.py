@@ -0,0 +1,45 @@
+import json
+from services import persistence, snapshots
+
+
+def test_columnar_snapshot_format(data_dir, monkeypatch):
+    monkeypatch.setattr(persistence, 'SNAPSHOT_FORMATS', {})
+    users = [{'id': f'u{i}', 'region': '서울' if i % 2 else '부산', 'rank': '대리',
+              'interests': ['축구', '독서'][:i % 3], 'survey_answers': [1, 2]} for i in range(6)]
+    users[3]['nickname'] = 'Alex'
+    del users[4]['rank']
+    codec = snapshots.get_codec('columnar')
+    assert codec.decode(codec.encode(users)) == users
+    assert codec.decode(codec.encode([])) == []
+    persistence.replace_all('users', users)
+    persistence.replace_all('activity_reports', [{'id': 'r1', 'status': 'Pending'}])
+    persistence.append_item('activity_reports', {'id': 'r2', 'status': 'Pending'})
+    persistence.set_snapshot_format('users', 'columnar')
+    persistence.set_snapshot_format('activity_reports', 'columnar')
+    assert (data_dir / 'users.col').read_bytes().startswith(snapshots.COLUMNAR_MAGIC)
+    assert (data_dir / 'users.col').stat().st_size < (data_dir / 'users.json').stat().st_size
+    assert persistence.load_list('users') == users
+    # Row-level writes and the journal work on top of the columnar snapshot
+    persistence.update_item('users', 'u1', {'region': '대구'})
+    persistence.update_item('activity_reports', 'r1', {'status': 'Verified'})
+    persistence.invalidate()
+    assert persistence.get_item('users', 'u1')['region'] == '대구'
+    assert [r['status'] for r in persistence.load_list('activity_reports')] == ['Verified', 'Pending']
+    # Pretty JSON stays the export format
+    persistence.export_json('users')
+    assert json.loads((data_dir / 'users.json').read_text(encoding='utf-8'))[1]['region'] == '대구'
+
+
+def test_env_snapshot_formats_apply_on_first_use(data_dir, monkeypatch):
+    users = [{'id': 'u1', 'region': '서울'}]
+    (data_dir / 'users.json').write_text(json.dumps(users), encoding='utf-8')
+    monkeypatch.setenv(persistence.SNAPSHOT_FORMATS_ENV, 'users=columnar')
+    monkeypatch.setattr(persistence, 'SNAPSHOT_FORMATS', {})
+    monkeypatch.setattr(persistence, '_env_formats_started', False)
+    monkeypatch.setattr(persistence, '_env_formats_done', False)
+    suffixes = []
+    mkstemp = persistence.tempfile.mkstemp
+    monkeypatch.setattr(persistence.tempfile, 'mkstemp', lambda **kw: (suffixes.append(kw['suffix']), mkstemp(**kw))[1])
+    assert not (data_dir / 'users.col').exists()
+    assert persistence.load_list('users') == users  # seeded from users.json on first use
+    assert (data_dir / 'users.col').exists() and suffixes == ['.col']
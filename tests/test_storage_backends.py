@@ -0,0 +1,175 @@
+import json
+import os
+from services import persistence
+from services.storage import SqliteBackend
+
+
+def _use_tmp(tmp_path, monkeypatch):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    monkeypatch.setattr('services.persistence.DATA_DIR', str(data_dir))
+    return data_dir
+
+
+def test_json_backend_row_level_ops(tmp_path, monkeypatch):
+    _use_tmp(tmp_path, monkeypatch)
+    persistence.replace_all('clubs', [{'id': 'c1', 'status': 'Matched'}])
+    persistence.append_item('clubs', {'id': 'c2', 'status': 'Matched'})
+    assert persistence.get_item('clubs', 'c2')['status'] == 'Matched'
+    updated = persistence.update_item(
+        'clubs', 'c1', {'status': 'Active'}, remove=['missing'])
+    assert updated['status'] == 'Active'
+    assert persistence.update_item('clubs', 'nope', {'status': 'x'}) is None
+    assert persistence.delete_item('clubs', 'c2')
+    assert [c['id'] for c in persistence.load_list('clubs')] == ['c1']
+
+
+def test_sqlite_backend_bootstrap_and_export(tmp_path, monkeypatch):
+    data_dir = _use_tmp(tmp_path, monkeypatch)
+    (data_dir / 'users.json').write_text(json.dumps(
+        [{'id': 'u1', 'name': '가', 'region': '서울'}, {'id': 'u2', 'name': '나', 'region': '부산'}],
+        ensure_ascii=False), encoding='utf-8')
+    backend = SqliteBackend(persistence._sqlite_path, json_path_for=persistence._path)
+    previous = persistence.set_backend(backend)
+    try:
+        # Fresh database is seeded from the JSON file, order preserved
+        assert [u['id'] for u in persistence.load_list('users')] == ['u1', 'u2']
+        persistence.append_item('users', {'id': 'u3', 'name': '다', 'region': '서울'})
+        persistence.update_item('users', 'u2', {'region': '대구'})
+        assert persistence.get_item('users', 'u2')['region'] == '대구'
+        assert persistence.get_item('users', 'missing') is None
+        assert persistence.delete_item('users', 'u1')
+        out = persistence.export_json('users', str(tmp_path / 'users_export.json'))
+        exported = json.loads(open(out, encoding='utf-8').read())
+        assert [u['id'] for u in exported] == ['u2', 'u3']
+    finally:
+        backend.close()
+        persistence.set_backend(previous)
+
+
+def test_read_cache_hits_and_copy_on_read(tmp_path, monkeypatch):
+    _use_tmp(tmp_path, monkeypatch)
+    persistence.replace_all('clubs', [{'id': 'c1', 'member_ids': ['a']}])
+    persistence.reset_cache_stats()
+    first = persistence.load_list('clubs')
+    second = persistence.load_list('clubs')
+    assert persistence.cache_stats()['hits'] == 2  # primed by the write
+    # Each caller owns its copy: mutating one never leaks into another
+    first[0]['member_ids'].append('b')
+    assert second[0]['member_ids'] == ['a']
+    assert persistence.load_view('clubs')[0]['member_ids'] == ['a']
+    # Writes through atomic_write refresh the cached data
+    persistence.replace_all('clubs', first)
+    assert persistence.load_view('clubs')[0]['member_ids'] == ['a', 'b']
+
+
+def test_read_cache_detects_external_change(tmp_path, monkeypatch):
+    data_dir = _use_tmp(tmp_path, monkeypatch)
+    persistence.replace_all('users', [{'id': 'u1'}])
+    assert len(persistence.load_list('users')) == 1
+    (data_dir / 'users.json').write_text(json.dumps([{'id': 'u1'}, {'id': 'u2'}]), encoding='utf-8')
+    persistence.reset_cache_stats()
+    assert len(persistence.load_list('users')) == 2
+    assert persistence.cache_stats()['misses'] == 1
+
+
+def test_journal_appends_patches_and_compaction(tmp_path, monkeypatch):
+    data_dir = _use_tmp(tmp_path, monkeypatch)
+    persistence.replace_all('activity_reports', [{'id': 'r1', 'status': 'Pending'}])
+    snapshot = (data_dir / 'activity_reports.json').read_text(encoding='utf-8')
+    persistence.append_item('activity_reports', {'id': 'r2', 'status': 'Pending'})
+    persistence.update_item('activity_reports', 'r1', {'status': 'Verified'}, remove=['missing'])
+    # Snapshot untouched; records live in the journal
+    assert (data_dir / 'activity_reports.json').read_text(encoding='utf-8') == snapshot
+    assert len((data_dir / 'activity_reports.journal.jsonl').read_text(encoding='utf-8').splitlines()) == 3
+    merged = persistence.load_list('activity_reports')
+    assert [(r['id'], r['status']) for r in merged] == [('r1', 'Verified'), ('r2', 'Pending')]
+    persistence.compact('activity_reports')
+    on_disk = json.loads((data_dir / 'activity_reports.json').read_text(encoding='utf-8'))
+    assert on_disk == merged
+    assert not (data_dir / 'activity_reports.journal.jsonl').exists()
+    assert persistence.load_list('activity_reports') == merged
+    persistence.append_item('activity_reports', {'id': 'r3', 'status': 'Pending'})
+    assert [r['id'] for r in persistence.load_list('activity_reports')] == ['r1', 'r2', 'r3']
+
+
+def test_identical_snapshot_rewrite_drops_journal(tmp_path, monkeypatch):
+    _use_tmp(tmp_path, monkeypatch)
+    persistence.replace_all('activity_reports', [])
+    persistence.append_item('activity_reports', {'id': 'r1', 'status': 'Pending'})
+    # Same bytes as the first snapshot, so the sha1 link alone cannot tell them apart
+    persistence.replace_all('activity_reports', [])
+    persistence.invalidate()
+    assert persistence.load_list('activity_reports') == []
+
+
+def _append_users(data_dir, prefix, n):
+    persistence.DATA_DIR = data_dir
+    persistence.invalidate()
+    for i in range(n):
+        persistence.modify('users', lambda users: users.append({'id': f'{prefix}{i}'}), retries=100)
+
+
+def test_etag_conflict_and_cross_process_modify(tmp_path, monkeypatch):
+    import multiprocessing
+    data_dir = _use_tmp(tmp_path, monkeypatch)
+    persistence.replace_all('users', [{'id': 'u0'}])
+    items, etag = persistence.load_versioned('users')
+    persistence.append_item('users', {'id': 'u1'})  # someone else writes in between
+    try:
+        persistence.replace_all('users', items + [{'id': 'mine'}], expected=etag)
+        assert False, 'stale etag must not overwrite'
+    except persistence.ConflictError:
+        pass
+    # modify re-runs the change on the fresh data
+    persistence.modify('users', lambda users: users.append({'id': 'mine'}))
+    assert [u['id'] for u in persistence.load_list('users')] == ['u0', 'u1', 'mine']
+    # Concurrent writers in separate processes lose no updates
+    ctx = multiprocessing.get_context('fork')
+    procs = [ctx.Process(target=_append_users, args=(str(data_dir), f'p{p}-', 15)) for p in range(3)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(30)
+        assert proc.exitcode == 0
+    ids = [u['id'] for u in persistence.load_list('users')]
+    assert len(ids) == 3 + 45 and len(set(ids)) == len(ids)
+    assert not [p for p in data_dir.iterdir() if p.name.startswith('tmp_')]
+
+
+_SQLITE_APPEND = """
+import sys
+from services import persistence
+from services.storage import SqliteBackend
+persistence.DATA_DIR = sys.argv[1]
+persistence.set_backend(SqliteBackend(persistence._sqlite_path))
+print('ready', flush=True)
+persistence.append_item('users', {'id': sys.argv[2]})
+"""
+
+
+def test_sqlite_lock_blocks_other_processes(tmp_path, monkeypatch):
+    import subprocess
+    import sys
+    data_dir = _use_tmp(tmp_path, monkeypatch)
+    backend = SqliteBackend(persistence._sqlite_path)
+    previous = persistence.set_backend(backend)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        persistence.replace_all('users', [{'id': 'u0'}])
+        with backend.lock('users'):
+            items = persistence.load_list('users')
+            proc = subprocess.Popen([sys.executable, '-c', _SQLITE_APPEND, str(data_dir), 'theirs'],
+                                    cwd=root, stdout=subprocess.PIPE, text=True)
+            assert proc.stdout.readline().strip() == 'ready'
+            try:
+                proc.wait(0.5)
+                assert False, 'writer in another process must wait for the lock'
+            except subprocess.TimeoutExpired:
+                pass
+            persistence.replace_all('users', items + [{'id': 'mine'}])
+        assert proc.wait(30) == 0
+        assert [u['id'] for u in persistence.load_list('users')] == ['u0', 'mine', 'theirs']
+    finally:
+        backend.close()
+        persistence.set_backend(previous)
@@ -13,6 +13,9 @@ for the rest of the application (`from ui import components`).
 from .base import (
     inject_base_css,
     status_badge,
+    page_state,
+    paginator,
+    row_toggle,
 )
 
 from .cards import (
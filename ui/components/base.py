@@ -1,4 +1,5 @@
 import streamlit as st
+from typing import Tuple
 
 PRIMARY_BG = "#111827"  # dark slate fallback
 PRIMARY_ACCENT = "#2563EB"  # blue-600
@@ -36,4 +37,35 @@ def inject_base_css():
 
 def status_badge(status: str) -> str:
     cls = "green" if status.lower() in {"active", "verified"} else "yellow"
-    return f'<span class="badge {cls}">{status}</span>'
\ No newline at end of file
+    return f'<span class="badge {cls}">{status}</span>'
+
+# -- paginated lists -----------------------------------------------------------
+# Usage: number, size = page_state(key); page = repository.<coll>.query(number, size, ...);
+# paginator(page, key); then render page.items, opening heavy rows with row_toggle.
+
+PAGE_SIZES = (20, 50, 100)
+
+
+def page_state(key: str) -> Tuple[int, int]:
+    """(page number, page size) currently selected for the list `key`."""
+    return (int(st.session_state.get(f"{key}_page", 1)),
+            int(st.session_state.get(f"{key}_size", PAGE_SIZES[0])))
+
+
+def paginator(page, key: str):
+    """Page controls for a server-side paginated list (repository.Page)."""
+    # Clamp first: filters may have shrunk the result below the selected page
+    st.session_state[f"{key}_page"] = page.number
+    c1, c2, c3 = st.columns([1, 1, 3])
+    c1.number_input("페이지", min_value=1, max_value=page.pages, step=1, key=f"{key}_page")
+    c2.selectbox("페이지 크기", PAGE_SIZES, key=f"{key}_size")
+    c3.caption(f"총 {page.total}건 · {page.number}/{page.pages} 페이지")
+
+
+def row_toggle(label: str, key: str) -> bool:
+    """Collapsed list row; True once opened.
+
+    Unlike st.expander, whose body is always rendered and sent to the browser,
+    callers render the row's content only when this returns True.
+    """
+    return st.toggle(label, key=key)
@@ -1,7 +1,8 @@
 import streamlit as st
-from typing import Dict, Any, Iterable
+from typing import Dict, Any, Iterable, Mapping
 
 from .base import inject_base_css, status_badge
+from domain.models import club_explanation
 from utils.explanations import build_ai_match_explanation
 from typing import Optional
 
@@ -71,6 +72,10 @@ def club_card(club: Dict[str, Any], user_map: Dict[str, Any], points: int, curre
             'personality_trait') or '—'
         primary_interest = club.get('primary_interest') or '—'
         st.markdown(f"**성향:** {leader_trait} | **대표 관심사:** {primary_interest}")
+        # Club-level matching reason (a member override wins for that member)
+        reason = club_explanation(club, current_user_id)
+        if reason:
+            st.caption(f"매칭 근거: {reason}")
         # AI explanation gating (demo cohort detection)
         member_ids = club.get('member_ids', [])
         names = [user_map.get(mid, {}).get('name', '') for mid in member_ids]
@@ -107,10 +112,12 @@ def club_card(club: Dict[str, Any], user_map: Dict[str, Any], points: int, curre
             st.link_button("Go to Group Chat", club['chat_link'])
 
 
-def report_card(report: Dict[str, Any]):
+def report_card(report: Dict[str, Any], club_names: Optional[Mapping[str, str]] = None):
     """Render a single activity report in a card style.
 
     Expects keys: id, date, status, points_awarded?, club_id, formatted_report, photo_filename?, verification_metrics?
+    club_names (club id -> name) should be resolved once per list render and passed
+    to every card; without it the card looks its club up via data_context.club_name.
     """
     inject_base_css()
     rid = report.get('id')  # retained for possible future deep-link actions
@@ -119,15 +126,14 @@ def report_card(report: Dict[str, Any]):
     date = report.get('date', '?')
     club_id = report.get('club_id', '?')
     # Resolve canonical club name (fallback to club_id)
-    club_name = club_id
-    try:
-        from services import persistence as _p
-        clubs_all = _p.load_list('clubs')
-        club_rec = next((c for c in clubs_all if c.get('id') == club_id), None)
-        if club_rec:
-            club_name = club_rec.get('name') or club_name
-    except Exception:
-        pass
+    if club_names is not None:
+        club_name = club_names.get(club_id) or club_id
+    else:
+        try:
+            from services import data_context
+            club_name = data_context.club_name(club_id) or club_id
+        except Exception:
+            club_name = club_id
     photo = report.get('photo_filename') or '—'
     summary = report.get('formatted_report', '')
     metrics = report.get('verification_metrics') or {}
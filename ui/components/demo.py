@@ -13,7 +13,6 @@ def _seed_demo_peers(region: str):
     from domain.models import User, Club
     from utils.ids import create_id_with_prefix
 
-    users_existing = persistence.load_list('users')
     created = []
     peer_defs = [
         {"name": "김서준", "rank": "사원", "nickname": "alpha", "interests": [
@@ -27,27 +26,32 @@ def _seed_demo_peers(region: str):
         {"name": "정하윤", "rank": "부장", "nickname": "echo", "interests": [
             "축구", "러닝", "보드게임"], "answers": [2, 2, 2, 3, 2, 2, 2]},
     ]
-    existing_names = {u.get('name') for u in users_existing}
-    for pd in peer_defs:
-        if pd['name'] in existing_names:
-            continue
-        trait = classify_personality(pd['answers'])
-        peer_user = User(
-            id=create_id_with_prefix('u'),
-            name=pd['name'],
-            employee_number=f"DEMO-{pd['name']}",  # keep unique but readable
-            region=region,
-            rank=pd['rank'],
-            interests=pd['interests'],
-            personality_trait=trait,
-            survey_answers=pd['answers'],
-            nickname=pd.get('nickname')
-        )
-        users_existing.append(asdict(peer_user))
-        created.append(pd['name'])
-    if created:
-        persistence.replace_all('users', users_existing)
+    if all(pd['name'] in {u.get('name') for u in persistence.load_view('users')} for pd in peer_defs):
+        return created
 
+    def add_peers(users_existing):
+        # Re-run on the stored list if another writer got in first (persistence.modify)
+        created.clear()
+        existing_names = {u.get('name') for u in users_existing}
+        for pd in peer_defs:
+            if pd['name'] in existing_names:
+                continue
+            trait = classify_personality(pd['answers'])
+            peer_user = User(
+                id=create_id_with_prefix('u'),
+                name=pd['name'],
+                employee_number=f"DEMO-{pd['name']}",  # keep unique but readable
+                region=region,
+                rank=pd['rank'],
+                interests=pd['interests'],
+                personality_trait=trait,
+                survey_answers=pd['answers'],
+                nickname=pd.get('nickname')
+            )
+            users_existing.append(asdict(peer_user))
+            created.append(pd['name'])
+
+    persistence.modify('users', add_peers)
     return created
 
 
@@ -58,34 +62,38 @@ def _seed_all_demo_users(region: str):
     from domain.models import User
     from utils.ids import create_id_with_prefix
     import random
-    users = persistence.load_list('users')
     # First seed base cohort
     base_created = _seed_demo_peers(region)
-    users = persistence.load_list('users')  # refresh
-    existing_names = {u.get('name') for u in users}
     INTERESTS = ["축구", "영화보기", "보드게임", "러닝", "독서", "헬스", "요리", "사진", "등산"]
     NICK_POOL = ["jet", "luna", "moss", "orbit", "pixel",
                  "quill", "ray", "sage", "terra", "vega", "wren", "zephyr"]
     RANKS = ["사원", "대리", "과장", "차장", "부장"]
     REGIONS = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종",
                "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"]
+    names = [f"auto25_{i}" for i in range(1, 26)]
+    if all(name in {u.get('name') for u in persistence.load_view('users')} for name in names):
+        return len(base_created), 0
     extra_created = 0
-    for i in range(1, 26):
-        name = f"auto25_{i}"
-        if name in existing_names:
-            continue
-        interests = random.sample(INTERESTS, k=random.randint(2, 4))
-        answers = [random.choice([1, 2, 3]) for _ in range(len(QUESTIONS))]
-        trait = classify_personality(answers)
-        nickname = NICK_POOL[(i - 1) % len(NICK_POOL)]
-        u = User(id=create_id_with_prefix('u'), name=name, employee_number=f"AUTO25-{i:02}",
-                 region=random.choice(REGIONS), rank=random.choice(RANKS), interests=interests,
-                 personality_trait=trait, survey_answers=answers, nickname=nickname)
-        users.append(asdict(u))
-        existing_names.add(name)
-        extra_created += 1
-    if extra_created:
-        persistence.replace_all('users', users)
+
+    def add_extras(users):
+        nonlocal extra_created
+        extra_created = 0
+        existing_names = {u.get('name') for u in users}
+        for i, name in enumerate(names, start=1):
+            if name in existing_names:
+                continue
+            interests = random.sample(INTERESTS, k=random.randint(2, 4))
+            answers = [random.choice([1, 2, 3]) for _ in range(len(QUESTIONS))]
+            trait = classify_personality(answers)
+            nickname = NICK_POOL[(i - 1) % len(NICK_POOL)]
+            u = User(id=create_id_with_prefix('u'), name=name, employee_number=f"AUTO25-{i:02}",
+                     region=random.choice(REGIONS), rank=random.choice(RANKS), interests=interests,
+                     personality_trait=trait, survey_answers=answers, nickname=nickname)
+            users.append(asdict(u))
+            existing_names.add(name)
+            extra_created += 1
+
+    persistence.modify('users', add_extras)
     return len(base_created), extra_created
 
 
@@ -169,9 +177,10 @@ def render_demo_sidebar(context: str = ""):
     from services import matching
     from demo import sample_data
     import datetime as _dt
+    from services import data_context
     st.sidebar.markdown("#### 🧪 Demo")
-    users = persistence.load_list('users')
-    clubs = persistence.load_list('clubs')
+    # Read-only here: share the rerun's users list instead of loading it again
+    users = data_context.current().users()
     _PEER_NAMES = {"김서준", "이민준", "박서연", "최지후", "정하윤"}
     demo_cluster = [u for u in users if u.get(
         'id') == 'demo_user' or u.get('name') in _PEER_NAMES]
@@ -192,7 +201,7 @@ def render_demo_sidebar(context: str = ""):
     from domain.constants import get_demo_user_defaults
     # Arrange buttons now as: Seed (full cohort) | Reset
     col_seed_full, col_reset = st.sidebar.columns(2)
-    full_disabled = len(persistence.load_list('users')) >= 30
+    full_disabled = len(users) >= 30
     with col_seed_full:
         if st.button("Seed", key="btn_seed_full", disabled=full_disabled, help="프리셋 사용자 추가 (이미 존재하는 사용자는 건너뜀)"):
             import os
@@ -211,22 +220,20 @@ def render_demo_sidebar(context: str = ""):
             if not seed_users:
                 st.sidebar.error("seed_users.json 비어있거나 로드 불가")
             else:
-                existing = persistence.load_list('users')
-                existing_ids = {u.get('id') for u in existing}
-                existing_names = {u.get('name') for u in existing}
                 to_add = []
-                for su in seed_users:
-                    sid = su.get('id')
-                    sname = su.get('name')
+
+                def add_seed_users(existing):
+                    existing_ids = {u.get('id') for u in existing}
+                    existing_names = {u.get('name') for u in existing}
                     # Skip if id or name already present (covers demo_user & cohort)
-                    if sid in existing_ids or sname in existing_names:
-                        continue
-                    to_add.append(su)
-                if to_add:
-                    persistence.replace_all('users', existing + to_add)
+                    to_add[:] = [su for su in seed_users
+                                 if su.get('id') not in existing_ids and su.get('name') not in existing_names]
+                    existing.extend(to_add)
+
+                existing = persistence.modify('users', add_seed_users)
                 st.session_state.demo_seed_done = True
                 st.sidebar.success(
-                    f"시드 추가 완료: 신규 {len(to_add)}명 / 총 {len(existing) + len(to_add)}명")
+                    f"시드 추가 완료: 신규 {len(to_add)}명 / 총 {len(existing)}명")
                 st.rerun()
     # Reset button (third column)
     with col_reset:
@@ -283,13 +290,13 @@ def render_demo_actions_panel(context: str = ""):
                     'status': 'Active',
                     'chat_link': '',
                     'match_score_breakdown': {},
+                    'explanation': None,
                     'explanations': {},
                     'match_run_id': None,
                     'created_at': now_iso,
                     'updated_at': now_iso,
                 }
-                clubs.append(demo_club)
-                persistence.replace_all('clubs', clubs)
+                persistence.append_item('clubs', demo_club)
                 st.success("데모 클럽이 생성되었습니다.")
                 st.rerun()
             else:
@@ -310,22 +317,17 @@ def render_demo_actions_panel(context: str = ""):
                 st.error("조건이 충족되지 않아 실행을 취소했습니다.")
             else:
                 new_users = [asdict(u) for u in sample_data.make_users(9)]
-                users_all = users + new_users
-                persistence.replace_all('users', users_all)
+                users_all = persistence.modify('users', lambda users: users.extend(new_users))
                 from domain.models import user_from_dict
                 user_objs = [user_from_dict(u) for u in users_all]
                 run_id = create_id_with_prefix('run')
                 clubs_new = matching.compute_matches(
                     user_objs, target_size=5, run_id=run_id)
                 clubs_dicts = [asdict(c) for c in clubs_new]
-                existing_clubs = persistence.load_list('clubs')
-                existing_clubs.extend(clubs_dicts)
-                persistence.replace_all('clubs', existing_clubs)
-                runs = persistence.load_list('match_runs')
+                persistence.modify('clubs', lambda clubs: clubs.extend(clubs_dicts))
                 run_meta = MatchRun(id=run_id, created_at=_dt.datetime.now(_dt.timezone.utc).isoformat().replace(
                     '+00:00', 'Z'), target_size=5, user_count=len(users_all), club_count=len(clubs_dicts))
-                runs.append(asdict(run_meta))
-                persistence.replace_all('match_runs', runs)
+                persistence.append_item('match_runs', asdict(run_meta))
                 st.success(
                     f"자동 생성 및 매칭 완료! Run ID: {run_id} | 생성된 클럽 {len(clubs_dicts)}")
                 st.balloons()
@@ -395,21 +397,16 @@ def render_demo_sidebar_floating(context: str = ""):
                 if only_demo_user:
                     from dataclasses import asdict as _asdict
                     new_users = [_asdict(u) for u in sample_data.make_users(9)]
-                    users_all = users + new_users
-                    persistence.replace_all('users', users_all)
+                    users_all = persistence.modify('users', lambda users: users.extend(new_users))
                     user_objs = [User(**u) for u in users_all]
                     run_id = create_id_with_prefix('run')
                     clubs_new = matching.compute_matches(
                         user_objs, target_size=5, run_id=run_id)
                     clubs_dicts = [_asdict(c) for c in clubs_new]
-                    existing_clubs = persistence.load_list('clubs')
-                    existing_clubs.extend(clubs_dicts)
-                    persistence.replace_all('clubs', existing_clubs)
-                    runs = persistence.load_list('match_runs')
+                    persistence.modify('clubs', lambda clubs: clubs.extend(clubs_dicts))
                     run_meta = MatchRun(id=run_id, created_at=_dt.datetime.now(_dt.timezone.utc).isoformat().replace(
                         '+00:00', 'Z'), target_size=5, user_count=len(users_all), club_count=len(clubs_dicts))
-                    runs.append(_asdict(run_meta))
-                    persistence.replace_all('match_runs', runs)
+                    persistence.append_item('match_runs', _asdict(run_meta))
                     st.success("매칭 완료")
                     st.rerun()
         st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,64 @@
+"""Normalization and tokenization for Korean activity report text.
+
+Report text is free-form Korean: nouns carry particles ("축구를", "독서와"), and
+activities are often verbs ("등산했다"), so plain whitespace tokens rarely
+equal a keyword. The pipeline here:
+
+1. NFC-normalize and lowercase (decomposed input from some keyboards and
+   clipboards becomes regular syllables).
+2. Split into whitespace words plus word-character runs (punctuation dropped).
+3. For all-Hangul tokens, also emit stems with trailing particles / light-verb
+   endings removed.
+
+Colloquial 는/를 contractions ("축군") are not undone: a final ㄴ/ㄹ is far more
+often part of the noun itself ("사진" is not "사지" + 는).
+
+Stems are added next to the surface tokens, never instead of them, so a
+matcher sees everything it saw before plus the stems.
+"""
+import re
+import unicodedata
+from typing import List
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+# Longest first so "에서는" wins over "는". One-syllable endings that also end
+# common nouns (이: 고양이, 가: 작가, 도: 포도, 의: 회의, ...) are left out, and the
+# remaining ones only apply when at least MIN_STEM syllables are left (사과 stays).
+ENDINGS = sorted([
+    # light verb / adjective endings (하다 verbs: 등산했다, 요리하고)
+    '했습니다', '했어요', '했는데', '했다', '했고', '해서', '하며', '하고', '하기', '하는', '하다',
+    # particles
+    '에서는', '에서', '으로', '이랑', '까지', '부터', '에게', '한테', '처럼', '보다', '마다', '이나',
+    '와', '과', '을', '를', '은', '는', '에', '랑',
+], key=len, reverse=True)
+MIN_STEM = 2
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_hangul_syllable(ch: str) -> bool:
+    return HANGUL_BASE <= ord(ch) <= HANGUL_LAST
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize('NFC', text or '').lower()
+
+
+def stems(token: str) -> List[str]:
+    """Particle/ending-stripped variants of an all-Hangul token (may be empty)."""
+    if not token or not all(is_hangul_syllable(ch) for ch in token):
+        return []
+    for ending in ENDINGS:
+        if token.endswith(ending) and len(token) - len(ending) >= (MIN_STEM if len(ending) == 1 else 1):
+            return [token[:-len(ending)]]
+    return []
+
+
+def tokenize(text: str) -> List[str]:
+    """Distinct tokens of already-normalized text: whitespace words, word-character
+    runs (punctuation dropped), then stems."""
+    words = list(dict.fromkeys(text.split() + _WORD_RE.findall(text)))
+    extra = [s for w in words for s in stems(w)]
+    return list(dict.fromkeys(words + extra))
@@ -0,0 +1,247 @@
+"""Keyword matcher for interest alignment in activity reports.
+
+Replaces comparing every report token against every synonym with
+difflib.SequenceMatcher:
+
+- Exact hits: all synonyms are compiled into one Aho-Corasick automaton, so a
+  single pass over the text finds every synonym occurring as a substring.
+- Fuzzy hits: synonyms are stored in a BK-tree under indel distance
+  (insertions + deletions = len(a) + len(b) - 2 * LCS). difflib's ratio is
+  2 * M / (len(a) + len(b)) where M, the size of its matching blocks, never
+  exceeds the LCS, so ratio >= r implies indel <= (1 - r) * (len(a) + len(b)).
+  The tree only returns synonyms within that bound and each survivor is then
+  confirmed with the real difflib ratio, so verdicts are identical to the
+  brute-force comparison at the same threshold (0.72 by default).
+
+KeywordMatcher.find reports, per interest, which synonym (exact) or token
+(fuzzy) matched.
+"""
+from __future__ import annotations
+
+import difflib
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+
+# -- Aho-Corasick --------------------------------------------------------------
+
+class AhoCorasick:
+    """Multi-pattern substring search over a fixed pattern set."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        for pattern in patterns:
+            if pattern:
+                self._insert(pattern)
+        self._link()
+
+    def _insert(self, pattern: str):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        if pattern not in self._out[node]:
+            self._out[node] += (pattern,)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Distinct patterns occurring anywhere in text."""
+        found: Set[str] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+# -- bounded edit distance -----------------------------------------------------
+
+def lcs_length(a: str, b: str) -> int:
+    """Longest common subsequence length (bit-parallel, O(len(a) * len(b) / wordsize))."""
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+    masks: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    v = full
+    for ch in b:
+        u = v & masks.get(ch, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(a) - bin(v).count('1')
+
+
+def indel_distance(a: str, b: str) -> int:
+    return len(a) + len(b) - 2 * lcs_length(a, b)
+
+
+class BKTree:
+    """Burkhard-Keller tree under indel distance (a metric, so pruning is exact)."""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        if self._root is None:
+            self._root = (word, {})
+            return
+        node = self._root
+        while True:
+            dist = indel_distance(word, node[0])
+            if dist == 0:
+                return
+            child = node[1].get(dist)
+            if child is None:
+                node[1][dist] = (word, {})
+                return
+            node = child
+
+    def within(self, word: str, radius: int) -> List[Tuple[str, int]]:
+        """All stored words at indel distance <= radius, with their distance."""
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            stored, children = stack.pop()
+            dist = indel_distance(word, stored)
+            if dist <= radius:
+                found.append((stored, dist))
+            lo, hi = dist - radius, dist + radius
+            for edge, child in children.items():
+                if lo <= edge <= hi:
+                    stack.append(child)
+        return found
+
+
+# -- matcher -------------------------------------------------------------------
+
+class KeywordMatcher:
+    """Interest -> synonym dictionary compiled for exact and fuzzy lookups.
+
+    Keywords are lowercased. Interests without an entry use their own name as
+    the only keyword (added on first use). Fuzzy matching applies to tokens of
+    at least `min_token_len` characters.
+    """
+
+    def __init__(self, synonyms: Mapping[str, Sequence[str]], min_ratio: float = 0.72,
+                 min_token_len: int = 2, max_cache: int = 100_000):
+        self.min_ratio = min_ratio
+        self.min_token_len = min_token_len
+        self._lock = threading.Lock()
+        self._keywords: Dict[str, Tuple[str, ...]] = {}
+        self._owners: Dict[str, List[str]] = {}  # keyword -> interests using it
+        self._max_cache = max_cache
+        for interest, words in synonyms.items():
+            self._register(interest, words)
+        self._compile()
+
+    def _register(self, interest: str, words: Sequence[str]):
+        keywords = tuple(dict.fromkeys(w.lower() for w in words))
+        self._keywords[interest] = keywords
+        for kw in keywords:
+            owners = self._owners.setdefault(kw, [])
+            if interest not in owners:
+                owners.append(interest)
+
+    def _compile(self):
+        keywords = list(self._owners)
+        self._automaton = AhoCorasick(keywords)
+        self._tree = BKTree(keywords)
+        self._max_kw_len = max((len(k) for k in keywords), default=0)
+        self._fuzzy_cache: Dict[str, Tuple[str, ...]] = {}
+
+    def ensure(self, interests: Iterable[str]):
+        """Register interests missing from the dictionary (keyword = the interest itself)."""
+        missing = [i for i in interests if i not in self._keywords]
+        if missing:
+            with self._lock:
+                for interest in missing:
+                    if interest not in self._keywords:
+                        self._register(interest, (interest,))
+                self._compile()
+
+    def keywords(self, interest: str) -> Tuple[str, ...]:
+        return self._keywords.get(interest, (interest.lower(),))
+
+    def fuzzy_keywords(self, token: str) -> Tuple[str, ...]:
+        """Keywords whose difflib ratio with token reaches min_ratio."""
+        hits = self._fuzzy_cache.get(token)
+        if hits is not None:
+            return hits
+        slack = 1.0 - self.min_ratio
+        radius = int(slack * (len(token) + self._max_kw_len) + 1e-9)
+        matches = []
+        for keyword, dist in self._tree.within(token, radius):
+            if dist > slack * (len(token) + len(keyword)) + 1e-9:
+                continue
+            if difflib.SequenceMatcher(a=token, b=keyword).ratio() >= self.min_ratio:
+                matches.append(keyword)
+        hits = tuple(matches)
+        if len(self._fuzzy_cache) >= self._max_cache:
+            self._fuzzy_cache.clear()
+        self._fuzzy_cache[token] = hits
+        return hits
+
+    def find(self, text: str, tokens: Optional[Iterable[str]] = None,
+             interests: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Interests mentioned in text -> the synonym (exact) or token that matched.
+
+        text is matched as given (callers lowercase it); tokens default to its
+        whitespace-separated words. A token equal to a keyword is an exact hit,
+        otherwise tokens go through the fuzzy index. With `interests`, only those
+        are reported and token checks stop once all of them have matched.
+        """
+        if tokens is None:
+            tokens = text.split()
+        wanted = set(interests) if interests is not None else None
+        matched: Dict[str, str] = {}
+
+        def hit(keyword: str, source: str):
+            for interest in self._owners[keyword]:
+                if wanted is None or interest in wanted:
+                    matched.setdefault(interest, source)
+
+        for keyword in self._automaton.find_all(text):
+            hit(keyword, keyword)
+        tokens = list(dict.fromkeys(tokens))
+        for token in tokens:
+            if token in self._owners:
+                hit(token, token)
+        for token in tokens:
+            if wanted is not None and len(matched) == len(wanted):
+                break
+            if len(token) < self.min_token_len:
+                continue
+            for keyword in self.fuzzy_keywords(token):
+                hit(keyword, token)
+        return matched
@@ -1,5 +1,5 @@
 import streamlit as st
-from services import activity, persistence
+from services import activity, data_context, persistence, repository
 from ui.components import report_card, status_badge, dataframe_with_status
 import pandas as pd
 from io import StringIO
@@ -8,21 +8,20 @@ import datetime as _dt
 
 
 def _club_options(current_user_id: Optional[str]):
-    clubs_all = persistence.load_list('clubs')
+    ctx = data_context.current()
+    clubs_all = ctx.clubs()
     active_clubs = [c for c in clubs_all if c.get('status') == 'Active']
     # Auto-upgrade matched clubs to Active for demo convenience if user has only Matched
     if not active_clubs and current_user_id:
         matched_user_clubs = [c for c in clubs_all if c.get(
             'status') == 'Matched' and current_user_id in c.get('member_ids', [])]
         if matched_user_clubs:
-            for c in matched_user_clubs:
-                c['status'] = 'Active'
-            persistence.replace_all('clubs', clubs_all)
-            active_clubs = matched_user_clubs
+            upgraded = [persistence.update_item('clubs', c['id'], {'status': 'Active'})
+                        for c in matched_user_clubs]
+            active_clubs = [c for c in upgraded if c is not None]
     if not active_clubs:
         return []
-    users = persistence.load_list('users')
-    user_map = {u['id']: u for u in users}
+    user_map = ctx.user_map()
     # If user context exists, limit to their clubs
     if current_user_id:
         active_clubs = [
@@ -102,9 +101,7 @@ def view():
             member_count = 0
             if club_id:
                 try:
-                    clubs_all = persistence.load_list('clubs')
-                    club_obj = next(
-                        (c for c in clubs_all if c.get('id') == club_id), None)
+                    club_obj = repository.clubs.get(club_id)
                     if club_obj:
                         member_count = len(
                             club_obj.get('member_ids', []) or [])
@@ -146,8 +143,8 @@ def view():
         st.caption("아직 제출한 보고서가 없습니다.")
         return
     if current_user_id:
-        user_club_ids = {c['id'] for c in persistence.load_list(
-            'clubs') if current_user_id in c.get('member_ids', [])}
+        user_club_ids = set(repository.clubs.ids_by(
+            'member_id', current_user_id))
         reports = [r for r in reports if r['club_id'] in user_club_ids]
     if not reports:
         st.caption("표시할 보고서가 없습니다.")
@@ -194,8 +191,10 @@ def view():
     else:
         sorted_reports = sorted(
             filtered, key=lambda r: r['date'], reverse=True)
+        # One club-name lookup for the whole list (not one clubs scan per card)
+        club_names = data_context.current().club_names()
         for r in sorted_reports:
-            report_card(r)
+            report_card(r, club_names=club_names)
         csv_buf = StringIO()
         pd.DataFrame(sorted_reports).to_csv(csv_buf, index=False)
         st.download_button("(필터) CSV 다운로드", data=csv_buf.getvalue(),
@@ -1,5 +1,5 @@
 import streamlit as st
-from services import persistence, activity, matching
+from services import persistence, activity, analytics, data_context, matching
 from demo import sample_data  # updated path for sample data generation
 from domain.models import User, MatchRun
 from utils.ids import create_id_with_prefix
@@ -12,7 +12,7 @@ from utils.explanations import build_ai_match_explanation
 
 
 def _user_map():
-    return {u['id']: u for u in persistence.load_list('users')}
+    return data_context.current().user_map()
 
 
 def _user_name(uid, user_map):
@@ -20,16 +20,9 @@ def _user_name(uid, user_map):
     return u['name'] if u else uid
 
 
-@st.cache_data(ttl=30)
 def _club_points_map():
-    """Compute verified points per club (cached briefly for snappy UI)."""
-    reports = persistence.load_list('activity_reports')
-    pts: dict[str, int] = {}
-    for r in reports:
-        if r.get('status') == 'Verified':
-            pts[r['club_id']] = pts.get(
-                r['club_id'], 0) + int(r.get('points_awarded', 0))
-    return pts
+    """Verified points per club from the maintained ledger."""
+    return data_context.current().points_map()
 
 
 def utc_now_iso():
@@ -52,14 +45,16 @@ def view():
         from views.admin_tabs.clubs import render_clubs_tab as _rc
         from views.admin_tabs.verification import render_verification_tab as _rv
         from views.admin_tabs.data import render_data_tab as _rd
+        # All tabs render in the same rerun: share one data context
+        ctx = data_context.current()
         with tabs[0]:
             _ra()
         with tabs[1]:
-            _rum()
+            _rum(ctx)
         with tabs[2]:
-            _rm()
+            _rm(ctx)
         with tabs[3]:
-            _rc()
+            _rc(ctx)
         with tabs[4]:
             _rv()
         with tabs[5]:
@@ -86,37 +81,25 @@ def view():
 
 def render_analytics_tab():
     st.subheader("📈 분석 및 현황")
-    users_all = persistence.load_list('users')
-    clubs_all = persistence.load_list('clubs')
-    runs_all = persistence.load_list('match_runs')
-    reports_all = persistence.load_list('activity_reports')
-
-    active_clubs = sum(1 for c in clubs_all if c.get('status') == 'Active')
-    pending_reports = sum(
-        1 for r in reports_all if r.get('status') == 'Pending')
-    verified_reports = sum(
-        1 for r in reports_all if r.get('status') == 'Verified')
-    club_points = _club_points_map()
-    total_points = sum(club_points.values())
+    stats = analytics.store.snapshot()
+    reports_all = persistence.load_view('activity_reports')
+    pending_reports = stats['pending_reports']
+    verified_reports = stats['verified_reports']
 
     # Quick Actions / Summary strip
     with st.container(border=True):
         cqa1, cqa2, cqa3, cqa4, cqa5 = st.columns(5)
         # Show 0 when only demo_user exists (align with modular analytics tab logic)
-        effective_user_count = 0 if (len(users_all) == 1 and users_all[0].get(
-            'id') == 'demo_user') else len(users_all)
-        cqa1.metric("사용자", effective_user_count)
-        cqa2.metric("클럽", f"{len(clubs_all)} / 활성 {active_clubs}")
+        cqa1.metric("사용자", stats['total_users'])
+        cqa2.metric("클럽", f"{stats['total_clubs']} / 활성 {stats['active_clubs']}")
         cqa3.metric("보고서 대기", pending_reports)
         cqa4.metric("보고서 검증", verified_reports)
-        cqa5.metric("총 포인트", total_points)
+        cqa5.metric("총 포인트", stats['total_points_awarded'])
 
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("직급 다양성 평균", _avg_metric(lambda c: {
-              m['rank'] for m in users_all if m['id'] in c['member_ids']}, clubs_all))
-    c2.metric("관심사 다양성 평균", _avg_metric(lambda c: {
-              i for m in users_all if m['id'] in c['member_ids'] for i in m['interests']}, clubs_all))
-    c3.metric("매칭 Run 수", len(runs_all))
+    c1.metric("직급 다양성 평균", f"{stats['avg_rank_diversity']:.2f}")
+    c2.metric("관심사 다양성 평균", f"{stats['avg_interest_variety']:.2f}")
+    c3.metric("매칭 Run 수", stats['total_match_runs'])
     c4.metric("보고서 (대/검)", f"{pending_reports}/{verified_reports}")
 
     # (클럽 포인트 순위 Top 5 섹션 제거됨 - 데모 집중을 위해 간소화)
@@ -142,18 +125,6 @@ def render_analytics_tab():
                 "직급 다양성", f"{sum(diversity_scores)/len(diversity_scores):.2f}")
 
 
-def _avg_metric(extractor, clubs_all):
-    values = []
-    for c in clubs_all:
-        if c.get('member_ids'):
-            extracted = extractor(c)
-            if extracted:
-                values.append(len(extracted))
-    if not values:
-        return "0"
-    return f"{sum(values)/len(values):.2f}"
-
-
 def render_matching_tab():
     st.subheader("⚙️ 매칭 실행")
     users_raw = persistence.load_list('users')
@@ -176,14 +147,10 @@ def render_matching_tab():
             clubs = matching.compute_matches(
                 user_objs, target_size=target_size, run_id=run_id)
             clubs_dicts = [asdict(c) for c in clubs]
-            existing_clubs = persistence.load_list('clubs')
-            existing_clubs.extend(clubs_dicts)
-            persistence.replace_all('clubs', existing_clubs)
-            runs = persistence.load_list('match_runs')
+            persistence.modify('clubs', lambda existing_clubs: existing_clubs.extend(clubs_dicts))
             run_meta = MatchRun(id=run_id, created_at=utc_now_iso(
             ), target_size=target_size, user_count=len(users_raw), club_count=len(clubs_dicts))
-            runs.append(asdict(run_meta))
-            persistence.replace_all('match_runs', runs)
+            persistence.append_item('match_runs', asdict(run_meta))
             st.success(
                 f"새 매칭 실행 완료. Run ID: {run_id}, 생성된 클럽 수: {len(clubs_dicts)}")
             st.balloons()
@@ -267,12 +234,13 @@ def render_clubs_tab():
                     chat_url = st.text_input(
                         "채팅 링크 (선택)", key=f"chat_{c['id']}")
                     if st.button(f"클럽 활성화", key=f"activate_{c['id']}"):
-                        c['chat_link'] = chat_url if chat_url else ''
-                        c['status'] = 'Active'
-                        c['updated_at'] = utc_now_iso()
+                        persistence.update_item('clubs', c['id'], {
+                            'chat_link': chat_url if chat_url else '',
+                            'status': 'Active',
+                            'updated_at': utc_now_iso(),
+                        })
                         modified = True
     if modified:
-        persistence.replace_all('clubs', clubs_all)
         st.success("클럽 상태 변경사항이 저장되었습니다.")
         st.rerun()
 
@@ -309,13 +277,11 @@ def render_data_tab():
     with st.container(border=True):
         st.subheader("샘플 사용자 생성")
         if st.button("샘플 사용자 15명 생성"):
-            users = persistence.load_list('users')
-            if users:
+            if persistence.load_view('users'):
                 st.info("이미 사용자가 존재하여, 기존 목록에 15명을 추가합니다.")
             from demo import sample_data
             new_users = [asdict(u) for u in sample_data.make_users(15)]
-            users.extend(new_users)
-            persistence.replace_all('users', users)
+            persistence.modify('users', lambda users: users.extend(new_users))
             st.success("샘플 사용자 추가 완료!")
             st.rerun()
     with st.container(border=True):
@@ -16,15 +16,17 @@ def render_data_tab():
 
     with st.container(border=True):
         st.subheader("데이터 내보내기 (CSV)")
+        compress = st.checkbox("gzip 압축 (대용량)", key="export_gzip")
+        ext, mime = ("csv.gz", "application/gzip") if compress else ("csv", "text/csv")
         c1, c2, c3, c4 = st.columns(4)
-        if c1.button("사용자"):
-            st.download_button("다운로드: users.csv", admin_svc.export_to_csv('users'), "users.csv", "text/csv")
-        if c2.button("클럽"):
-            st.download_button("다운로드: clubs.csv", admin_svc.export_to_csv('clubs'), "clubs.csv", "text/csv")
-        if c3.button("보고서"):
-            st.download_button("다운로드: reports.csv", admin_svc.export_to_csv('activity_reports'), "reports.csv", "text/csv")
-        if c4.button("매칭기록"):
-            st.download_button("다운로드: runs.csv", admin_svc.export_to_csv('match_runs'), "runs.csv", "text/csv")
+        for col, label, key, fname in ((c1, "사용자", 'users', 'users'),
+                                       (c2, "클럽", 'clubs', 'clubs'),
+                                       (c3, "보고서", 'activity_reports', 'reports'),
+                                       (c4, "매칭기록", 'match_runs', 'runs')):
+            if col.button(label):
+                st.download_button(f"다운로드: {fname}.{ext}",
+                                   admin_svc.export_csv_bytes(key, compress=compress),
+                                   f"{fname}.{ext}", mime)
 
     with st.expander("🚨 Danger Zone: 데이터 초기화"):
         st.warning("주의: 이 작업은 모든 사용자, 클럽, 보고서, 매칭 기록을 영구적으로 삭제합니다. 되돌릴 수 없습니다.")
@@ -1,15 +1,15 @@
 import streamlit as st
 
-from services import persistence, admin as admin_svc
+from services import data_context, admin as admin_svc
 
 
-def render_matching_tab():
+def render_matching_tab(ctx=None):
     """Handles UI for running the matching algorithm."""
     st.subheader("⚙️ 매칭 실행")
     st.caption(
         "현재 활성/배정되지 않은(클럽 미소속) 사용자만 대상으로 신규 매칭을 수행합니다. 이미 클럽에 속한 사용자는 이번 실행에서 제외됩니다.")
 
-    users_raw = persistence.load_list('users')
+    users_raw = (ctx or data_context.current()).users()
     if not users_raw:
         st.warning("매칭을 실행할 사용자가 없습니다. 먼저 사용자를 등록하거나 생성해주세요.")
         return
@@ -1,17 +1,17 @@
 import streamlit as st
 
-from services import persistence, admin as admin_svc
+from services import data_context, repository, admin as admin_svc
 from services.survey import QUESTIONS
-from ui.components import user_badge
+from ui.components import page_state, paginator, user_badge
 from domain.constants import REGIONS, RANKS, INTERESTS
 
 
-def render_user_management_tab():
+def render_user_management_tab(ctx=None):
     """Provides UI for managing users, including editing and deleting."""
     st.subheader("👤 사용자 관리")
 
-    users = persistence.load_list('users')
-    if not users:
+    ctx = ctx or data_context.current()
+    if not len(repository.users):
         st.info("등록된 사용자가 없습니다.")
         return
 
@@ -24,10 +24,21 @@ def render_user_management_tab():
         if re.match(r'^[A-Za-z]', name):
             return (1, name.lower())  # push to bottom
         return (0, name)  # Korean or other stays upper group
-    users.sort(key=_kor_first_key)
 
     def _clean_name(n: str):
         return n[len('det_extra_'):] if isinstance(n, str) and n.startswith('det_extra_') else n
+
+    # Search and sort run in the repository; the selector and list only see one page.
+    search = st.text_input("검색 (이름·사번·지역)", key="users_search").strip().lower()
+
+    def _matches(u):
+        return any(search in str(u.get(k) or '').lower() for k in ('name', 'employee_number', 'region'))
+
+    number, size = page_state('users')
+    page = repository.users.query(number, size, where=_matches if search else None,
+                                  sort_key=_kor_first_key)
+    paginator(page, 'users')
+    users = page.items
     display_map = {
         f"{_clean_name(u['name'])} ({u.get('employee_number','')}, {u['region']})": u['id'] for u in users}
 
@@ -42,7 +53,7 @@ def render_user_management_tab():
         return
 
     sel_id = display_map[sel_disp]
-    user = next((u for u in users if u['id'] == sel_id), None)
+    user = repository.users.get(sel_id)
 
     if user:
         with st.expander(f"편집: {_clean_name(user['name'])} ({user.get('employee_number','')}, {user['region']})", expanded=True):
@@ -72,7 +83,7 @@ def render_user_management_tab():
                         'name': new_name or "", 'employee_number': new_emp, 'region': new_region or "",
                         'rank': new_rank, 'interests': new_interests, 'survey_answers': new_answers
                     }
-                    admin_svc.update_user_profile(sel_id, updates, users)
+                    admin_svc.update_user_profile(sel_id, updates, ctx.users())
                     if sel_id == 'demo_user':
                         st.caption("(demo_user 변경 사항이 state 파일에 반영됨)")
                     st.success("업데이트 완료")
@@ -82,7 +93,7 @@ def render_user_management_tab():
 
             if col2.button("삭제", key=f"adm_del_{sel_id}"):
                 try:
-                    admin_svc.delete_user(sel_id, users)
+                    admin_svc.delete_user(sel_id)
                     st.warning("삭제됨 (매칭 재실행 필요)")
                     st.rerun()
                 except ValueError as e:
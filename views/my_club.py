@@ -1,21 +1,16 @@
 import streamlit as st
-from services import persistence
+from services import data_context, repository
 from typing import Dict
 from ui.components import club_card, styled_member_chips
 
 
 def _user_map():
-    return {u['id']: u for u in persistence.load_list('users')}
+    return data_context.current().user_map()
 
 
 def _club_points_map() -> Dict[str, int]:
-    reports = persistence.load_list('activity_reports')
-    pts: Dict[str, int] = {}
-    for r in reports:
-        if r.get('status') == 'Verified':
-            pts[r['club_id']] = pts.get(
-                r['club_id'], 0) + int(r.get('points_awarded', 0))
-    return pts
+    """Verified points per club from the maintained ledger."""
+    return data_context.current().points_map()
 
 
 def view():
@@ -85,8 +80,9 @@ def view():
                 # enforce same region for deterministic demo
                 nr['region'] = demo_region
                 normalized.append(nr)
-            users_all_extended = users_all + normalized
-            _p.replace_all('users', users_all_extended)
+            # Append to the stored list, keeping anyone who registered since users_all was read
+            _p.modify('users', lambda users: users.extend(
+                r for r in normalized if r['id'] not in {u.get('id') for u in users}))
             users_all = user_svc.load_users()
             added_peer_count = len(normalized)
         clubs_existing = _p.load_list('clubs')
@@ -119,10 +115,9 @@ def view():
             )
             fc_dict = _asdict(fixed_club)
             fc_dict['is_demo_fixed'] = True
-            fc_dict['explanations'] = {
-                mid: {"그룹": "고정 데모 팀 A"} for mid in fixed_members}
+            fc_dict['explanation'] = "고정 데모 팀 A"
             clubs_existing.append(fc_dict)
-            _p.replace_all('clubs', clubs_existing)
+            _p.append_item('clubs', fc_dict)
             created_demo_club = True
         # Ensure session selects demo user for immediate render
         if demo_user_rec and (getattr(st.session_state, 'current_user_id', None) not in fixed_members):
@@ -145,12 +140,10 @@ def view():
                 d['status'] = 'Active'
                 new_cd.append(d)
             clubs_existing.extend(new_cd)
-            _p.replace_all('clubs', clubs_existing)
-            runs = _p.load_list('match_runs')
+            _p.modify('clubs', lambda clubs: clubs.extend(new_cd))
             run_meta = MatchRun(id=run_id, created_at=_dt.datetime.now(_dt.timezone.utc).isoformat().replace(
                 '+00:00', 'Z'), target_size=6, user_count=len(remaining_users), club_count=len(new_cd))
-            runs.append(_asdict(run_meta))
-            _p.replace_all('match_runs', runs)
+            _p.append_item('match_runs', _asdict(run_meta))
             match_run_id = run_id
             created_club_count = len(new_cd)
             st.success(f"매칭 완료: 새 클럽 {len(new_cd)}개 생성 (Run {run_id})")
@@ -170,7 +163,7 @@ def view():
         # Unconditional rerun to refresh view (covers both creation-only and full match cases)
         st.rerun()
     current_user_id = getattr(st.session_state, 'current_user_id', None)
-    users = persistence.load_list('users')
+    users = data_context.current().users()
     if not users:
         st.warning("등록된 사용자가 없습니다. 먼저 프로필을 등록해주세요.")
         return
@@ -178,9 +171,8 @@ def view():
         st.info("현재 선택된 사용자 세션이 없습니다.")
         st.write("'프로필/설문' 페이지에서 사용자를 생성하거나 선택하면 여기서 소속 클럽을 볼 수 있습니다.")
         return
-    clubs_all = persistence.load_list('clubs')
-    user_clubs = [c for c in clubs_all if current_user_id in c.get(
-        'member_ids', []) and c.get('status') in ('Active', 'Matched')]
+    user_clubs = [c for c in repository.clubs.find('member_id', current_user_id)
+                  if c.get('status') in ('Active', 'Matched')]
     if not user_clubs:
         st.info("아직 배정된 (활성) 클럽이 없습니다.")
         st.write("관리자가 매칭을 실행하고 클럽을 활성화하면 이곳에 표시됩니다.")
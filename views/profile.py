@@ -7,7 +7,7 @@ from domain.constants import REGIONS, RANKS, INTERESTS
 
 is_duplicate_user = user_svc.is_duplicate_user
 load_users = user_svc.load_users
-save_users = user_svc.save_users
+update_user = user_svc.update_user
 
 
 def _profile_block(user: Dict[str, Any]):
@@ -89,7 +89,7 @@ def view():
             if safe_name != '데모사용자' and is_duplicate_user(safe_name, safe_region, users, exclude_id=current_user_id):
                 st.error("중복 사용자 (이름+지역) 존재. 변경 취소.")
             else:
-                me.update({
+                changes = {
                     'name': safe_name,
                     'nickname': (new_nickname or '').strip(),
                     'employee_number': new_employee_number,
@@ -98,8 +98,9 @@ def view():
                     'interests': new_interests,
                     'personality_trait': classify_personality(new_answers),
                     'survey_answers': new_answers
-                })
-                save_users(users)
+                }
+                me.update(changes)
+                update_user(current_user_id, changes)
                 if me.get('id') == 'demo_user':
                     try:
                         save_demo_user(me)
@@ -28,10 +28,6 @@ def load_users():
     return persistence.load_list('users')
 
 
-def save_users(users):
-    persistence.replace_all('users', users)
-
-
 def view():
     st.header("사용자 등록 / 성향 설문")
     # Demo actions panel removed; all demo buttons reside in sidebar only.
@@ -161,19 +157,17 @@ def view():
                 should_update_demo = bool(demo_ids) and (
                     d['name'] == demo_current.get('name') or d['employee_number'] == demo_current.get('employee_number') or d['name'] == '데모사용자')
                 if should_update_demo:
-                    # Update existing demo_user record fields
-                    for u in users:
-                        if u.get('id') == 'demo_user':
-                            u['name'] = d['name']
-                            u['nickname'] = d.get('nickname')
-                            u['employee_number'] = d['employee_number']
-                            u['region'] = d['region']
-                            u['rank'] = d['rank']
-                            u['interests'] = d['interests']
-                            u['personality_trait'] = personality_trait
-                            u['survey_answers'] = answers
-                    # Persist state & users
-                    save_users(users)
+                    # Update existing demo_user record fields (row-level, so concurrent signups are kept)
+                    persistence.update_item('users', 'demo_user', {
+                        'name': d['name'],
+                        'nickname': d.get('nickname'),
+                        'employee_number': d['employee_number'],
+                        'region': d['region'],
+                        'rank': d['rank'],
+                        'interests': d['interests'],
+                        'personality_trait': personality_trait,
+                        'survey_answers': answers,
+                    })
                     try:
                         from domain.constants import save_demo_user
                         save_demo_user({
@@ -196,8 +190,7 @@ def view():
                     uid = create_id_with_prefix('u')
                     user = User(id=uid, name=d['name'], employee_number=d['employee_number'], region=d['region'], rank=d['rank'],
                                 interests=d['interests'], personality_trait=personality_trait, survey_answers=answers, nickname=d.get('nickname'))
-                    users.append(asdict(user))
-                    save_users(users)
+                    persistence.append_item('users', asdict(user))
                     st.session_state.current_user_id = uid
                     st.success(f"가입 완료: {d['name']} (성향: {personality_trait})")
                 # Defer navigation to profile page via nav_target (handled in app before radio instantiation)